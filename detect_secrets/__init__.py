@@ -1 +1,15 @@
-from .core.secrets_collection import SecretsCollection  # noqa: F401
+from typing import Any
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:   # pragma: no cover
+    from .core.secrets_collection import SecretsCollection  # noqa: F401
+
+
+def __getattr__(name: str) -> Any:
+    # Importing the scanning engine is relatively expensive, so we defer it until it's needed.
+    # This allows lightweight entrypoints (e.g. `detect_secrets.client`) to start up quickly.
+    if name == 'SecretsCollection':
+        from .core.secrets_collection import SecretsCollection  # noqa: F811
+        return SecretsCollection
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -11,6 +11,7 @@ from . import io
 from ..core import baseline
 from ..core import plugins
 from ..core.potential_secret import PotentialSecret
+from ..core.scan import get_line_windows
 from ..core.secrets_collection import SecretsCollection
 from ..exceptions import InvalidBaselineError
 from ..exceptions import NoLineNumberError
@@ -18,6 +19,7 @@ from ..exceptions import SecretNotFoundOnSpecifiedLineError
 from ..plugins.base import BasePlugin
 from ..transformers import get_transformed_file
 from ..types import NamedIO
+from ..util.file_content import FileContent
 from ..util.inject import call_function_with_arguments
 from detect_secrets.util.code_snippet import get_code_snippet
 
@@ -92,22 +94,32 @@ def get_raw_secrets_from_file(
             line_numbers = list(range(len(lines_to_scan)))
 
         for line_number, line in zip(line_numbers, lines_to_scan):
-            context = get_code_snippet(lines=line_getter.lines, line_number=line_number + 1)
-            identified_secrets = call_function_with_arguments(
-                plugin.analyze_line,
-                filename=secret.filename,
-                line=line,
-                line_number=line_number + 1,
-
-                # We enable eager search, because we *know* there's a secret here -- the baseline
-                # flagged it after all.
-                enable_eager_search=bool(secret.line_number),
-                context=context,
-            )
-
-            for identified_secret in (identified_secrets or []):
-                if identified_secret == secret:
+            # Long lines are scanned in windows, so we need to look for the secret in the same
+            # windows that the scan did.
+            for _, window in get_line_windows(line):
+                context = get_code_snippet(lines=line_getter.lines, line_number=line_number + 1)
+                context.target_line = window
+
+                identified_secrets = call_function_with_arguments(
+                    plugin.analyze_line,
+                    filename=secret.filename,
+                    line=window,
+                    line_number=line_number + 1,
+
+                    # We enable eager search, because we *know* there's a secret here -- the
+                    # baseline flagged it after all.
+                    enable_eager_search=bool(secret.line_number),
+                    context=context,
+                )
+
+                identified_secret = next(
+                    (item for item in (identified_secrets or []) if item == secret),
+                    None,
+                )
+                if identified_secret:
+                    # Windows overlap, so we stop at the first one that contains the secret.
                     all_secrets.append(identified_secret)
+                    break
 
         if (
             len(all_secrets) == 0 and
@@ -141,6 +153,7 @@ class LineGetter:
     def __init__(self, filename: str) -> None:
         self.filename = filename
 
+        self._content: Optional[FileContent] = None
         self._lines: Optional[List[str]] = None
         self._raw_lines: Optional[List[str]] = None
         self._use_eager_transformers = False
@@ -148,8 +161,13 @@ class LineGetter:
     @contextmanager
     def open_file(self) -> Iterator[NamedIO]:
         """This is split up into a different function, so it can be overridden if necessary."""
-        with open(self.filename) as f:
-            yield cast(NamedIO, f)
+        # Every transformation of the file is attempted on the same contents, so we only need to
+        # read it once.
+        if not self._content:
+            with open(self.filename, 'rb') as f:
+                self._content = FileContent.read(f)
+
+        yield self._content.open()
 
     @property
     def lines(self) -> List[str]:
@@ -0,0 +1,205 @@
+"""
+This is a thin client for `detect_secrets.daemon`. If a daemon is listening, invocations of
+`detect-secrets-hook` and `detect-secrets scan` are forwarded to it, which saves us from
+starting up (and initializing plugins, filters and baselines) every single time. Otherwise,
+they are run locally, just as they always have been.
+
+As such, this module intentionally only depends on the standard library: importing the rest
+of detect-secrets would defeat the purpose.
+"""
+import getpass
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import tempfile
+from typing import Any
+from typing import cast
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from .__version__ import VERSION
+from .util.path import is_private_directory
+
+
+# This only applies to connecting: responses can take a while, since they include scanning files.
+CONNECT_TIMEOUT = 1
+
+# These are the only environment variables that affect how the daemon runs a command.
+# Nothing else is sent, since the environment often contains credentials.
+FORWARDED_ENVIRONMENT_VARIABLES = frozenset({
+    'CLICOLOR',
+    'CLICOLOR_FORCE',
+    'DETECT_SECRETS_CACHE_DIR',
+    'DETECT_SECRETS_SECURITY_TEAM',
+    'XDG_CACHE_HOME',
+
+    # git sets these when running hooks (e.g. for `git commit -a`, or in worktrees).
+    'GIT_ALTERNATE_OBJECT_DIRECTORIES',
+    'GIT_COMMON_DIR',
+    'GIT_DIR',
+    'GIT_INDEX_FILE',
+    'GIT_OBJECT_DIRECTORY',
+    'GIT_WORK_TREE',
+})
+
+_HEADER = struct.Struct('>I')
+
+
+def get_socket_path() -> str:
+    if os.environ.get('DETECT_SECRETS_DAEMON_SOCKET'):
+        return os.environ['DETECT_SECRETS_DAEMON_SOCKET']
+
+    # Unix sockets are only accessible by the current user, if they're in a directory that
+    # is only accessible by the current user. Since the temporary directory is shared with
+    # other users, we use a directory of our own (which the daemon creates) in there.
+    directory = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, 'getuid') else getpass.getuser()
+    return os.path.join(directory, f'detect-secrets-{user}', 'daemon.sock')
+
+
+def is_trusted_socket(path: str) -> bool:
+    """
+    Otherwise, another user would be able to pretend to be the daemon: reading the
+    files that we're scanning, and telling us that they don't contain any secrets.
+    """
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+
+    return (
+        stat.S_ISSOCK(info.st_mode)
+        and info.st_uid == os.getuid()
+        and is_private_directory(os.path.dirname(os.path.abspath(path)))
+    )
+
+
+def hook_main(argv: Optional[List[str]] = None) -> int:
+    """Entrypoint for `detect-secrets-hook`."""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    status = forward('hook', argv)
+    if status is not None:
+        return status
+
+    from .pre_commit_hook import main
+    return main(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entrypoint for `detect-secrets`."""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Only scans are forwarded: auditing is interactive, and reading secrets from stdin
+    # isn't supported by the daemon.
+    status = None
+    if argv and argv[0] == 'scan' and '--string' not in argv:
+        status = forward('scan', argv)
+
+    if status is not None:
+        return status
+
+    from .main import main as local_main
+    return local_main(argv or None)
+
+
+def forward(command: str, argv: List[str], socket_path: str = '') -> Optional[int]:
+    """
+    :returns: the exit code of the command, or None if there's no daemon to run it.
+    """
+    if not hasattr(socket, 'AF_UNIX') or not hasattr(os, 'getuid'):     # pragma: no cover
+        return None
+
+    if not socket_path:
+        socket_path = get_socket_path()
+
+    if not os.path.exists(socket_path):
+        return None
+
+    if not is_trusted_socket(socket_path):
+        sys.stderr.write(
+            f'Not using {socket_path}, since it may be accessible by other users.\n',
+        )
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(socket_path)
+            sock.settimeout(None)
+
+            send_message(sock, {
+                'version': VERSION,
+                'command': command,
+                'argv': argv,
+                'cwd': os.getcwd(),
+                'env': _get_environment(),
+            })
+            response = receive_message(sock)
+    except (OSError, ValueError):
+        # e.g. the daemon isn't running anymore, and left its socket file behind.
+        return None
+
+    if 'status' not in response:
+        # e.g. the daemon is running a different version of detect-secrets.
+        return None
+
+    sys.stdout.write(response['stdout'])
+    sys.stdout.flush()
+    sys.stderr.write(response['stderr'])
+    sys.stderr.flush()
+
+    return int(response['status'])
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    data = json.dumps(message).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def receive_message(sock: socket.socket) -> Dict[str, Any]:
+    """
+    :raises: ValueError
+    :raises: OSError
+    """
+    size, = _HEADER.unpack(_receive_exactly(sock, _HEADER.size))
+    return cast(Dict[str, Any], json.loads(_receive_exactly(sock, size).decode('utf-8')))
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(min(size - len(data), 64 * 1024))
+        if not chunk:
+            raise ValueError('Connection closed unexpectedly.')
+
+        data.extend(chunk)
+
+    return bytes(data)
+
+
+def _get_environment() -> Dict[str, str]:
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key in FORWARDED_ENVIRONMENT_VARIABLES
+    }
+
+    # The daemon's output isn't a terminal, so we need to tell it whether ours is.
+    if sys.stdout.isatty():
+        if env.get('CLICOLOR', '1') != '0':
+            env['CLICOLOR_FORCE'] = '1'
+    else:
+        env['CLICOLOR'] = '0'
+
+    return env
+
+
+if __name__ == '__main__':
+    sys.exit(main())
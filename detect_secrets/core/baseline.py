@@ -15,7 +15,9 @@ from ..settings import configure_settings_from_baseline
 from ..settings import get_settings
 from ..util.importlib import import_modules_from_package
 from ..util.semver import Version
-from .scan import get_files_to_scan
+from .cache import ScanResultCache
+from .scan import get_files_to_scan_with_object_ids
+from .scheduler import ExecutionMode
 from .secrets_collection import SecretsCollection
 
 
@@ -24,17 +26,36 @@ def create(
     should_scan_all_files: bool = False,
     root: str = '',
     num_processors: Optional[int] = None,
+    cache: Optional[ScanResultCache] = None,
+    mode: Optional[ExecutionMode] = None,
 ) -> SecretsCollection:
-    """Scans all the files recursively in path to initialize a baseline."""
-    kwargs = {}
+    """
+    Scans all the files recursively in path to initialize a baseline.
+
+    :param cache: if provided, files that were scanned before will not be scanned again.
+    :param mode: if not provided, this is chosen based on how much there is to scan.
+    """
+    kwargs: Dict[str, Any] = {}
     if num_processors:
         kwargs['num_processors'] = num_processors
+    if mode:
+        kwargs['mode'] = mode
+
+    files = dict(
+        get_files_to_scan_with_object_ids(
+            *paths,
+            should_scan_all_files=should_scan_all_files,
+            root=root,
+        ),
+    )
+    if cache:
+        kwargs['cache'] = cache
+
+        # git object IDs save us from having to read unchanged files to look them up.
+        kwargs['content_hashes'] = files
 
     secrets = SecretsCollection(root=root)
-    secrets.scan_files(
-        *get_files_to_scan(*paths, should_scan_all_files=should_scan_all_files, root=root),
-        **kwargs,
-    )
+    secrets.scan_files(*files, **kwargs)
 
     return secrets
 
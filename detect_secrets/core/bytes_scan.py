@@ -0,0 +1,389 @@
+"""
+Very large files (e.g. logs, or database dumps) can be scanned without decoding them in their
+entirety. Instead, we search the (memory mapped) file for lines that the configured plugins
+could possibly find secrets in. Only these lines (and the lines around them, for context) are
+decoded, and then scanned just like any other line.
+
+This relies on being able to rule out lines for every plugin. See `get_plugin_screen`.
+
+Similarly, they can be split into chunks of lines, which are decoded and scanned separately
+(see `get_chunks`).
+"""
+import codecs
+import mmap
+import re
+from functools import lru_cache
+from itertools import islice
+from typing import FrozenSet
+from typing import Generator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Pattern
+from typing import Tuple
+from typing import Union
+
+from ..plugins.base import BasePlugin
+from ..plugins.base import RegexBasedDetector
+from ..plugins.high_entropy_strings import HighEntropyStringsPlugin
+from ..plugins.keyword import KEYWORD_REGEX_IGNORECASE
+from ..plugins.keyword import KeywordDetector
+from ..settings import get_plugins
+from ..util.code_snippet import CodeSnippet
+from ..util.code_snippet import get_code_snippets as get_code_snippets_from_lines
+from ..util.file_content import FileContent
+from ..util.regex import get_line_bytes_pattern
+from ..util.regex import get_required_literals
+
+
+# Large ranges of the file are processed in chunks of this size, so that we never need to
+# copy all of it at once.
+CHUNK_SIZE = 1024 * 1024
+
+# Only encodings in which ASCII characters are encoded as themselves are supported, since
+# that's what we search for.
+SUPPORTED_ENCODINGS = frozenset({'ascii', 'utf-8'})
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+class LineScreen:
+    def __init__(self, plugins: List[BasePlugin]) -> None:
+        self.plugins = plugins
+
+        # If any plugin can't be screened, then every line would need to be scanned anyway.
+        self.patterns: Optional[List[Pattern]] = []
+        for plugin in plugins:
+            patterns = get_plugin_screen(plugin)
+            if patterns is None:
+                self.patterns = None
+                break
+
+            self.patterns.extend(
+                pattern
+                for pattern in patterns
+                if pattern not in self.patterns
+            )
+
+        if self.patterns is not None:
+            # Plugins run their (str) regexes on non-ASCII lines differently, so we don't
+            # try to rule these out.
+            self.patterns.append(_get_non_ascii_regex())
+
+    def find_lines(self, buffer: Buffer) -> List[int]:
+        """
+        :returns: the (sorted) offsets of the lines that could contain secrets.
+        """
+        if self.patterns is None:
+            raise ValueError('Not every plugin can be screened.')
+
+        has_carriage_returns = buffer.find(b'\r') != -1
+
+        output = set()
+        for pattern in self.patterns:
+            position = 0
+            while True:
+                match = pattern.search(buffer, position)
+                if not match:
+                    break
+
+                start = match.start()
+                output.add(_find_line_start(buffer, start, has_carriage_returns))
+
+                # We only need to know whether the line matches, not how many times it does.
+                position = _find_line_end(buffer, start, has_carriage_returns) + 1
+
+        return sorted(output)
+
+
+def get_plugin_screen(plugin: BasePlugin) -> Optional[List[Pattern]]:
+    """
+    :returns: bytes patterns, at least one of which must match an ASCII line for the plugin
+        to find a secret in it. None, if this can't be determined.
+    """
+    plugin_type = type(plugin)
+    if isinstance(plugin, RegexBasedDetector):
+        # Just like `get_plugin_anchors`, we rely on lines needing to match the denylist (see
+        # `RegexBasedDetector`). However, if the plugin overrides how a line is analyzed,
+        # there's no guarantee that it's still scanning the line itself.
+        if plugin_type.analyze_line is not BasePlugin.analyze_line:
+            return None
+
+        patterns = list(plugin.denylist)
+    elif isinstance(plugin, HighEntropyStringsPlugin):
+        if (
+            plugin_type.analyze_line is not HighEntropyStringsPlugin.analyze_line
+            or plugin_type.analyze_string is not HighEntropyStringsPlugin.analyze_string
+        ):
+            return None
+
+        # NOTE: Files are never scanned with `enable_eager_search`, so only quoted strings
+        # are found.
+        patterns = [plugin.regex]
+    elif isinstance(plugin, KeywordDetector):
+        if (
+            plugin_type.analyze_line is not KeywordDetector.analyze_line
+            or plugin_type.analyze_string is not KeywordDetector.analyze_string
+        ):
+            return None
+
+        # Every secret found is preceded by a keyword.
+        patterns = [KEYWORD_REGEX_IGNORECASE]
+    else:
+        return None
+
+    output = []
+    for pattern in patterns:
+        bytes_pattern = get_line_bytes_pattern(pattern)
+        if not bytes_pattern:
+            literals = get_required_literals(pattern)
+            if not literals:
+                return None
+
+            bytes_pattern = _compile_literals(literals)
+
+        output.append(bytes_pattern)
+
+    return output
+
+
+def get_line_screen() -> LineScreen:
+    """Just like `get_prefilter`, this is rebuilt whenever the configured plugins change."""
+    global _line_screen
+
+    plugins = get_plugins()
+    if not _line_screen or _line_screen.plugins is not plugins:
+        _line_screen = LineScreen(plugins)
+
+    return _line_screen
+
+
+_line_screen: Optional[LineScreen] = None
+
+
+def get_code_snippets(
+    buffer: Buffer,
+    line_offsets: List[int],
+    name: str,
+    lines_of_context: int = 5,
+) -> Generator[Tuple[int, str, CodeSnippet], None, None]:
+    """
+    This is the equivalent of `detect_secrets.util.code_snippet.get_code_snippets`, for only
+    some lines of the file.
+
+    :param line_offsets: the (sorted) offsets of the lines to get.
+    :returns: (line_number, line, snippet) for each line
+    """
+    has_carriage_returns = buffer.find(b'\r') != -1
+
+    line_number = 1
+    previous_offset = 0
+    for offset in line_offsets:
+        line_number += _count_line_breaks(buffer, previous_offset, offset, has_carriage_returns)
+        previous_offset = offset
+
+        start = offset
+        target_index = 0
+        while target_index < lines_of_context and start > 0:
+            start = _find_previous_line_start(buffer, start, has_carriage_returns)
+            target_index += 1
+
+        end = offset
+        for _ in range(lines_of_context + 1):
+            if end >= len(buffer):
+                break
+
+            end = _find_next_line_start(buffer, end, has_carriage_returns)
+
+        lines = FileContent.decode(name, buffer[start:end]).lines
+        yield (
+            line_number,
+            lines[target_index],
+            CodeSnippet(
+                snippet=lines,
+                start_line=line_number - target_index - 1,
+                target_index=target_index,
+            ),
+        )
+
+
+class Chunk(NamedTuple):
+    """A range of whole lines in the file."""
+    start: int
+    end: int
+
+    # The number of the first line in the chunk.
+    line_number: int
+
+    # This saves us from searching the whole file for carriage returns, for every chunk.
+    has_carriage_returns: bool
+
+
+def get_chunks(buffer: Buffer, chunk_size: int) -> List[Chunk]:
+    """
+    Splits the buffer into chunks of (roughly) `chunk_size` bytes, without splitting up
+    any lines.
+    """
+    has_carriage_returns = buffer.find(b'\r') != -1
+
+    output = []
+    start = 0
+    line_number = 1
+    while start < len(buffer):
+        end = len(buffer)
+        if start + chunk_size < end:
+            end = min(
+                end,
+                _find_next_line_start(buffer, start + chunk_size - 1, has_carriage_returns),
+            )
+
+        output.append(
+            Chunk(
+                start=start,
+                end=end,
+                line_number=line_number,
+                has_carriage_returns=has_carriage_returns,
+            ),
+        )
+
+        line_number += _count_line_breaks(buffer, start, end, has_carriage_returns)
+        start = end
+
+    return output
+
+
+def get_chunk_code_snippets(
+    buffer: Buffer,
+    chunk: Chunk,
+    name: str,
+    lines_of_context: int = 5,
+) -> List[Tuple[int, str, CodeSnippet]]:
+    """
+    This is the equivalent of `detect_secrets.util.code_snippet.get_code_snippets`, for only
+    the lines in the chunk. The lines surrounding the chunk are decoded as well, so that the
+    snippets at either end of it are the same as if the whole file was decoded.
+
+    :raises: UnicodeDecodeError
+    :returns: (line_number, line, snippet) for each line
+    """
+    start = chunk.start
+    lines_before = 0
+    while lines_before < lines_of_context and start > 0:
+        start = _find_previous_line_start(buffer, start, chunk.has_carriage_returns)
+        lines_before += 1
+
+    end = chunk.end
+    lines_after = 0
+    while lines_after < lines_of_context and end < len(buffer):
+        end = _find_next_line_start(buffer, end, chunk.has_carriage_returns)
+        lines_after += 1
+
+    lines = FileContent.decode(name, buffer[start:end]).lines
+    return list(
+        islice(
+            get_code_snippets_from_lines(
+                lines,
+                lines_of_context=lines_of_context,
+                line_offset=chunk.line_number - lines_before - 1,
+            ),
+            lines_before,
+            len(lines) - lines_after,
+        ),
+    )
+
+
+def is_decodable(buffer: Buffer, encoding: str) -> bool:
+    """This is equivalent to checking whether `str(buffer, encoding)` succeeds."""
+    if not _get_non_ascii_regex().search(buffer):
+        return True
+
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        for start in range(0, len(buffer), CHUNK_SIZE):
+            decoder.decode(buffer[start:start + CHUNK_SIZE])
+
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return False
+
+    return True
+
+
+def is_supported_encoding(encoding: str) -> bool:
+    try:
+        return codecs.lookup(encoding).name in SUPPORTED_ENCODINGS
+    except LookupError:
+        return False
+
+
+def _find_line_start(buffer: Buffer, index: int, has_carriage_returns: bool) -> int:
+    start = buffer.rfind(b'\n', 0, index) + 1
+    if has_carriage_returns:
+        start = buffer.rfind(b'\r', start, index) + 1 or start
+
+    return start
+
+
+def _find_line_end(buffer: Buffer, index: int, has_carriage_returns: bool) -> int:
+    """
+    :returns: the offset of the line break that ends the line (or the end of the buffer).
+    """
+    end = buffer.find(b'\n', index)
+    if end == -1:
+        end = len(buffer)
+
+    if has_carriage_returns:
+        carriage_return = buffer.find(b'\r', index, end)
+        if carriage_return != -1:
+            end = carriage_return
+
+    return end
+
+
+def _find_next_line_start(buffer: Buffer, index: int, has_carriage_returns: bool) -> int:
+    end = _find_line_end(buffer, index, has_carriage_returns)
+    if buffer[end:end + 2] == b'\r\n':
+        return end + 2
+
+    return end + 1
+
+
+def _find_previous_line_start(buffer: Buffer, start: int, has_carriage_returns: bool) -> int:
+    """
+    :param start: the offset of a line, other than the first one.
+    """
+    end = start - 1
+    if end > 0 and buffer[end - 1:end + 1] == b'\r\n':
+        end -= 1
+
+    return _find_line_start(buffer, end, has_carriage_returns)
+
+
+def _count_line_breaks(buffer: Buffer, start: int, end: int, has_carriage_returns: bool) -> int:
+    count = 0
+    while start < end:
+        chunk_end = min(end, start + CHUNK_SIZE)
+        if has_carriage_returns and buffer[chunk_end - 1:chunk_end + 1] == b'\r\n':
+            # Don't split up line breaks between chunks.
+            chunk_end += 1
+
+        chunk = buffer[start:chunk_end]
+        count += chunk.count(b'\n')
+        if has_carriage_returns:
+            count += chunk.count(b'\r') - chunk.count(b'\r\n')
+
+        start = chunk_end
+
+    return count
+
+
+def _compile_literals(literals: FrozenSet[str]) -> Pattern:
+    return re.compile(
+        b'|'.join(re.escape(literal.encode()) for literal in sorted(literals)),
+        re.IGNORECASE,
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_non_ascii_regex() -> Pattern:
+    return re.compile(rb'[\x80-\xff]')
@@ -0,0 +1,338 @@
+"""
+The results of scanning a file only depend on its contents, its path, and the settings that
+the scan was performed with. As such, we can store the results of previous scans, and skip
+files that we have already seen before (which, in practice, is most of them).
+
+Results are stored in their baseline format, so that plaintext secrets are never written
+to the cache.
+"""
+import hashlib
+import json
+import locale
+import os
+import tempfile
+from abc import ABCMeta
+from abc import abstractmethod
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+
+from . import scan
+from ..__version__ import VERSION
+from ..settings import get_settings
+from ..util.path import convert_local_os_path
+from .log import log
+from .potential_secret import PotentialSecret
+
+
+# Cache entries are small, so this allows for a lot of files.
+DEFAULT_MAX_CACHE_SIZE = 256 * 1024 * 1024
+
+
+def get_default_cache_directory() -> str:
+    """
+    We don't store the cache within the repository being scanned by default, otherwise
+    it would be picked up by `detect-secrets scan --all-files`.
+    """
+    if os.environ.get('DETECT_SECRETS_CACHE_DIR'):
+        return os.environ['DETECT_SECRETS_CACHE_DIR']
+
+    return os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache')),
+        'detect-secrets',
+    )
+
+
+class BaseStorage(metaclass=ABCMeta):
+    """
+    Storage backends are responsible for persisting cache entries. They need to be
+    picklable, since they're shipped to each process that performs the scan.
+    """
+    # Whether lookups are slow enough (e.g. over a network) that scans spend most of their
+    # time waiting on them.
+    is_remote = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+    def prune(self) -> None:
+        """This is called after a scan is complete, to keep the storage size bounded."""
+        pass
+
+
+class FileSystemStorage(BaseStorage):
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_CACHE_SIZE) -> None:
+        self.directory = directory
+        self.max_size = max_size
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._get_path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read()
+
+            # This keeps track of recent usage, so that the least recently used entries
+            # are the first ones to be evicted.
+            os.utime(path)
+            return value
+        except OSError:
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        path = self._get_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            # Write to a temporary file first, so that concurrent readers (e.g. when this is a
+            # shared directory) never see a partially written entry.
+            fd, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(value)
+
+            os.replace(temporary_path, path)
+            self._record_usage(len(value))
+        except OSError as e:
+            log.warning(f'Unable to write to cache: {e}')
+
+    def prune(self) -> None:
+        # Walking through the whole cache is expensive, so we only do so when the sizes that
+        # were recorded since the last time we did suggest that it has grown too large.
+        recorded_size = self._get_recorded_size()
+        if recorded_size is not None and recorded_size <= self.max_size:
+            return
+
+        entries = []
+        total_size = 0
+        usage_path = self._get_usage_path()
+        for root, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                if path == usage_path:
+                    continue
+
+                try:
+                    stat = os.stat(path)
+                except OSError:     # pragma: no cover
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+        if total_size > self.max_size:
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except OSError:     # pragma: no cover
+                    continue
+
+                total_size -= size
+                if total_size <= self.max_size:
+                    break
+
+        self._reset_usage(total_size)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def _get_usage_path(self) -> str:
+        """
+        This file keeps a running total of the cache's size: it starts with the size that was
+        last measured, followed by the size of every entry that has been written since.
+        """
+        return os.path.join(self.directory, 'usage')
+
+    def _record_usage(self, size: int) -> None:
+        # NOTE: Appends this small are atomic, so concurrent scans don't need to coordinate.
+        # Overwritten entries are counted twice, but that only means that the cache gets
+        # measured sooner than it needs to be.
+        with open(self._get_usage_path(), 'a') as f:
+            f.write(f'{size}\n')
+
+    def _get_recorded_size(self) -> Optional[int]:
+        try:
+            with open(self._get_usage_path()) as f:
+                return sum(int(line) for line in f)
+        except (OSError, ValueError):
+            # If we don't know how large the cache is, we'll need to measure it.
+            return None
+
+    def _reset_usage(self, size: int) -> None:
+        try:
+            fd, temporary_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, 'w') as f:
+                f.write(f'{size}\n')
+
+            os.replace(temporary_path, self._get_usage_path())
+        except OSError:
+            # e.g. nothing has been cached yet.
+            pass
+
+
+class HTTPStorage(BaseStorage):
+    """
+    This allows multiple machines (e.g. CI runners) to share a cache, through any server
+    that supports `GET` and `PUT` requests on `<url>/<key>`.
+    """
+    is_remote = True
+
+    def __init__(self, url: str, timeout: float = 5) -> None:
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            response = requests.get(f'{self.url}/{key}', timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            return None
+
+        if response.status_code != 200:
+            return None
+
+        return response.content
+
+    def set(self, key: str, value: bytes) -> None:
+        try:
+            requests.put(f'{self.url}/{key}', data=value, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            log.warning(f'Unable to write to cache: {e}')
+
+
+def get_storage(location: str) -> BaseStorage:
+    """
+    :param location: either a local directory, or a http(s):// URL.
+    """
+    parts = urlparse(location)
+    if parts.scheme in {'http', 'https'}:
+        return HTTPStorage(location)
+
+    if parts.scheme == 'file':
+        location = location[len('file://'):]
+
+    return FileSystemStorage(os.path.expanduser(location))
+
+
+class ScanResultCache:
+    def __init__(self, storage: BaseStorage, fingerprint: str = '') -> None:
+        """
+        :param fingerprint: identifies the settings that results were obtained with.
+            If not provided, this is computed from the current settings.
+        """
+        self.storage = storage
+        self.fingerprint = fingerprint or get_settings_fingerprint()
+
+    def scan_file(
+        self,
+        filename: str,
+        content_hash: str = '',
+    ) -> List[PotentialSecret]:
+        """
+        This behaves just like `scan.scan_file`, but skips the scan altogether if the same
+        file has been scanned before.
+
+        :param content_hash: if known ahead of time, this saves us from reading the file
+            to compute it.
+        """
+        if not content_hash:
+            try:
+                content_hash = compute_content_hash(filename)
+            except OSError:
+                # e.g. directories, or files that can't be read. We let the scanning logic
+                # decide how to handle these.
+                return list(scan.scan_file(filename))
+
+        secrets = self.get(filename, content_hash)
+        if secrets is not None:
+            log.debug(f'Using cached results for {filename}')
+            return secrets
+
+        secrets = list(scan.scan_file(filename))
+        self.set(filename, content_hash, secrets)
+        return secrets
+
+    def get(self, filename: str, content_hash: str) -> Optional[List[PotentialSecret]]:
+        value = self.storage.get(self._get_key(filename, content_hash))
+        if value is None:
+            return None
+
+        try:
+            return [
+                PotentialSecret.load_secret_from_dict(item)
+                for item in json.loads(value.decode('utf-8'))
+            ]
+        except (ValueError, KeyError, TypeError):
+            # A corrupted entry is just a cache miss.
+            return None
+
+    def set(self, filename: str, content_hash: str, secrets: List[PotentialSecret]) -> None:
+        self.storage.set(
+            self._get_key(filename, content_hash),
+            json.dumps([secret.json() for secret in secrets]).encode('utf-8'),
+        )
+
+    def prune(self) -> None:
+        self.storage.prune()
+
+    def _get_key(self, filename: str, content_hash: str) -> str:
+        # The filename is part of the key, because it affects the scan results
+        # (e.g. through file-based filters, or the choice of transformers).
+        return hashlib.sha1(
+            '\0'.join([
+                VERSION,
+                self.fingerprint,
+                convert_local_os_path(filename),
+                content_hash,
+            ]).encode('utf-8'),
+        ).hexdigest()
+
+
+def get_settings_fingerprint() -> str:
+    """
+    :returns: a hash of everything (apart from the file itself) that can affect the results
+        of a scan.
+    """
+    settings = get_settings()
+    data: Dict[str, Any] = {
+        'settings': settings.json(),
+        'encoding': locale.getpreferredencoding(False),
+
+        # The settings only reference custom plugins and filters by path, so we need to
+        # account for changes to their contents as well.
+        'files': {},
+    }
+
+    paths = [config['path'] for config in settings.plugins.values() if 'path' in config]
+    paths.extend(path for path in settings.filters if path.startswith('file://'))
+    for path in paths:
+        filename = path[len('file://'):].split('::')[0]
+        try:
+            data['files'][path] = compute_content_hash(filename)
+        except OSError:
+            data['files'][path] = ''
+
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def compute_content_hash(filename: str, buffer_size: int = 64 * 1024) -> str:
+    """
+    This is computed the same way as git's blob object IDs, so that hashes obtained from
+    git can be used interchangeably with this.
+
+    :raises: OSError
+    """
+    sha1 = hashlib.sha1(f'blob {os.path.getsize(filename)}\0'.encode('utf-8'))
+    with open(filename, 'rb') as f:
+        data = f.read(buffer_size)
+        while data:
+            sha1.update(data)
+            data = f.read(buffer_size)
+
+    return sha1.hexdigest()
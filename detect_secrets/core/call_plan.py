@@ -0,0 +1,159 @@
+"""
+Plugins and filters declare the variables that they need through their parameter names (see
+`detect_secrets.util.inject`). Working out which variables to pass to them is surprisingly
+expensive, considering that it's done for every line, and every plugin and filter. However,
+the answer only changes when the configured plugins and filters do: so we work it out once,
+and reuse it until then.
+"""
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from ..plugins.base import BasePlugin
+from ..settings import get_filters
+from ..settings import get_plugins
+from ..types import SelfAwareCallable
+from ..util.inject import get_injectable_variables
+from .log import log
+from .potential_secret import PotentialSecret
+
+
+class FilterStage:
+    """
+    The filters that apply to a given stage of the scan, along with the arguments that
+    each of them should be called with.
+    """
+
+    def __init__(
+        self,
+        filters: List[SelfAwareCallable],
+        required_parameters: Iterable[str],
+        available_parameters: Iterable[str],
+        excluded_filters: Iterable[str] = (),
+    ) -> None:
+        """
+        :param required_parameters: only filters that accept all of these are run. This
+            ensures that filters aren't run multiple times throughout the scan.
+        :param available_parameters: the variables that this stage provides.
+        :param excluded_filters: paths of filters that don't apply to this stage.
+        """
+        minimum_parameters = set(required_parameters)
+        available = set(available_parameters)
+        excluded = set(excluded_filters)
+
+        # (filter, parameters to pass to it, path of the filter)
+        self.filters: Tuple[Tuple[Callable[..., Any], Tuple[str, ...], str], ...] = tuple(
+            (
+                filter_fn,
+                tuple(sorted(available & filter_fn.injectable_variables)),
+                filter_fn.path,
+            )
+            for filter_fn in filters
+            if (
+                minimum_parameters <= filter_fn.injectable_variables
+                and filter_fn.path not in excluded
+            )
+        )
+
+    def is_filtered_out(self, **kwargs: Any) -> bool:
+        for filter_fn, parameters, path in self.filters:
+            try:
+                if not filter_fn(**{parameter: kwargs[parameter] for parameter in parameters}):
+                    continue
+            except TypeError:
+                # Skipping non-compatible filters
+                continue
+
+            if 'secret' in kwargs:
+                debug_msg = f'Skipping "{kwargs["secret"]}" due to `{path}`.'
+            elif list(kwargs.keys()) == ['filename']:
+                # We want to make sure this is only run if we're skipping files (as compared
+                # to other filters that may include `filename` as a parameter).
+                debug_msg = f'Skipping "{kwargs["filename"]}" due to `{path}`'
+            else:
+                debug_msg = f'Skipping secret due to `{path}`.'
+
+            log.info(debug_msg)
+            return True
+
+        return False
+
+
+class CallPlan:
+    def __init__(self, plugins: List[BasePlugin], filters: List[SelfAwareCallable]) -> None:
+        self.plugins = plugins
+        self.filters = filters
+
+        # Mapping of plugin IDs to (analyze_line, parameters it accepts).
+        self.analyzers: Dict[int, Tuple[Callable[..., Any], FrozenSet[str]]] = {
+            id(plugin): (
+                plugin.analyze_line,
+                # The first parameter refers to the instance itself.
+                frozenset(get_injectable_variables(plugin.analyze_line)[1:]),
+            )
+            for plugin in plugins
+        }
+
+        self.stages: Dict[
+            Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[str]],
+            FilterStage,
+        ] = {}
+
+    def get_filter_stage(
+        self,
+        required_parameters: Iterable[str],
+        available_parameters: Iterable[str],
+        excluded_filters: Iterable[str] = (),
+    ) -> FilterStage:
+        key = (
+            frozenset(required_parameters),
+            frozenset(available_parameters),
+            frozenset(excluded_filters),
+        )
+        stage = self.stages.get(key)
+        if not stage:
+            stage = self.stages[key] = FilterStage(self.filters, *key)
+
+        return stage
+
+    def analyze_line(self, plugin: BasePlugin, **kwargs: Any) -> Optional[Set[PotentialSecret]]:
+        """This is equivalent to `call_function_with_arguments(plugin.analyze_line, **kwargs)`."""
+        try:
+            analyze_line, parameters = self.analyzers[id(plugin)]
+        except KeyError:
+            # e.g. plugins that were initialized outside of the settings.
+            analyze_line = plugin.analyze_line
+            parameters = frozenset(get_injectable_variables(analyze_line)[1:])
+
+        if not parameters.issuperset(kwargs):
+            kwargs = {key: value for key, value in kwargs.items() if key in parameters}
+
+        return analyze_line(**kwargs)    # type: ignore
+
+
+def get_call_plan() -> CallPlan:
+    """
+    Just like `get_prefilter`, this is keyed off the identity of the (cached) plugins and
+    filters, so that it's rebuilt whenever they change.
+    """
+    global _call_plan
+
+    plugins = get_plugins()
+    filters = get_filters()
+    if (
+        not _call_plan
+        or _call_plan.plugins is not plugins
+        or _call_plan.filters is not filters
+    ):
+        _call_plan = CallPlan(plugins, filters)
+
+    return _call_plan
+
+
+_call_plan: Optional[CallPlan] = None
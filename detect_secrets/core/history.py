@@ -0,0 +1,175 @@
+"""
+Secrets that were removed from a repository can still be found in its history. Rather than
+scanning every file at every commit, we only scan the blobs introduced by each commit: and
+since identical blobs recur across many commits (e.g. through cherry-picks, reverts and
+rebased branches), each (path, blob) pair is only scanned once.
+"""
+import multiprocessing as mp
+import time
+from collections import defaultdict
+from functools import partial
+from typing import Any
+from typing import Dict
+from typing import Generator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from . import scan
+from ..__version__ import VERSION
+from ..settings import get_settings
+from ..util import git
+from .cache import ScanResultCache
+from .potential_secret import PotentialSecret
+from .scan_config import configure_worker
+from .scan_config import get_scan_config
+from .scan_config import ScanConfig
+
+
+class HistoricalSecrets(NamedTuple):
+    filename: str
+    object_id: str
+
+    # The commits that introduced this blob at this path, latest first.
+    commits: List[str]
+
+    secrets: List[PotentialSecret]
+
+
+def scan_history(
+    rev_range: str = '',
+    root: str = '',
+    num_processors: Optional[int] = None,
+    cache: Optional[ScanResultCache] = None,
+) -> List[HistoricalSecrets]:
+    """
+    :param rev_range: e.g. `main`, or `v1.0..v2.0`. Defaults to all refs.
+    :param root: if not specified, will scan the repository of the current working directory.
+    :raises: CalledProcessError
+    """
+    root = git.get_root_directory(root)
+
+    commits: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+    for commit, filename, object_id in git.get_blobs_from_history(root, rev_range):
+        commits[(filename, object_id)].append(commit)
+
+    output = []
+    for (filename, object_id), secrets in _scan_blobs(
+        list(commits),
+        root=root,
+        num_processors=num_processors,
+        cache=cache,
+    ):
+        if secrets:
+            output.append(
+                HistoricalSecrets(
+                    filename=filename,
+                    object_id=object_id,
+                    commits=commits[(filename, object_id)],
+                    secrets=secrets,
+                ),
+            )
+
+    return sorted(output, key=lambda x: (x.filename, x.commits))
+
+
+def format_for_output(results: List[HistoricalSecrets]) -> Dict[str, Any]:
+    output: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for result in results:
+        for secret in sorted(
+            result.secrets,
+            key=lambda secret: (secret.line_number, secret.secret_hash, secret.type),
+        ):
+            output[result.filename].append({
+                **secret.json(),
+                'commits': result.commits,
+            })
+
+    return {
+        'version': VERSION,
+
+        # This will populate settings of filters and plugins,
+        **get_settings().json(),
+
+        'results': dict(output),
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+
+
+def _scan_blobs(
+    blobs: List[Tuple[str, str]],
+    root: str,
+    num_processors: Optional[int] = None,
+    cache: Optional[ScanResultCache] = None,
+) -> Generator[Tuple[Tuple[str, str], List[PotentialSecret]], None, None]:
+    if not num_processors:
+        num_processors = mp.cpu_count()
+
+    if num_processors == 1 or len(blobs) <= 1:
+        _initialize_worker(config=None, root=root)
+        try:
+            for blob in blobs:
+                yield _scan_blob_and_serialize(blob, cache=cache)
+        finally:
+            _close_worker()
+
+        return
+
+    with mp.Pool(
+        processes=num_processors,
+        initializer=_initialize_worker,
+        initargs=(get_scan_config(), root),
+    ) as p:
+        yield from p.imap_unordered(
+            partial(_scan_blob_and_serialize, cache=cache),
+            blobs,
+            # Blobs are typically small, so this cuts down on inter-process communication.
+            chunksize=max(1, min(64, len(blobs) // (num_processors * 4))),
+        )
+
+
+def _scan_blob_and_serialize(
+    blob: Tuple[str, str],
+    cache: Optional[ScanResultCache] = None,
+) -> Tuple[Tuple[str, str], List[PotentialSecret]]:
+    filename, object_id = blob
+    if cache:
+        # Object IDs are content hashes, so this shares entries with working tree scans.
+        secrets = cache.get(filename, object_id)
+        if secrets is not None:
+            return blob, secrets
+
+    assert _blob_reader
+    try:
+        content = _blob_reader.read(object_id)
+    except KeyError:    # pragma: no cover
+        # e.g. objects that are missing in shallow clones.
+        return blob, []
+
+    secrets = list(scan.scan_blob(filename, content))
+    if cache:
+        cache.set(filename, object_id, secrets)
+
+    return blob, secrets
+
+
+# Each worker has its own connection to git.
+_blob_reader: Optional[git.BlobReader] = None
+
+
+def _initialize_worker(config: Optional[ScanConfig], root: str) -> None:
+    global _blob_reader
+
+    if config is not None:
+        configure_worker(config)
+
+    _blob_reader = git.BlobReader(root)
+
+
+def _close_worker() -> None:
+    global _blob_reader
+
+    if _blob_reader:
+        _blob_reader.close()
+        _blob_reader = None
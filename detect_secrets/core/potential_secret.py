@@ -48,6 +48,10 @@ class PotentialSecret:
         self.is_secret = is_secret
         self.is_verified = is_verified
 
+        # Where the secret starts within its line. This is only known for lines that are too
+        # long to be scanned in one go, and isn't saved to baselines.
+        self.column: Optional[int] = None
+
         # If two PotentialSecrets have the same values for these fields,
         # they are considered equal. Note that line numbers aren't included
         # in this, because line numbers are subject to change.
@@ -0,0 +1,150 @@
+"""
+Most lines in a codebase don't contain secrets, and most of our regex-based plugins look for
+secrets that start with (or contain) a fixed token, like `AKIA` or `ghp_`. Rather than running
+every plugin's regexes on every line, we can find all of these tokens in a single pass over the
+line, and only run the plugins whose tokens appear.
+"""
+from collections import defaultdict
+from typing import Any
+from typing import Dict
+from typing import FrozenSet
+from typing import List
+from typing import Optional
+from typing import Set
+
+from ..plugins.base import BasePlugin
+from ..plugins.base import RegexBasedDetector
+from ..settings import get_plugins
+from ..util.regex import get_required_literals
+
+
+# Shorter anchors appear in too many lines to be worth checking for.
+MIN_ANCHOR_LENGTH = 3
+
+
+class PluginPrefilter:
+    def __init__(self, plugins: List[BasePlugin]) -> None:
+        self.plugins = plugins
+
+        # Mapping of anchors to the indices of the plugins that require them.
+        anchors: Dict[str, Set[int]] = defaultdict(set)
+        unconditional_indices = set()
+        for index, plugin in enumerate(plugins):
+            plugin_anchors = get_plugin_anchors(plugin)
+            if not plugin_anchors:
+                unconditional_indices.add(index)
+
+            for anchor in plugin_anchors:
+                anchors[anchor].add(index)
+
+        self.anchors: Dict[str, FrozenSet[int]] = {
+            anchor: frozenset(indices)
+            for anchor, indices in anchors.items()
+        }
+        self.unconditional_indices = frozenset(unconditional_indices)
+        self.unconditional_plugins = [
+            plugin
+            for index, plugin in enumerate(plugins)
+            if index in self.unconditional_indices
+        ]
+
+        self.automaton = _build_automaton(self.anchors)
+
+    def get_plugins_for_line(self, line: str) -> List[BasePlugin]:
+        """
+        :returns: the plugins that could possibly find a secret in the line, in the same
+            order as they were originally configured.
+        """
+        if not self.anchors or not line.isascii():
+            # Case-insensitive matching on non-ASCII strings doesn't quite work the same way
+            # as lowercasing does, so we don't take chances here.
+            return self.plugins
+
+        line = line.lower()
+        indices: Optional[Set[int]] = None
+        if self.automaton:
+            for _, anchor_indices in self.automaton.iter(line):
+                if indices is None:
+                    indices = set(self.unconditional_indices)
+
+                indices.update(anchor_indices)
+        else:
+            for anchor, anchor_indices in self.anchors.items():
+                if anchor in line:
+                    if indices is None:
+                        indices = set(self.unconditional_indices)
+
+                    indices.update(anchor_indices)
+
+        if indices is None:
+            return self.unconditional_plugins
+
+        return [
+            plugin
+            for index, plugin in enumerate(self.plugins)
+            if index in indices
+        ]
+
+
+def get_plugin_anchors(plugin: BasePlugin) -> Set[str]:
+    """
+    :returns: lowercased literals, at least one of which must appear in a line for the
+        plugin to find a secret in it. If the plugin should run on every line, this will
+        be empty.
+    """
+    if not isinstance(plugin, RegexBasedDetector):
+        return set()
+
+    # If the plugin overrides how a line is analyzed, there's no guarantee that it's still
+    # only looking for matches of its denylist in the line.
+    if getattr(plugin.analyze_line, '__func__', None) is not BasePlugin.analyze_line:
+        return set()
+
+    output: Set[str] = set()
+    for regex in plugin.denylist:
+        anchors = get_required_literals(regex)
+        if not anchors or min(len(anchor) for anchor in anchors) < MIN_ANCHOR_LENGTH:
+            return set()
+
+        output.update(anchors)
+
+    return output
+
+
+def get_prefilter() -> PluginPrefilter:
+    """
+    The prefilter is rebuilt whenever the configured plugins change. We key this off the
+    identity of the (cached) list of plugins, so that it doesn't need to be manually
+    invalidated alongside `get_plugins`.
+    """
+    global _prefilter
+
+    plugins = get_plugins()
+    if not _prefilter or _prefilter.plugins is not plugins:
+        _prefilter = PluginPrefilter(plugins)
+
+    return _prefilter
+
+
+_prefilter: Optional[PluginPrefilter] = None
+
+
+def _build_automaton(anchors: Dict[str, FrozenSet[int]]) -> Any:
+    """
+    Aho-Corasick allows us to search for all anchors in a single pass. However, this is an
+    optional dependency, so we fall back to individual substring searches without it.
+    """
+    if not anchors:
+        return None
+
+    try:
+        import ahocorasick
+    except ImportError:     # pragma: no cover
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for anchor, indices in anchors.items():
+        automaton.add_word(anchor, indices)
+
+    automaton.make_automaton()
+    return automaton
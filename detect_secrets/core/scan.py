@@ -1,14 +1,21 @@
+import locale
+import mmap
 import os
+import re
 import subprocess
+from functools import lru_cache
 from typing import Any
 from typing import cast
+from typing import Dict
 from typing import Generator
 from typing import Iterable
 from typing import List
+from typing import Optional
+from typing import Pattern
 from typing import Set
 from typing import Tuple
-from typing import Union
 
+from . import bytes_scan
 from ..filters.allowlist import is_line_allowlisted
 from ..settings import get_filters
 from ..settings import get_plugins
@@ -19,11 +26,27 @@ from ..types import SelfAwareCallable
 from ..util import git
 from ..util.code_snippet import CodeSnippet
 from ..util.code_snippet import get_code_snippet
-from ..util.inject import call_function_with_arguments
+from ..util.code_snippet import get_code_snippets
+from ..util.file_content import FileContent
+from ..util.filetype import BINARY_SNIFF_SIZE
+from ..util.filetype import is_binary
+from ..util.filetype import is_binary_file
+from ..util.path import convert_local_os_path
 from ..util.path import get_relative_path
+from .call_plan import CallPlan
+from .call_plan import FilterStage
+from .call_plan import get_call_plan
 from .log import log
 from .plugins import Plugin
 from .potential_secret import PotentialSecret
+from .prefilter import get_prefilter
+from .prefilter import PluginPrefilter
+
+
+# When lines are scanned in windows, secrets are filtered with (at most) this many characters
+# of the statement on either side of them. This keeps it well within the length of lines that
+# line filters expect (e.g. `detect_secrets.filters.heuristic.is_indirect_reference`).
+MAX_STATEMENT_CONTEXT = 400
 
 
 def get_files_to_scan(
@@ -54,35 +77,60 @@ def get_files_to_scan(
 
     :param root: if not specified, will assume current repository as root.
     """
+    for filename, _ in get_files_to_scan_with_object_ids(
+        *paths,
+        should_scan_all_files=should_scan_all_files,
+        root=root,
+    ):
+        yield filename
+
+
+def get_files_to_scan_with_object_ids(
+    *paths: str,
+    should_scan_all_files: bool = False,
+    root: str = '',
+) -> Generator[Tuple[str, str], None, None]:
+    """
+    This works just like `get_files_to_scan`, but also yields the git object ID of each file
+    (or an empty string, if it isn't known to match the file's contents). This can be used
+    as a content hash, without having to read the file.
+
+    When using git tracked files, we get these from the git index directly, rather than
+    walking the filesystem and resolving every file found.
+    """
     if root:
         root = os.path.realpath(root)
 
     # First, we determine the appropriate filtering mode to be used.
-    # If this is True, then it will consider everything to be valid.
-    # Otherwise, it will only list the files that are valid.
-    valid_paths: Union[bool, Set[str]] = True
-    for path in paths:
+    # If this is None, then it will consider everything to be valid.
+    # Otherwise, it will only list the files that are tracked by git.
+    tracked_files: Optional[Dict[str, str]] = None
+    if (
+        not should_scan_all_files
         # Since this is not a directory, we assume that it is a file proper, and automatically
         # consider it valid.
-        if not os.path.isdir(path):
-            continue
-
-        if not should_scan_all_files:
-            try:
-                valid_paths = git.get_tracked_files(git.get_root_directory(root))
-            except subprocess.CalledProcessError:
-                log.warning('Did not detect git repository. Try scanning all files instead.')
-                valid_paths = False
-
-        # Since valid_paths attempts to get *all* tracked files in the repository, we just need
-        # to initialize it once.
-        break
-
-    if not valid_paths:
-        yield from []
-        return
+        and any(os.path.isdir(path) for path in paths)
+    ):
+        try:
+            tracked_files = _get_tracked_files(root)
+        except subprocess.CalledProcessError:
+            log.warning('Did not detect git repository. Try scanning all files instead.')
+            return
 
     for path in paths:
+        if tracked_files is not None and os.path.isdir(path):
+            prefix = os.path.relpath(os.path.realpath(path), root or os.getcwd())
+            if prefix == '.':
+                yield from tracked_files.items()
+                continue
+
+            yield from (
+                (filename, object_id)
+                for filename, object_id in tracked_files.items()
+                if filename.startswith(prefix + os.sep)
+            )
+            continue
+
         iterator = (
             cast(List[Tuple], [(root or os.getcwd(), None, [path])])
             if os.path.isfile(path)
@@ -99,11 +147,7 @@ def get_files_to_scan(
                     # e.g. symbolic links may be pointing outside the root directory
                     continue
 
-                if (
-                    valid_paths is True
-                    or relative_path in valid_paths
-                ):
-                    yield relative_path
+                yield relative_path, (tracked_files or {}).get(relative_path, '')
 
 
 def scan_line(line: str) -> Generator[PotentialSecret, None, None]:
@@ -112,7 +156,6 @@ def scan_line(line: str) -> Generator[PotentialSecret, None, None]:
     get_settings().disable_filters(
         'detect_secrets.filters.common.is_invalid_file',
     )
-    get_filters.cache_clear()
     context = get_code_snippet(lines=[line], line_number=1)
 
     yield from (
@@ -137,7 +180,14 @@ def scan_line(line: str) -> Generator[PotentialSecret, None, None]:
     )
 
 
-def scan_file(filename: str) -> Generator[PotentialSecret, None, None]:
+def scan_file(
+    filename: str,
+    bytes_mode_threshold: Optional[int] = None,
+) -> Generator[PotentialSecret, None, None]:
+    """
+    :param bytes_mode_threshold: if provided, files of at least this size (in bytes) are
+        scanned without decoding them in their entirety (see `detect_secrets.core.bytes_scan`).
+    """
     try:
         if not get_plugins():   # pragma: no cover
             log.error('No plugins to scan with!')
@@ -150,22 +200,129 @@ def scan_file(filename: str) -> Generator[PotentialSecret, None, None]:
         return
 
     try:
-        has_secret = False
-        for lines in _get_lines_from_file(filename):
-            for secret in _process_line_based_plugins(
-                lines=list(enumerate(lines, start=1)),
+        if bytes_mode_threshold is not None and _should_use_bytes_mode(
+            filename,
+            bytes_mode_threshold,
+        ):
+            yield from _process_file(_get_code_snippets_from_large_file(filename), filename)
+        else:
+            yield from _process_file(
+                (get_code_snippets(lines) for lines in _get_lines_from_file(filename)),
                 filename=filename,
-            ):
-                has_secret = True
-                yield secret
-
-            if has_secret:
-                break
+            )
     except IOError:
         log.warning(f'Unable to open file: {filename}')
         return
 
 
+def get_file_chunks(filename: str, chunk_size: int) -> List[bytes_scan.Chunk]:
+    """
+    Files larger than `chunk_size` can be split into chunks of lines, that are scanned
+    separately (e.g. in parallel), rather than with `scan_file`. To get the same results
+    as `scan_file`:
+
+        1. Scan each chunk with `scan_file_chunk`.
+        2. If none of them yield any secrets, scan the file with
+           `scan_file_with_eager_transformers`.
+
+    :returns: an empty list, if the file should be scanned as a whole.
+    """
+    try:
+        if os.path.getsize(filename) <= max(chunk_size, 1):
+            return []
+    except OSError:
+        # We let the regular scanning logic deal with this.
+        return []
+
+    if (
+        not get_plugins()
+        or _is_filtered_out(required_filter_parameters=['filename'], filename=filename)
+        # Chunks are split up on line breaks, before they are decoded.
+        or not bytes_scan.is_supported_encoding(locale.getpreferredencoding(False))
+        or is_binary_file(filename)
+    ):
+        return []
+
+    try:
+        # Transformers need to see the whole file. Just like `_get_code_snippets_from_large_file`,
+        # the file is read lazily, so most of them give up after reading only the first few lines.
+        with open(filename) as text_file:
+            if get_transformed_file(cast(NamedIO, text_file)):
+                return []
+
+        with open(filename, 'rb') as f, mmap.mmap(
+            f.fileno(),
+            0,
+            access=mmap.ACCESS_READ,
+        ) as buffer:
+            return bytes_scan.get_chunks(buffer, chunk_size)
+    except (OSError, UnicodeDecodeError):
+        # We let the regular scanning logic deal with this.
+        return []
+
+
+def scan_file_chunk(
+    filename: str,
+    chunk: bytes_scan.Chunk,
+) -> Generator[PotentialSecret, None, None]:
+    """
+    :raises: IOError
+    :raises: UnicodeDecodeError: if the chunk can't be decoded, the file should be treated
+        as a binary file (and none of its chunks' secrets reported).
+    """
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        lines = bytes_scan.get_chunk_code_snippets(buffer, chunk, name=filename)
+
+    yield from _process_line_based_plugins(lines, filename)
+
+
+def scan_file_with_eager_transformers(filename: str) -> Generator[PotentialSecret, None, None]:
+    """
+    When scanning a file in chunks (see `get_file_chunks`), this is what `scan_file` would
+    have done if the file's lines didn't yield any secrets.
+    """
+    try:
+        with open(filename) as f:
+            lines = get_transformed_file(cast(NamedIO, f), use_eager_transformers=True)
+    except (IOError, UnicodeDecodeError):
+        return
+
+    if lines:
+        yield from _process_line_based_plugins(get_code_snippets(lines), filename)
+
+
+def scan_blob(filename: str, content: bytes) -> Generator[PotentialSecret, None, None]:
+    """
+    This scans file contents that aren't on disk (e.g. from git history), as if they were
+    the contents of `filename`.
+    """
+    if not get_plugins():   # pragma: no cover
+        log.error('No plugins to scan with!')
+        return
+
+    if _is_filtered_out(
+        required_filter_parameters=['filename'],
+        # There's no need for the file to exist on disk.
+        excluded_filters=['detect_secrets.filters.common.is_invalid_file'],
+        filename=filename,
+    ):
+        return
+
+    if is_binary(content[:BINARY_SNIFF_SIZE]):
+        return
+
+    try:
+        file = FileContent.decode(filename, content).open()
+    except UnicodeDecodeError:
+        # Just like `scan_file`, we flat out ignore binary files.
+        return
+
+    yield from _process_file(
+        (get_code_snippets(lines) for lines in _get_lines_from_file_object(file)),
+        filename=filename,
+    )
+
+
 def scan_diff(diff: str) -> Generator[PotentialSecret, None, None]:
     """
     :raises: ImportError
@@ -175,7 +332,10 @@ def scan_diff(diff: str) -> Generator[PotentialSecret, None, None]:
         return
 
     for filename, lines in _get_lines_from_diff(diff):
-        yield from _process_line_based_plugins(lines, filename=filename)
+        yield from _process_line_based_plugins(
+            _get_code_snippets_from_diff(lines),
+            filename=filename,
+        )
 
 
 def scan_for_allowlisted_secrets_in_file(filename: str) -> Generator[PotentialSecret, None, None]:
@@ -201,8 +361,18 @@ def scan_for_allowlisted_secrets_in_file(filename: str) -> Generator[PotentialSe
     # know which lines we want to scan.
     try:
         for lines in _get_lines_from_file(filename):
-            yield from _scan_for_allowlisted_secrets_in_lines(enumerate(lines, start=1), filename)
+            # Lines are read lazily, so we only know that this isn't a binary file once we're
+            # done with them.
+            yield from list(
+                _scan_for_allowlisted_secrets_in_lines(
+                    get_code_snippets(line.rstrip() for line in lines),
+                    filename,
+                ),
+            )
             break
+    except UnicodeDecodeError:
+        # We flat out ignore binary files
+        return
     except IOError:
         log.warning(f'Unable to open file: {filename}')
         return
@@ -214,22 +384,25 @@ def scan_for_allowlisted_secrets_in_diff(diff: str) -> Generator[PotentialSecret
         return
 
     for filename, lines in _get_lines_from_diff(diff):
-        yield from _scan_for_allowlisted_secrets_in_lines(lines, filename)
+        yield from _scan_for_allowlisted_secrets_in_lines(
+            _get_code_snippets_from_diff([(number, line.rstrip()) for number, line in lines]),
+            filename,
+        )
 
 
 def _scan_for_allowlisted_secrets_in_lines(
-    lines: Iterable[Tuple[int, str]],
+    lines: Iterable[Tuple[int, str, CodeSnippet]],
     filename: str,
 ) -> Generator[PotentialSecret, None, None]:
+    """
+    :param lines: (line_number, line, context) for each line to scan.
+    """
     # We control the setting here because it makes more sense than requiring the caller
     # to set this setting before calling this function.
     get_settings().disable_filters('detect_secrets.filters.allowlist.is_line_allowlisted')
-    get_filters.cache_clear()
 
-    line_numbers, lines = zip(*lines)
-    line_content = [line.rstrip() for line in lines]
-    for line_number, line in zip(line_numbers, line_content):
-        context = get_code_snippet(line_content, line_number)
+    for line_number, line, context in lines:
+        line = line.rstrip()
         if not is_line_allowlisted(
             filename=filename,
             line=line,
@@ -240,7 +413,7 @@ def _scan_for_allowlisted_secrets_in_lines(
         if _is_filtered_out(required_filter_parameters=['line'], filename=filename, line=line):
             continue
 
-        for plugin in get_plugins():
+        for plugin in get_prefilter().get_plugins_for_line(line):
             yield from _scan_line(
                 plugin=plugin,
                 filename=filename,
@@ -250,7 +423,40 @@ def _scan_for_allowlisted_secrets_in_lines(
             )
 
 
-def _get_lines_from_file(filename: str) -> Generator[List[str], None, None]:
+def _get_tracked_files(root: str) -> Dict[str, str]:
+    """
+    :returns: a mapping of git tracked files (relative to root, or the current working
+        directory) to their object IDs.
+    :raises: CalledProcessError
+    """
+    base = root or os.getcwd()
+    git_root = git.get_root_directory(root)
+    is_base_git_root = os.path.realpath(base) == os.path.realpath(git_root)
+
+    output = {}
+    for path, object_id in git.get_tracked_files_with_object_ids(git_root):
+        filename = os.path.join(git_root, path)
+        if object_id:
+            # Files that are unmodified in the working tree are guaranteed to exist, so we
+            # don't need to touch the filesystem at all.
+            relative_path: Optional[str] = (
+                convert_local_os_path(path)
+                if is_base_git_root
+                else os.path.relpath(filename, base)
+            )
+        elif os.path.isfile(filename):
+            relative_path = get_relative_path(root=base, path=filename)
+        else:
+            # e.g. deleted files
+            continue
+
+        if relative_path and not relative_path.startswith(os.pardir + os.sep):
+            output[relative_path] = object_id
+
+    return output
+
+
+def _get_lines_from_file(filename: str) -> Generator[Iterable[str], None, None]:
     """
     This attempts to get lines in a given file. If no more lines are needed, the caller
     is responsible for breaking out of this loop.
@@ -258,26 +464,106 @@ def _get_lines_from_file(filename: str) -> Generator[List[str], None, None]:
     :raises: IOError
     :raises: FileNotFoundError
     """
-    with open(filename) as f:
-        log.info(f'Checking file: {filename}')
+    if is_binary_file(filename):
+        # Binary files can't be decoded as text anyway, so there's no point in trying.
+        log.info(f'Skipping binary file: {filename}')
+        return
 
-        try:
-            lines = get_transformed_file(cast(NamedIO, f))
-            if not lines:
-                lines = f.readlines()
-        except UnicodeDecodeError:
+    try:
+        with open(filename, 'rb') as f:
+            # The file is only read (and decoded) once, no matter how many times its lines are
+            # interpreted.
+            content = FileContent.read(f)
+    except UnicodeDecodeError:
+        # We flat out ignore binary files
+        return
+
+    log.info(f'Checking file: {filename}')
+    yield from _get_lines_from_file_object(content.open())
+
+
+def _should_use_bytes_mode(filename: str, threshold: int) -> bool:
+    try:
+        if os.path.getsize(filename) < max(threshold, 1):
+            return False
+    except OSError:
+        # We let the regular scanning logic deal with this.
+        return False
+
+    if not bytes_scan.is_supported_encoding(locale.getpreferredencoding(False)):
+        return False
+
+    if bytes_scan.get_line_screen().patterns is None:
+        log.debug(f'Unable to scan {filename} in bytes mode, with the configured plugins.')
+        return False
+
+    return True
+
+
+def _get_code_snippets_from_large_file(
+    filename: str,
+) -> Generator[Iterable[Tuple[int, str, CodeSnippet]], None, None]:
+    """
+    This is the equivalent of `_get_lines_from_file`, for files that are scanned in bytes mode.
+    Rather than every line in the file, this only yields the lines that could contain secrets.
+
+    :raises: IOError
+    """
+    if is_binary_file(filename):
+        log.info(f'Skipping binary file: {filename}')
+        return
+
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        if not bytes_scan.is_decodable(buffer, locale.getpreferredencoding(False)):
             # We flat out ignore binary files
             return
 
-        yield lines
+        log.info(f'Checking file: {filename}')
 
-        # If the above lines don't prove to be useful to the caller, try using eager transformers.
-        f.seek(0)
-        lines = get_transformed_file(cast(NamedIO, f), use_eager_transformers=True)
-        if not lines:
-            return
+        # Just like `_get_lines_from_file_object`, transformers get the first chance at
+        # interpreting the file. Since it's read lazily, most of them give up after reading
+        # only the first few lines.
+        with open(filename) as text_file:
+            lines = get_transformed_file(cast(NamedIO, text_file))
+
+        if lines:
+            yield get_code_snippets(lines)
+        else:
+            yield bytes_scan.get_code_snippets(
+                buffer,
+                bytes_scan.get_line_screen().find_lines(buffer),
+                name=filename,
+            )
 
-        yield lines
+    with open(filename) as text_file:
+        lines = get_transformed_file(cast(NamedIO, text_file), use_eager_transformers=True)
+
+    if lines:
+        yield get_code_snippets(lines)
+
+
+def _get_lines_from_file_object(file: NamedIO) -> Generator[Iterable[str], None, None]:
+    """
+    :raises: UnicodeDecodeError: lines are read lazily, so binary files may only be
+        detected while iterating through them.
+    """
+    try:
+        lines: Optional[Iterable[str]] = get_transformed_file(file)
+    except UnicodeDecodeError:
+        # We flat out ignore binary files
+        return
+
+    # NOTE: The file itself is iterated through lazily, so that we don't need to hold every
+    # line of (potentially very large) files in memory, on top of their contents.
+    yield lines or file
+
+    # If the above lines don't prove to be useful to the caller, try using eager transformers.
+    file.seek(0)
+    lines = get_transformed_file(file, use_eager_transformers=True)
+    if not lines:
+        return
+
+    yield lines
 
 
 def _get_lines_from_diff(diff: str) -> Generator[Tuple[str, List[Tuple[int, str]]], None, None]:
@@ -306,50 +592,227 @@ def _get_lines_from_diff(diff: str) -> Generator[Tuple[str, List[Tuple[int, str]
         )
 
 
-def _process_line_based_plugins(
+def _get_code_snippets_from_diff(
     lines: List[Tuple[int, str]],
+) -> Generator[Tuple[int, str, CodeSnippet], None, None]:
+    line_content = [line for _, line in lines]
+    for line_number, line in lines:
+        yield line_number, line, get_code_snippet(lines=line_content, line_number=line_number)
+
+
+def _process_file(
+    iterator: Iterable[Iterable[Tuple[int, str, CodeSnippet]]],
     filename: str,
 ) -> Generator[PotentialSecret, None, None]:
-    line_content = [line[1] for line in lines]
+    """
+    :param iterator: yields different interpretations of the file's lines (see
+        `_get_lines_from_file`), until one of them yields secrets. Each of these is a
+        sequence of (line_number, line, context).
+    """
+    for lines in iterator:
+        try:
+            # Since lines are read lazily, we only know that this isn't a binary file once
+            # we have read all of them.
+            secrets = list(_process_line_based_plugins(lines, filename))
+        except UnicodeDecodeError:
+            # We flat out ignore binary files
+            return
+
+        yield from secrets
+        if secrets:
+            break
+
+
+def _process_line_based_plugins(
+    lines: Iterable[Tuple[int, str, CodeSnippet]],
+    filename: str,
+) -> Generator[PotentialSecret, None, None]:
+    """
+    :param lines: (line_number, line, context) for each line to scan.
+    """
+    prefilter = get_prefilter()
+    max_line_length = get_settings().max_line_length
+
+    # These are looked up once, rather than for every line.
+    plan = get_call_plan()
+    line_filters = plan.get_filter_stage(
+        required_parameters=['line'],
+        available_parameters=['filename', 'line', 'context'],
+    )
+    context_filters = plan.get_filter_stage(
+        required_parameters=['context'],
+        available_parameters=['filename', 'secret', 'plugin', 'line', 'context'],
+    )
 
     # NOTE: We iterate through lines *then* plugins, because we want to quit early if any of the
     # filters return True.
-    for line_number, line in lines:
+    for line_number, line, code_snippet in lines:
         log.debug(f'Processing {filename}:{line_number}')
         line = line.rstrip()
-        code_snippet = get_code_snippet(
-            lines=line_content,
-            line_number=line_number,
-        )
 
-        # We apply line-specific filters, and see whether that allows us to quit early.
-        if _is_filtered_out(
-            required_filter_parameters=['line'],
-            filename=filename,
-            line=line,
-            context=code_snippet,
-        ):
-            continue
+        if not max_line_length or len(line) <= max_line_length:
+            # We apply line-specific filters, and see whether that allows us to quit early.
+            if line_filters.is_filtered_out(
+                filename=filename,
+                line=line,
+                context=code_snippet,
+            ):
+                continue
 
-        yield from (
-            secret
-            for plugin in get_plugins()
-            for secret in _scan_line(
-                plugin=plugin,
+            yield from _process_line(
                 filename=filename,
                 line=line,
                 line_number=line_number,
                 context=code_snippet,
+                prefilter=prefilter,
+                plan=plan,
+                context_filters=context_filters,
             )
-            if not _is_filtered_out(
-                required_filter_parameters=['context'],
-                filename=secret.filename,
-                secret=secret.secret_value,
-                plugin=plugin,
-                line=line,
-                context=code_snippet,
+            continue
+
+        # Rather than running every plugin over the whole line (e.g. in minified files), we
+        # scan it in windows. Since these overlap, the same secret may be found more than once.
+        seen: Set[PotentialSecret] = set()
+        for column, window in _get_line_windows(line, max_line_length):
+            log.debug(f'Processing {filename}:{line_number}:{column}')
+
+            context = CodeSnippet(
+                snippet=list(code_snippet.lines),
+                start_line=code_snippet.start_line,
+                target_index=code_snippet.target_index,
             )
+            context.target_line = window
+
+            for secret in _process_line(
+                filename=filename,
+                line=window,
+                line_number=line_number,
+                context=context,
+                prefilter=prefilter,
+                plan=plan,
+                context_filters=context_filters,
+            ):
+                if secret in seen:
+                    continue
+
+                offset = window.find(secret.secret_value) if secret.secret_value else -1
+                if offset == -1:
+                    secret.column = column
+                    statement = window
+                else:
+                    secret.column = column + offset
+                    statement = _get_statement(
+                        line,
+                        start=secret.column,
+                        end=secret.column + len(cast(str, secret.secret_value)),
+                    )
+
+                # Line filters are intended for statements (e.g. `key = get_key()`), so rather
+                # than the whole line, they're run on the statement that the secret was found in.
+                if line_filters.is_filtered_out(
+                    filename=filename,
+                    line=statement,
+                    context=context,
+                ):
+                    continue
+
+                seen.add(secret)
+                yield secret
+
+
+def get_line_windows(line: str) -> Generator[Tuple[int, str], None, None]:
+    """
+    Anything that needs to find the secrets that a scan found on a line (e.g. audits) needs
+    to look at the line in the same way that the scan did.
+
+    :returns: (column, window) for each window that the line is scanned in.
+    """
+    max_line_length = get_settings().max_line_length
+
+    stripped_line = line.rstrip()
+    if not max_line_length or len(stripped_line) <= max_line_length:
+        yield 0, line
+    else:
+        yield from _get_line_windows(stripped_line, max_line_length)
+
+
+def _process_line(
+    filename: str,
+    line: str,
+    line_number: int,
+    context: CodeSnippet,
+    prefilter: PluginPrefilter,
+    plan: CallPlan,
+    context_filters: FilterStage,
+) -> Generator[PotentialSecret, None, None]:
+    yield from (
+        secret
+        # Only plugins that could possibly find something in this line are run.
+        for plugin in prefilter.get_plugins_for_line(line)
+        for secret in _scan_line(
+            plugin=plugin,
+            filename=filename,
+            line=line,
+            line_number=line_number,
+            context=context,
+            plan=plan,
+        )
+        if not context_filters.is_filtered_out(
+            filename=secret.filename,
+            secret=secret.secret_value,
+            plugin=plugin,
+            line=line,
+            context=context,
         )
+    )
+
+
+def _get_line_windows(line: str, max_length: int) -> Generator[Tuple[int, str], None, None]:
+    """
+    Splits a line into windows of (at most) `max_length` characters. Where possible, windows
+    end on token boundaries (e.g. whitespace), so that tokens of up to half a window are never
+    split up. Consecutive windows also overlap by up to a quarter of a window, for secrets that
+    span several tokens (e.g. `password = "hunter2"`).
+
+    :returns: (column, window) for each window, where column is the window's offset in the line.
+    """
+    overlap = max_length // 4
+    regex = _get_token_boundary_regex()
+
+    start = 0
+    while start + max_length < len(line):
+        end = start + max_length
+        for match in regex.finditer(line, end - max_length // 2, end):
+            end = match.end()
+
+        yield start, line[start:end]
+
+        match = regex.search(line, end - overlap, end)
+        start = match.end() if match else end - overlap
+
+    yield start, line[start:]
+
+
+@lru_cache(maxsize=1)
+def _get_token_boundary_regex() -> Pattern:
+    return re.compile(r'[\s,;]')
+
+
+def _get_statement(line: str, start: int, end: int) -> str:
+    """
+    :returns: the statement (i.e. up to the nearest `;` on either side) that contains
+        line[start:end], limited to `MAX_STATEMENT_CONTEXT` characters on either side.
+    """
+    lower_bound = max(start - MAX_STATEMENT_CONTEXT, 0)
+    upper_bound = min(end + MAX_STATEMENT_CONTEXT, len(line))
+
+    separator = line.rfind(';', lower_bound, start)
+    start = lower_bound if separator == -1 else separator + 1
+
+    separator = line.find(';', end, upper_bound)
+    end = upper_bound if separator == -1 else separator
+
+    return line[start:end]
 
 
 def _scan_line(
@@ -358,12 +821,16 @@ def _scan_line(
     line: str,
     line_number: int,
     context: CodeSnippet,
+    plan: Optional[CallPlan] = None,
     **kwargs: Any,
 ) -> Generator[PotentialSecret, None, None]:
+    if not plan:
+        plan = get_call_plan()
+
     # NOTE: We don't apply filter functions here yet, because we don't have any filters
     # that operate on (filename, line, plugin) without `secret`
-    secrets = call_function_with_arguments(
-        plugin.analyze_line,
+    secrets = plan.analyze_line(
+        plugin,
         filename=filename,
         line=line,
         line_number=line_number,
@@ -373,11 +840,14 @@ def _scan_line(
     if not secrets:
         return
 
+    secret_filters = plan.get_filter_stage(
+        required_parameters=['secret'],
+        available_parameters=['filename', 'secret', 'plugin', 'line'],
+    )
     yield from (
         secret
         for secret in secrets
-        if not _is_filtered_out(
-            required_filter_parameters=['secret'],
+        if not secret_filters.is_filtered_out(
             filename=secret.filename,
             secret=secret.secret_value,
             plugin=plugin,
@@ -386,32 +856,16 @@ def _scan_line(
     )
 
 
-def _is_filtered_out(required_filter_parameters: Iterable[str], **kwargs: Any) -> bool:
-    for filter_fn in get_filters_with_parameter(*required_filter_parameters):
-        try:
-            if call_function_with_arguments(filter_fn, **kwargs):
-                if 'secret' in kwargs:
-                    debug_msg = f'Skipping "{0}" due to `{1}`.'.format(
-                        kwargs['secret'],
-                        filter_fn.path,
-                    )
-                elif list(kwargs.keys()) == ['filename']:
-                    # We want to make sure this is only run if we're skipping files (as compared
-                    # to other filters that may include `filename` as a parameter).
-                    debug_msg = 'Skipping "{0}" due to `{1}`'.format(
-                        kwargs['filename'],
-                        filter_fn.path,
-                    )
-                else:
-                    debug_msg = 'Skipping secret due to `{0}`.'.format(filter_fn.path)
-
-                log.info(debug_msg)
-                return True
-        except TypeError:
-            # Skipping non-compatible filters
-            pass
-
-    return False
+def _is_filtered_out(
+    required_filter_parameters: Iterable[str],
+    excluded_filters: Iterable[str] = (),
+    **kwargs: Any,
+) -> bool:
+    return get_call_plan().get_filter_stage(
+        required_parameters=required_filter_parameters,
+        available_parameters=kwargs,
+        excluded_filters=excluded_filters,
+    ).is_filtered_out(**kwargs)
 
 
 def get_filters_with_parameter(*parameters: str) -> List[SelfAwareCallable]:
@@ -0,0 +1,58 @@
+"""
+Workers that scan files in parallel need to use the same settings as the process that started
+them. Rather than having each of them re-apply the settings from scratch (initializing plugins,
+loading custom plugins and filters, building wordlists etc.), we take an immutable snapshot of
+the settings when the scan starts, and hand that to them.
+
+Workers that were forked after the snapshot was taken already have these settings (along with
+everything that was computed from them), so they don't need to do anything at all. Otherwise
+(e.g. when workers are spawned), they are configured from the snapshot.
+"""
+import json
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from ..settings import configure_settings_from_baseline
+from ..settings import get_settings
+from .cache import get_settings_fingerprint
+
+
+class ScanConfig(NamedTuple):
+    # The settings, in the same format that they're saved to baselines with.
+    settings: str
+
+    # This identifies everything (apart from the files themselves) that can affect the results
+    # of a scan, and is the same as the one used to cache scan results.
+    fingerprint: str
+
+
+def get_scan_config() -> ScanConfig:
+    """Takes a snapshot of the current settings."""
+    global _scan_config
+
+    settings = get_settings()
+    config = ScanConfig(
+        settings=json.dumps(settings.json()),
+        fingerprint=get_settings_fingerprint(),
+    )
+
+    _scan_config = (settings.generation, config)
+    return config
+
+
+def configure_worker(config: ScanConfig) -> None:
+    """This is used to initialize workers, before they start scanning."""
+    global _scan_config
+
+    if _scan_config == (get_settings().generation, config):
+        # This process was forked after the snapshot was taken, and the settings have not
+        # changed since.
+        return
+
+    settings = configure_settings_from_baseline(json.loads(config.settings))
+    _scan_config = (settings.generation, config)
+
+
+# (generation of the settings, snapshot of them) for the latest snapshot in this process.
+_scan_config: Optional[Tuple[int, ScanConfig]] = None
@@ -0,0 +1,141 @@
+"""
+When scanning files in parallel, the order in which they are handed out matters as much as how
+many workers there are. A large file handed out last leaves one worker busy long after the
+others have finished, while handing out tiny files one at a time spends more time sending
+them between processes than scanning them.
+
+As such, we hand out the largest files first, and group the rest into batches: each of which
+is a fraction of the work that remains. This way, batches get smaller towards the end of the
+scan, and workers that finish early pick up the remaining batches (rather than waiting on
+a worker that took on too much).
+
+Before any of this, we decide whether it's worth having workers at all: starting processes (and
+configuring them) takes time, so small scans are faster when done in the current process.
+"""
+import multiprocessing as mp
+import os
+from enum import Enum
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+from .log import log
+
+
+# Opening and reading a file (or chunk of a file) costs roughly as much as scanning this many
+# bytes, so empty files still count towards a batch.
+TASK_OVERHEAD = 4 * 1024
+
+# Each batch takes on (at most) this fraction of the remaining work, per worker.
+BATCHES_PER_WORKER = 4
+
+# Batches are never smaller than this, since each of them needs to be sent to a worker.
+MIN_BATCH_SIZE = 256 * 1024
+
+# Each process needs to have at least this much work to make up for the time it takes to start.
+MIN_WORK_PER_PROCESS = 512 * 1024
+
+# Threads only help when workers spend most of their time waiting (e.g. on a remote cache),
+# and this is the same limit that `concurrent.futures.ThreadPoolExecutor` uses.
+MAX_THREADS = 32
+
+
+class ExecutionMode(Enum):
+    SERIAL = 'serial'
+    THREADS = 'threads'
+    PROCESSES = 'processes'
+
+
+class ExecutionPlan(NamedTuple):
+    mode: ExecutionMode
+    num_workers: int
+
+
+Task = TypeVar('Task')
+
+
+def get_batches(tasks: List[Tuple[Task, int]], num_workers: int) -> List[List[Task]]:
+    """
+    :param tasks: (task, size) for each task, where size is the number of bytes to scan.
+    :returns: the tasks, grouped into batches in the order that they should be handed out.
+    """
+    ordered = sorted(tasks, key=lambda item: item[1], reverse=True)
+    remaining = sum(_get_cost(size) for _, size in ordered)
+
+    output = []
+    batch: List[Task] = []
+    batch_cost = 0
+    for task, size in ordered:
+        batch.append(task)
+        batch_cost += _get_cost(size)
+
+        if batch_cost >= max(remaining // (BATCHES_PER_WORKER * num_workers), MIN_BATCH_SIZE):
+            output.append(batch)
+            remaining -= batch_cost
+
+            batch = []
+            batch_cost = 0
+
+    if batch:
+        output.append(batch)
+
+    return output
+
+
+def get_execution_plan(
+    sizes: List[int],
+    max_workers: Optional[int] = None,
+    is_io_bound: bool = False,
+    mode: Optional[ExecutionMode] = None,
+) -> ExecutionPlan:
+    """
+    :param sizes: the number of bytes to scan, for each task.
+    :param max_workers: defaults to the number of CPUs available to this process.
+    :param is_io_bound: whether workers are expected to spend most of their time waiting,
+        rather than scanning.
+    :param mode: if specified, this mode is used regardless of the size of the scan.
+    """
+    if not max_workers:
+        max_workers = get_cpu_count()
+
+    cost = sum(_get_cost(size) for size in sizes)
+    num_threads = max(min(max_workers + 4, len(sizes), MAX_THREADS), 1)
+    num_processes = max(min(max_workers, len(sizes)), 1)
+    if not mode:
+        # Unless told otherwise, we only start as many processes as there is work for.
+        num_processes = min(num_processes, max(cost // MIN_WORK_PER_PROCESS, 1))
+
+        if is_io_bound and num_threads > 1:
+            mode = ExecutionMode.THREADS
+        elif num_processes > 1:
+            mode = ExecutionMode.PROCESSES
+        else:
+            mode = ExecutionMode.SERIAL
+
+    if mode == ExecutionMode.PROCESSES:
+        plan = ExecutionPlan(mode=mode, num_workers=num_processes)
+    elif mode == ExecutionMode.THREADS:
+        plan = ExecutionPlan(mode=mode, num_workers=num_threads)
+    else:
+        plan = ExecutionPlan(mode=mode, num_workers=1)
+
+    log.debug(
+        f'Scanning {len(sizes)} tasks ({cost} bytes, including overhead) in {plan.mode.value} '
+        f'mode, with {plan.num_workers} worker(s) (max_workers={max_workers}, '
+        f'is_io_bound={is_io_bound})',
+    )
+    return plan
+
+
+def get_cpu_count() -> int:
+    """This respects CPU affinity (e.g. in containers), where supported."""
+    try:
+        return len(os.sched_getaffinity(0))     # type: ignore
+    except AttributeError:      # pragma: no cover
+        return mp.cpu_count()
+
+
+def _get_cost(size: int) -> int:
+    return size + TASK_OVERHEAD
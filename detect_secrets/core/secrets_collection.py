@@ -1,6 +1,9 @@
 import multiprocessing as mp
 import os
 from collections import defaultdict
+from functools import partial
+from multiprocessing.pool import Pool
+from multiprocessing.pool import ThreadPool
 from typing import Any
 from typing import Dict
 from typing import Generator
@@ -11,9 +14,23 @@ from typing import Tuple
 
 from . import scan
 from ..util.path import convert_local_os_path
+from .bytes_scan import Chunk
+from .cache import compute_content_hash
+from .cache import ScanResultCache
+from .log import log
 from .potential_secret import PotentialSecret
-from detect_secrets.settings import configure_settings_from_baseline
-from detect_secrets.settings import get_settings
+from .scan_config import configure_worker
+from .scan_config import get_scan_config
+from .scheduler import ExecutionMode
+from .scheduler import get_batches
+from .scheduler import get_execution_plan
+
+
+# Files larger than this (in bytes) are split into chunks, that are scanned in parallel.
+CHUNK_SIZE = 32 * 1024 * 1024
+
+# (filename, content_hash, chunk) for each file (or chunk of a file) to scan.
+_Task = Tuple[str, str, Optional[Chunk]]
 
 
 class PatchedFile:
@@ -49,31 +66,170 @@ class SecretsCollection:
     def files(self) -> Set[str]:
         return set(self.data.keys())
 
-    def scan_files(self, *filenames: str, num_processors: Optional[int] = None) -> None:
-        """Just like scan_file, but optimized through parallel processing."""
-        if len(filenames) == 1:
-            self.scan_file(filenames[0])
+    def scan_files(
+        self,
+        *filenames: str,
+        num_processors: Optional[int] = None,
+        cache: Optional[ScanResultCache] = None,
+        content_hashes: Optional[Dict[str, str]] = None,
+        chunk_size: int = CHUNK_SIZE,
+        mode: Optional[ExecutionMode] = None,
+    ) -> None:
+        """
+        Just like scan_file, but optimized through parallel processing.
+
+        :param mode: by default, this is chosen based on how much there is to scan
+            (see `detect_secrets.core.scheduler.get_execution_plan`).
+
+        :param content_hashes: if known ahead of time (e.g. through git), this allows the
+            cache to look up files without reading them.
+        :param chunk_size: files larger than this (in bytes) are split into chunks of lines,
+            which are scanned in parallel.
+        """
+        if not content_hashes:
+            content_hashes = {}
+
+        # Each task is sized by the number of bytes to scan, so that they can be scheduled.
+        tasks: List[Tuple[_Task, int]] = []
+        chunked_files: Dict[str, _ChunkedFile] = {}
+        for filename in filenames:
+            path = os.path.join(self.root, filename)
+            content_hash = content_hashes.get(filename, '')
+
+            size = _get_file_size(path)
+            chunks = scan.get_file_chunks(path, chunk_size=chunk_size) if size > chunk_size else []
+            if not chunks:
+                tasks.append(((path, content_hash, None), size))
+                continue
+
+            if cache:
+                # Since chunks are scanned separately, we look up the file before scanning them.
+                if not content_hash:
+                    content_hash = compute_content_hash(path)
+
+                secrets = cache.get(path, content_hash)
+                if secrets is not None:
+                    self._add_secrets(secrets)
+                    continue
+
+            chunked_files[path] = _ChunkedFile(
+                content_hash=content_hash,
+                remaining_chunks=len(chunks),
+            )
+            tasks.extend(
+                ((path, content_hash, chunk), chunk.end - chunk.start)
+                for chunk in chunks
+            )
+
+        if len(filenames) == 1 and len(tasks) == 1 and not chunked_files:
+            self.scan_file(
+                filenames[0],
+                cache=cache,
+                content_hash=content_hashes.get(filenames[0], ''),
+            )
             return
 
-        if not num_processors:
-            num_processors = mp.cpu_count()
+        if not tasks:
+            # e.g. every file was found in the cache.
+            return
 
-        child_process_settings = get_settings().json()
+        plan = get_execution_plan(
+            [size for _, size in tasks],
+            max_workers=num_processors,
+            is_io_bound=bool(cache and cache.storage.is_remote),
+            mode=mode,
+        )
+
+        # Rather than sending workers one file at a time, they're sent in batches. Since
+        # workers ask for the next batch when they're done, this balances the work between
+        # them (see `detect_secrets.core.scheduler`).
+        batches = get_batches(tasks, num_workers=plan.num_workers)
+        scan_batch = partial(_scan_batch_and_serialize, cache=cache)
+
+        if plan.mode == ExecutionMode.SERIAL:
+            for batch in batches:
+                self._add_batch_results(scan_batch(batch), chunked_files, cache=cache)
+        else:
+            pool: Pool
+            if plan.mode == ExecutionMode.THREADS:
+                # Threads share this process' settings, so they don't need to be configured.
+                pool = ThreadPool(processes=plan.num_workers)
+            else:
+                pool = mp.Pool(
+                    processes=plan.num_workers,
+                    initializer=configure_worker,
+                    initargs=(get_scan_config(),),
+                )
+
+            with pool as p:
+                for results in p.imap_unordered(scan_batch, batches):
+                    self._add_batch_results(results, chunked_files, cache=cache)
+
+        if cache:
+            cache.prune()
+
+    def _add_batch_results(
+        self,
+        results: List[Tuple[str, Optional[List[PotentialSecret]]]],
+        chunked_files: Dict[str, '_ChunkedFile'],
+        cache: Optional[ScanResultCache] = None,
+    ) -> None:
+        for path, secrets in results:
+            if path not in chunked_files:
+                self._add_secrets(secrets or [])
+                continue
 
-        with mp.Pool(
-            processes=num_processors,
-            initializer=configure_settings_from_baseline,
-            initargs=(child_process_settings,),
-        ) as p:
-            for secrets in p.imap_unordered(
-                _scan_file_and_serialize,
-                [os.path.join(self.root, filename) for filename in filenames],
-            ):
-                for secret in secrets:
-                    self[os.path.relpath(secret.filename, self.root)].add(secret)
+            chunked_file = chunked_files[path]
+            chunked_file.remaining_chunks -= 1
+            if secrets is None:
+                # Just like binary files, files that can't be decoded are ignored.
+                chunked_file.is_decodable = False
+            elif chunked_file.is_decodable:
+                chunked_file.secrets.extend(secrets)
+
+            if not chunked_file.remaining_chunks:
+                self._add_chunked_file_results(path, chunked_file, cache=cache)
+
+    def _add_chunked_file_results(
+        self,
+        path: str,
+        chunked_file: '_ChunkedFile',
+        cache: Optional[ScanResultCache] = None,
+    ) -> None:
+        if not chunked_file.is_decodable:
+            secrets = []
+        elif not chunked_file.secrets:
+            # This is what `scan.scan_file` would do, if the file's lines didn't yield
+            # any secrets.
+            secrets = list(scan.scan_file_with_eager_transformers(path))
+        else:
+            # Chunks are scanned in any order. However, if the same secret is found on several
+            # lines, we want to report the same line that `scan.scan_file` would.
+            secrets = sorted(chunked_file.secrets, key=lambda secret: secret.line_number)
+
+        if cache and chunked_file.content_hash:
+            cache.set(path, chunked_file.content_hash, secrets)
 
-    def scan_file(self, filename: str) -> None:
-        for secret in scan.scan_file(os.path.join(self.root, convert_local_os_path(filename))):
+        self._add_secrets(secrets)
+
+    def _add_secrets(self, secrets: List[PotentialSecret]) -> None:
+        for secret in secrets:
+            self[os.path.relpath(secret.filename, self.root)].add(secret)
+
+    def scan_file(
+        self,
+        filename: str,
+        cache: Optional[ScanResultCache] = None,
+        content_hash: str = '',
+    ) -> None:
+        """
+        :param cache: if provided, results of previous scans will be reused when possible.
+        """
+        for secret in _scan_file_and_serialize(
+            os.path.join(self.root, convert_local_os_path(filename)),
+            cache=cache,
+            content_hash=content_hash,
+        ):
             self[convert_local_os_path(filename)].add(secret)
 
     def scan_diff(self, diff: str) -> None:
@@ -313,6 +469,64 @@ class SecretsCollection:
         return sum(len(secrets) for secrets in self.data.values())
 
 
-def _scan_file_and_serialize(filename: str) -> List[PotentialSecret]:
+def _scan_file_and_serialize(
+    filename: str,
+    cache: Optional[ScanResultCache] = None,
+    content_hash: str = '',
+) -> List[PotentialSecret]:
     """Used for multiprocessing, since lambdas can't be serialized."""
+    if cache:
+        return cache.scan_file(filename, content_hash=content_hash)
+
     return list(scan.scan_file(filename))
+
+
+def _scan_batch_and_serialize(
+    batch: List[_Task],
+    cache: Optional[ScanResultCache] = None,
+) -> List[Tuple[str, Optional[List[PotentialSecret]]]]:
+    return [_scan_task_and_serialize(task, cache=cache) for task in batch]
+
+
+def _scan_task_and_serialize(
+    task: _Task,
+    cache: Optional[ScanResultCache] = None,
+) -> Tuple[str, Optional[List[PotentialSecret]]]:
+    """
+    :returns: (filename, secrets). For chunks, secrets are None if the chunk couldn't be
+        decoded.
+    """
+    filename, content_hash, chunk = task
+    if not chunk:
+        return filename, _scan_file_and_serialize(
+            filename,
+            cache=cache,
+            content_hash=content_hash,
+        )
+
+    try:
+        return filename, list(scan.scan_file_chunk(filename, chunk))
+    except UnicodeDecodeError:
+        return filename, None
+    except IOError:
+        log.warning(f'Unable to open file: {filename}')
+        return filename, []
+
+
+def _get_file_size(filename: str) -> int:
+    try:
+        return os.path.getsize(filename)
+    except OSError:
+        # We let the scanning logic deal with this.
+        return 0
+
+
+class _ChunkedFile:
+    """Keeps track of a file, while its chunks are being scanned."""
+
+    def __init__(self, content_hash: str, remaining_chunks: int) -> None:
+        self.content_hash = content_hash
+        self.remaining_chunks = remaining_chunks
+
+        self.is_decodable = True
+        self.secrets: List[PotentialSecret] = []
@@ -10,6 +10,7 @@ from . import filters
 from . import plugins
 from . import scan
 from ...settings import get_settings
+from ..scheduler import ExecutionMode
 from .common import initialize_plugin_settings
 from detect_secrets.__version__ import VERSION
 
@@ -59,6 +60,16 @@ class ParserBuilder:
                 'using the max cores on the current host.'
             ),
         )
+        self._parser.add_argument(
+            '--execution-mode',
+            choices=[mode.value for mode in ExecutionMode],
+            type=str.lower,
+            help=(
+                'Specify whether to scan files in this process, or in parallel with threads or '
+                'processes. By default, this is chosen based on the number and size of files '
+                'to scan.'
+            ),
+        )
         return self
 
     def add_console_use_arguments(self) -> 'ParserBuilder':
@@ -177,6 +188,8 @@ class ParserBuilder:
                 args.path = [args.custom_root]
 
         args.num_cores = args.num_cores[0]
+        if args.execution_mode:
+            args.execution_mode = ExecutionMode(args.execution_mode)
 
         return args
 
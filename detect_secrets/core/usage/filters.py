@@ -202,6 +202,9 @@ def parse_args(args: argparse.Namespace) -> None:
             _raise_if_custom_filter_path_is_invalid(item)
             get_settings().filters[item] = {}
 
+    # Since filters were modified directly, anything computed from them needs to be updated.
+    get_settings().bump_generation()
+
 
 def _raise_if_custom_filter_path_is_invalid(path: str) -> None:
     """Performs post-validation for custom filters."""
@@ -122,6 +122,9 @@ def parse_args(args: argparse.Namespace) -> None:
     if args.hex_limit:
         get_settings().plugins['HexHighEntropyString']['limit'] = args.hex_limit
 
+    # Since plugins were modified directly, anything computed from them needs to be updated.
+    get_settings().bump_generation()
+
     if args.plugin:
         # Flatten entry for easier parsing.
         args.plugin = [entry for item in args.plugin for entry in item]
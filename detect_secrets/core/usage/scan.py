@@ -18,6 +18,7 @@ def add_scan_action(parent: argparse._SubParsersAction) -> argparse.ArgumentPars
 
     _add_adhoc_scanning(parser)
     _add_pragma_scanning(parser)
+    _add_history_scanning(parser)
     _add_initialize_baseline_options(parser)
 
     return cast(argparse.ArgumentParser, parser)
@@ -45,6 +46,24 @@ def _add_pragma_scanning(parser: argparse.ArgumentParser) -> None:
     )
 
 
+def _add_history_scanning(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--history',
+        action='store_true',
+        help=(
+            'Scans every file introduced throughout git history, rather than the current '
+            'working tree. Reports the commits that introduced each secret.'
+        ),
+    )
+    parser.add_argument(
+        '--rev-range',
+        help=(
+            'Limits `--history` to the commits in this range (e.g. `main`, or `v1.0..v2.0`). '
+            'Defaults to all refs.'
+        ),
+    )
+
+
 def _add_initialize_baseline_options(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         'path',
@@ -76,6 +95,30 @@ def _add_initialize_baseline_options(parser: argparse.ArgumentParser) -> None:
             'latest plugins'
         ),
     )
+    cache_group = group.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        '--cache-dir',
+        metavar='LOCATION',
+        help=(
+            'Where to store results of previous scans, so that unchanged files can be skipped. '
+            'This can be a local directory, or a http(s):// URL that supports GET and PUT '
+            'requests. Defaults to $DETECT_SECRETS_CACHE_DIR, or ~/.cache/detect-secrets.'
+        ),
+    )
+    cache_group.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Scan every file, rather than reusing results of previous scans.',
+    )
+    group.add_argument(
+        '--max-line-length',
+        type=int,
+        metavar='LENGTH',
+        help=(
+            'Lines longer than this (e.g. in minified files) are scanned in overlapping windows '
+            'of this many characters, rather than all at once. Disabled by default.'
+        ),
+    )
     group.add_argument(
         '--slim',
         action='store_true',
@@ -96,3 +139,24 @@ def parse_args(args: argparse.Namespace) -> None:
     if args.baseline is not None and args.force_use_all_plugins:
         get_settings().plugins.clear()
         initialize_plugin_settings(args)
+
+    if args.history:
+        # History is scanned for the repository as a whole, and reported in its own format.
+        if args.path != ['.']:
+            raise argparse.ArgumentTypeError(
+                'Paths cannot be scanned with --history. Use -C to choose the repository.',
+            )
+
+        if args.baseline is not None:
+            raise argparse.ArgumentTypeError('--baseline cannot be used with --history.')
+
+        if args.only_allowlisted:
+            raise argparse.ArgumentTypeError('--only-allowlisted cannot be used with --history.')
+    elif args.rev_range:
+        raise argparse.ArgumentTypeError('--rev-range can only be used with --history.')
+
+    if args.max_line_length is not None:
+        if args.max_line_length <= 0:
+            raise argparse.ArgumentTypeError('--max-line-length must be a positive integer.')
+
+        get_settings().max_line_length = args.max_line_length
@@ -0,0 +1,386 @@
+"""
+A long-lived process that serves `detect-secrets-hook` and `detect-secrets scan` invocations
+over a Unix socket (see `detect_secrets.client`). Not only does this skip Python's start up
+time, it also keeps the parsed hook configuration (settings, plugins, filters and baseline)
+around between invocations. This is especially useful since pre-commit splits large commits
+into multiple hook invocations.
+
+    $ detect-secrets-daemon &
+    $ detect-secrets-hook --baseline .secrets.baseline file_1 file_2
+
+Requests are handled one at a time, since settings are global to the process.
+"""
+import argparse
+import contextlib
+import copy
+import hashlib
+import io
+import json
+import logging
+import os
+import signal
+import socket
+import stat
+import sys
+from typing import Any
+from typing import Dict
+from typing import Generator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+from . import main as scan_main
+from . import pre_commit_hook
+from .__version__ import VERSION
+from .client import FORWARDED_ENVIRONMENT_VARIABLES
+from .client import get_socket_path
+from .client import receive_message
+from .client import send_message
+from .core.log import log
+from .core.secrets_collection import SecretsCollection
+from .settings import cache_bust
+from .settings import get_settings
+from .util.path import is_private_directory
+
+
+class HookState(NamedTuple):
+    cwd: str
+
+    # The arguments that were supplied before the list of filenames to scan.
+    options: List[str]
+
+    # Identifies the contents of every file that went into parsing these arguments.
+    fingerprint: str
+
+    args: argparse.Namespace
+
+    # This is modified by the hook, so we store a serialized version of it.
+    baseline: Optional[Dict[str, Any]]
+
+
+class Daemon:
+    def __init__(self, socket_path: str = '') -> None:
+        self.socket_path = socket_path or get_socket_path()
+        self.hook_state: Optional[HookState] = None
+
+    def serve_forever(self) -> None:
+        """
+        :raises: ValueError if the socket can't be listened on safely, or another daemon
+            is already listening on it.
+        """
+        directory = os.path.dirname(os.path.abspath(self.socket_path))
+        if not os.path.exists(directory):
+            os.makedirs(directory, mode=0o700)
+
+        if not is_private_directory(directory):
+            raise ValueError(
+                f'{directory} must be owned by the current user, and not writable by others.',
+            )
+
+        if os.path.lexists(self.socket_path):
+            _remove_stale_socket(self.socket_path)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            # Only the current user should be able to connect to this.
+            original_umask = os.umask(0o077)
+            try:
+                server.bind(self.socket_path)
+            finally:
+                os.umask(original_umask)
+
+            server.listen()
+            log.info(f'Listening on {self.socket_path}')
+
+            try:
+                while True:
+                    connection, _ = server.accept()
+                    with connection:
+                        self.handle_connection(connection)
+            finally:
+                os.remove(self.socket_path)
+
+    def handle_connection(self, connection: socket.socket) -> None:
+        try:
+            request = receive_message(connection)
+        except (OSError, ValueError):
+            return
+
+        try:
+            send_message(connection, self.handle_request(request))
+        except OSError:
+            # e.g. the client was interrupted.
+            pass
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        :returns: the output of the command. If the request can't be handled, the
+            client is expected to run the command itself.
+        """
+        if request.get('version') != VERSION:
+            return {'error': f'Expected version {VERSION}.'}
+
+        if request.get('command') not in {'hook', 'scan'}:
+            return {'error': 'Unknown command.'}
+
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        try:
+            with _request_context(request['cwd'], request['env'], stdout, stderr):
+                try:
+                    if request['command'] == 'hook':
+                        status = self.run_hook(request['argv'])
+                    else:
+                        status = self.run_scan(request['argv'])
+                except SystemExit as e:
+                    # argparse exits on invalid arguments.
+                    status = e.code if isinstance(e.code, int) else 1
+                except Exception as e:
+                    # One bad request shouldn't take down the daemon.
+                    log.error(f'Unexpected error: {e!r}')
+                    status = 1
+        except OSError as e:
+            # e.g. the working directory no longer exists.
+            return {'error': str(e)}
+
+        return {
+            'status': status,
+            'stdout': stdout.getvalue(),
+            'stderr': stderr.getvalue(),
+        }
+
+    def run_hook(self, argv: List[str]) -> int:
+        args = self._get_cached_hook_args(argv)
+        if args:
+            log.info('Reusing hook configuration from previous invocation.')
+            if args.baseline:
+                try:
+                    pre_commit_hook.raise_exception_if_baseline_file_is_unstaged(
+                        args.baseline_filename,
+                    )
+                except ValueError:
+                    return 1
+
+            if args.verbose:    # pragma: no cover
+                log.set_debug_level(args.verbose)
+
+            return pre_commit_hook.run(args)
+
+        _reset_settings()
+        try:
+            args = pre_commit_hook.parse_args(argv)
+        except ValueError:
+            return 1
+
+        self.hook_state = _get_hook_state(argv, args)
+        if args.verbose:    # pragma: no cover
+            log.set_debug_level(args.verbose)
+
+        return pre_commit_hook.run(args)
+
+    def run_scan(self, argv: List[str]) -> int:
+        # Scans configure settings in their own way, so the next hook invocation will need to
+        # start afresh too.
+        self.hook_state = None
+        _reset_settings()
+
+        return scan_main.main(argv)
+
+    def _get_cached_hook_args(self, argv: List[str]) -> Optional[argparse.Namespace]:
+        """
+        :returns: the previously parsed arguments (with the new set of filenames), if
+            they would be parsed in the same way.
+        """
+        state = self.hook_state
+        if (
+            not state
+            or state.cwd != os.getcwd()
+            or argv[:len(state.options)] != state.options
+        ):
+            return None
+
+        # If this contains any options, we can't be sure that they're just filenames.
+        filenames = argv[len(state.options):]
+        if any(filename.startswith('-') for filename in filenames):
+            return None
+
+        if _get_fingerprint(state.args) != state.fingerprint:
+            # e.g. the baseline was updated.
+            return None
+
+        args = copy.copy(state.args)
+        args.filenames = filenames
+        if state.baseline is not None:
+            args.baseline = SecretsCollection.load_from_baseline(state.baseline)
+
+        return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            'Runs a long-lived process that `detect-secrets-hook` and `detect-secrets scan` '
+            'forward their work to, to avoid initializing detect-secrets on every invocation.'
+        ),
+    )
+    parser.add_argument(
+        '--socket',
+        default='',
+        help=(
+            'Path of the Unix socket to listen on. Defaults to $DETECT_SECRETS_DAEMON_SOCKET, '
+            'or a user-specific path in $XDG_RUNTIME_DIR.'
+        ),
+    )
+    parser.add_argument(
+        '-v',
+        '--verbose',
+        action='count',
+        help='Verbose mode.',
+    )
+    args = parser.parse_args(argv)
+    if args.verbose:    # pragma: no cover
+        log.set_debug_level(args.verbose)
+
+    # This allows us to clean up the socket when we're asked to stop.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    daemon = Daemon(args.socket)
+    try:
+        daemon.serve_forever()
+    except ValueError as e:
+        log.error(str(e))
+        return 1
+    except KeyboardInterrupt:     # pragma: no cover
+        pass
+
+    return 0
+
+
+def _get_hook_state(argv: List[str], args: argparse.Namespace) -> Optional[HookState]:
+    # Filenames come last, so anything before them is an option.
+    options = argv[:len(argv) - len(args.filenames)]
+    if argv[len(options):] != args.filenames:
+        return None
+
+    baseline = None
+    if args.baseline:
+        baseline = {'results': args.baseline.json()}
+
+    return HookState(
+        cwd=os.getcwd(),
+        options=options,
+        fingerprint=_get_fingerprint(args),
+        args=copy.copy(args),
+        baseline=baseline,
+    )
+
+
+def _get_fingerprint(args: argparse.Namespace) -> str:
+    """
+    Parsing the hook's arguments reads several files, that may change between invocations.
+    Rather than reading them again, we check whether they have been modified.
+    """
+    filenames = []
+    if args.baseline:
+        filenames.append(args.baseline_filename)
+
+    for config in get_settings().plugins.values():
+        if 'path' in config:
+            filenames.append(config['path'][len('file://'):])
+
+    for path, config in get_settings().filters.items():
+        if path.startswith('file://'):
+            filenames.append(path[len('file://'):].split('::')[0])
+
+        for key in ('file_name', 'model'):
+            if config.get(key):
+                filenames.append(config[key])
+
+    signatures = []
+    for filename in filenames:
+        try:
+            stat = os.stat(filename)
+            signatures.append([filename, stat.st_mtime_ns, stat.st_size, stat.st_ino])
+        except OSError:
+            signatures.append([filename])
+
+    return hashlib.sha1(json.dumps(signatures).encode('utf-8')).hexdigest()
+
+
+def _remove_stale_socket(path: str) -> None:
+    """
+    Cleans up after a previous daemon that didn't exit cleanly.
+
+    :raises: ValueError
+    """
+    if not stat.S_ISSOCK(os.lstat(path).st_mode):
+        raise ValueError(f'{path} already exists, and is not a socket.')
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            pass
+        else:
+            raise ValueError(f'Another daemon is already listening on {path}.')
+
+    os.remove(path)
+
+
+def _reset_settings() -> None:
+    cache_bust()
+    get_settings().clear()
+
+
+@contextlib.contextmanager
+def _request_context(
+    cwd: str,
+    env: Dict[str, str],
+    stdout: io.StringIO,
+    stderr: io.StringIO,
+) -> Generator[None, None, None]:
+    """Runs as if we were the client process."""
+    original_cwd = os.getcwd()
+    os.chdir(cwd)
+
+    original_env = dict(os.environ)
+    original_stdin = sys.stdin
+
+    # NOTE: This is the logger that `detect_secrets.core.log.log` wraps. Its handlers hold
+    # on to the original stderr, so `redirect_stderr` doesn't apply to them.
+    logger = logging.getLogger('detect-secrets')
+    handlers = [
+        handler
+        for handler in logger.handlers
+        if isinstance(handler, logging.StreamHandler)
+    ]
+    original_streams = [handler.setStream(stderr) for handler in handlers]
+    original_level = logger.level
+
+    # The verbosity of the daemon's own logs shouldn't affect the client's output.
+    logger.setLevel(logging.ERROR)
+
+    # The rest of the environment is the daemon's own.
+    for key in FORWARDED_ENVIRONMENT_VARIABLES:
+        if key in env:
+            os.environ[key] = env[key]
+        else:
+            os.environ.pop(key, None)
+
+    sys.stdin = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            yield
+    finally:
+        os.chdir(original_cwd)
+        os.environ.clear()
+        os.environ.update(original_env)
+        sys.stdin = original_stdin
+
+        for handler, stream in zip(handlers, original_streams):
+            handler.setStream(stream)
+
+        logger.setLevel(original_level)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
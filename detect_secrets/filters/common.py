@@ -1,15 +1,14 @@
 import os
-from functools import lru_cache
 from typing import cast
 
 import requests
 
 from ..constants import VerifiedResult
 from ..core.plugins import Plugin
+from ..settings import cache_by_generation
 from ..settings import get_settings
 from ..util.code_snippet import CodeSnippet
 from ..util.inject import call_function_with_arguments
-from .util import get_caller_path
 
 
 def is_invalid_file(filename: str) -> bool:
@@ -20,9 +19,9 @@ def is_baseline_file(filename: str) -> bool:
     return os.path.basename(filename) == _get_baseline_filename()
 
 
-@lru_cache(maxsize=1)
+@cache_by_generation
 def _get_baseline_filename() -> str:
-    path = get_caller_path(offset=1)
+    path = f'{__name__}.is_baseline_file'
     return cast(str, get_settings().filters[path]['filename'])
 
 
@@ -58,7 +57,7 @@ def is_ignored_due_to_verification_policies(
     return False
 
 
-@lru_cache(maxsize=1)
+@cache_by_generation
 def _get_verification_policy() -> VerifiedResult:
-    path = get_caller_path(offset=1)
+    path = f'{__name__}.is_ignored_due_to_verification_policies'
     return VerifiedResult(get_settings().filters[path]['min_level'])
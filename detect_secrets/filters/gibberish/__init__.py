@@ -3,7 +3,9 @@ import string
 from functools import lru_cache
 from typing import Any
 from typing import Dict
+from typing import FrozenSet
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 from ...core.plugins import Plugin
@@ -14,6 +16,8 @@ from ..util import compute_file_hash
 
 Model = Any
 
+HEX_CHARACTERS = frozenset(string.hexdigits + '-')
+
 
 def is_feature_enabled() -> bool:
     try:
@@ -34,6 +38,8 @@ def initialize(model_path: Optional[str] = None, limit: float = 3.7) -> None:
     if not path:
         path = os.path.join(__path__[0], 'rfc.model')
 
+    # Start afresh, rather than adding to the model of previous settings.
+    get_model.cache_clear()
     model = get_model()
 
     from gibberish_detector import serializer
@@ -44,6 +50,10 @@ def initialize(model_path: Optional[str] = None, limit: float = 3.7) -> None:
         except ParsingError:
             raise ValueError('Invalid model.')
 
+    # Since the model has changed, so have the scores.
+    _get_normalized_model.cache_clear()
+    calculate_score.cache_clear()
+
     config: Dict[str, Union[float, str]] = {
         'limit': limit,
     }
@@ -53,6 +63,7 @@ def initialize(model_path: Optional[str] = None, limit: float = 3.7) -> None:
 
     path = f'{__name__}.should_exclude_secret'
     get_settings().filters[path] = config
+    get_settings().bump_generation()
 
 
 def should_exclude_secret(secret: str, plugin: Optional[Plugin] = None) -> bool:
@@ -68,28 +79,48 @@ def should_exclude_secret(secret: str, plugin: Optional[Plugin] = None) -> bool:
     # works best with non-hex strings, since hex strings have a too limited charset
     # to fit our trained models. As such, we cannot make a deterministic decision
     # in such cases.
-    if not (set(secret) - set(string.hexdigits + '-')):
+    if HEX_CHARACTERS.issuperset(secret):
         return False
 
     if not get_model().data or not get_model().charset:
         raise AssertionError('Attempting to use uninitialized gibberish model.')
 
-    from gibberish_detector.detector import Detector
-    detector = Detector(
-        model=get_model(),
-        threshold=get_settings().filters[f'{__name__}.should_exclude_secret']['limit'],
-    )
-
     # TODO: secret.lower() is only used currently, since the default model is only
     # trained with lower case letters. However, in the future, if people want to train
     # a model that is case-sensitive, we can figure out how to change this.
     # Unfortunately, it's not straight-forward to just remove the `.lower()` function call,
     # since if the string is *not* lowered (and the model expects it to be), the results
     # will be quite different.
-    return not detector.is_gibberish(secret.lower())
+    limit = get_settings().filters[f'{__name__}.should_exclude_secret']['limit']
+    return not calculate_score(secret.lower()) > limit
+
+
+@lru_cache(maxsize=4096)
+def calculate_score(payload: str) -> float:
+    """
+    This is equivalent to `gibberish_detector.detector.Detector`'s scoring, without having to
+    create a detector (and normalize the model) for every secret. The same secrets are often
+    found many times throughout a scan, so their scores are also cached.
+
+    :returns: the higher the number, the more likely the payload is gibberish.
+    """
+    charset, model = _get_normalized_model()
+
+    characters = [character for character in payload if character in charset]
+    if len(characters) < 2:
+        return 0.0
+
+    return sum([model[a][b] for a, b in zip(characters, characters[1:])]) / (len(characters) - 1)
 
 
 @lru_cache(maxsize=1)
 def get_model() -> 'Model':
     from gibberish_detector.model import Model
     return Model(charset='')
+
+
+@lru_cache(maxsize=1)
+def _get_normalized_model() -> Tuple[FrozenSet[str], Dict[str, Dict[str, float]]]:
+    """:returns: (charset, log probability of each character following another)"""
+    model = get_model()
+    return frozenset(model.charset), model.normalize()
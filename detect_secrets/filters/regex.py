@@ -1,10 +1,9 @@
 import re
-from functools import lru_cache
 from typing import List
 from typing import Pattern
 
+from ..settings import cache_by_generation
 from ..settings import get_settings
-from .util import get_caller_path
 
 
 def should_exclude_line(line: str) -> bool:
@@ -15,9 +14,9 @@ def should_exclude_line(line: str) -> bool:
     return False
 
 
-@lru_cache(maxsize=1)
+@cache_by_generation
 def _get_line_exclusion_regex() -> List[Pattern]:
-    path = get_caller_path(offset=1)
+    path = f'{__name__}.should_exclude_line'
     return [re.compile(regex) for regex in get_settings().filters[path]['pattern']]
 
 
@@ -29,9 +28,9 @@ def should_exclude_file(filename: str) -> bool:
     return False
 
 
-@lru_cache(maxsize=1)
+@cache_by_generation
 def _get_file_exclusion_regex() -> List[Pattern]:
-    path = get_caller_path(offset=1)
+    path = f'{__name__}.should_exclude_file'
     return [re.compile(regex) for regex in get_settings().filters[path]['pattern']]
 
 
@@ -43,7 +42,7 @@ def should_exclude_secret(secret: str) -> bool:
     return False
 
 
-@lru_cache(maxsize=1)
+@cache_by_generation
 def _get_secret_exclusion_regex() -> List[Pattern]:
-    path = get_caller_path(offset=1)
+    path = f'{__name__}.should_exclude_secret'
     return [re.compile(regex) for regex in get_settings().filters[path]['pattern']]
@@ -3,11 +3,23 @@ There may be known words that are definitely test keys (e.g. AKIATEST for AWS ke
 One way that we can filter these out is by passing in a list of words that we know
 will result in false positives. This filter efficiently processes this through the
 use of the Aho-Corasick algorithm.
+
+Building the automaton for a large wordlist takes a while, so once built, it is cached
+(keyed off the hash of the wordlist) in a directory that only the current user has access to.
+Unlike scan results, these are pickled: so loading one written by somebody else would allow
+them to run arbitrary code.
 """
+import os
+import pickle
+import tempfile
 from functools import lru_cache
+from importlib import metadata
 from typing import Any
 
+from ..core.log import log
 from ..settings import get_settings
+from ..util.path import is_private_directory
+from ..util.path import is_private_file
 from .util import compute_file_hash
 
 
@@ -16,7 +28,7 @@ Automaton = Any
 
 def is_feature_enabled() -> bool:
     try:
-        get_automaton()
+        import ahocorasick     # noqa: F401
         return True
     except ImportError:
         return False
@@ -28,45 +40,103 @@ def initialize(wordlist_filename: str, min_length: int = 3, file_hash: str = '')
         words. As a result, our recall will decrease without a precision boost.
         Tweak this value to customize it based on your own findings.
 
-    :param file_hash: this is currently used for baseline reporting purposes only, rather than
-        engine's functionality. One can imagine a future where this automaton model is
-        cached and keyed off the hash, and thus, this file_hash can be used to see if the
-        cache needs to be invalidated.
-
-        But alas, this functionality has yet to be implemented.
+    :param file_hash: this is used for baseline reporting purposes only. Since the wordlist
+        may have changed since the baseline was created, the automaton is cached by the hash
+        of its current contents instead.
     """
-    # See https://pyahocorasick.readthedocs.io/en/latest/ for more information.
-    automaton = get_automaton()
-    with open(wordlist_filename) as f:
-        for line in f.readlines():
-            line = line.lower().strip()
-
-            if len(line) < min_length:
-                continue
-
-            automaton.add_word(line, line)
-
-    path = f'{__name__}.should_exclude_secret'
-    get_settings().filters[path] = {
+    config = {
         'min_length': min_length,
         'file_name': wordlist_filename,
         'file_hash': compute_file_hash(wordlist_filename),
     }
 
-    automaton.make_automaton()
-    return automaton
+    path = f'{__name__}.should_exclude_secret'
+    get_settings().filters[path] = config
+    get_settings().bump_generation()
+
+    return get_automaton(**config)
 
 
 def should_exclude_secret(secret: str) -> bool:
+    config = get_settings().filters[f'{__name__}.should_exclude_secret']
+    automaton = get_automaton(
+        file_name=config['file_name'],
+        min_length=config['min_length'],
+        file_hash=config['file_hash'],
+    )
+
     try:
         # .lower() to make everything case-insensitive
-        next(get_automaton().iter(string=secret.lower()))
+        next(automaton.iter(string=secret.lower()))
         return True
     except StopIteration:
         return False
 
 
 @lru_cache(maxsize=1)
-def get_automaton() -> Automaton:
+def get_automaton(file_name: str, min_length: int, file_hash: str) -> Automaton:
+    """
+    Since this is cached in memory too, processes that are forked after the wordlist has been
+    initialized (e.g. when scanning in parallel) share the same automaton.
+
+    :raises: ImportError
+    """
     import ahocorasick
-    return ahocorasick.Automaton()
+
+    cache_path = _get_cache_path(min_length=min_length, file_hash=file_hash)
+    cache_directory = os.path.dirname(cache_path)
+    if is_private_directory(cache_directory) and is_private_file(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            # Cache entries may be corrupted, or written by an incompatible version.
+            log.debug(f'Unable to load cached wordlist from {cache_path}: {e}')
+
+    # See https://pyahocorasick.readthedocs.io/en/latest/ for more information.
+    automaton = ahocorasick.Automaton()
+    with open(file_name) as f:
+        for line in f:
+            line = line.lower().strip()
+
+            if len(line) < min_length:
+                continue
+
+            automaton.add_word(line, line)
+
+    automaton.make_automaton()
+
+    try:
+        os.makedirs(cache_directory, mode=0o700, exist_ok=True)
+        if not is_private_directory(cache_directory):
+            log.warning(f'Not caching wordlist, since {cache_directory} may be shared.')
+            return automaton
+
+        # Write to a temporary file first, so that concurrent scans never see a partially
+        # written entry.
+        fd, temporary_path = tempfile.mkstemp(dir=cache_directory)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(automaton, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temporary_path, cache_path)
+    except OSError as e:
+        log.warning(f'Unable to cache wordlist: {e}')
+
+    return automaton
+
+
+def _get_cache_path(min_length: int, file_hash: str) -> str:
+    # Pickled automatons can only be loaded by the same version of the library.
+    try:
+        version = metadata.version('pyahocorasick')
+    except metadata.PackageNotFoundError:   # pragma: no cover
+        version = 'unknown'
+
+    # These aren't stored with the scan results, since they may be shared with other users
+    # (see `detect_secrets.core.cache`), and are pruned to a size that a large wordlist
+    # would exceed by itself.
+    return os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache')),
+        'detect-secrets-wordlists',
+        f'{file_hash}-{min_length}-{version}.pickle',
+    )
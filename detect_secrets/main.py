@@ -1,12 +1,17 @@
 import argparse
 import json
+import subprocess
 import sys
 from typing import List
 from typing import Optional
 
 from . import audit
 from .core import baseline
+from .core import history
 from .core import plugins
+from .core.cache import get_default_cache_directory
+from .core.cache import get_storage
+from .core.cache import ScanResultCache
 from .core.log import log
 from .core.scan import get_files_to_scan
 from .core.scan import scan_for_allowlisted_secrets_in_file
@@ -67,11 +72,38 @@ def handle_scan_action(args: argparse.Namespace) -> None:
         print(json.dumps(baseline.format_for_output(secrets), indent=2))
         return
 
+    cache = None
+    if not args.no_cache:
+        cache = ScanResultCache(get_storage(args.cache_dir or get_default_cache_directory()))
+
+    if args.history:
+        try:
+            results = history.scan_history(
+                rev_range=args.rev_range or '',
+                root=args.custom_root,
+                num_processors=args.num_cores,
+                cache=cache,
+            )
+        except subprocess.CalledProcessError:
+            # e.g. this isn't a git repository, or the revision range is invalid.
+            print(
+                'error: unable to read git history{}.'.format(
+                    f' for `{args.rev_range}`' if args.rev_range else '',
+                ),
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+        print(json.dumps(history.format_for_output(results), indent=2))
+        return
+
     secrets = baseline.create(
         *args.path,
         should_scan_all_files=args.all_files,
         root=args.custom_root,
         num_processors=args.num_cores,
+        cache=cache,
+        mode=args.execution_mode,
     )
     if args.baseline is not None:
         # The pre-commit hook's baseline upgrade is to trim the supplied baseline for non-existent
@@ -158,6 +158,10 @@ class RegexBasedDetector(BasePlugin, metaclass=ABCMeta):
         denylist = (
             re.compile(r'foo'),
         )
+
+    NOTE: The scan engine only runs a detector on lines that contain the literal text its
+    patterns require (e.g. `foo` above), so any line that a secret could be found in must
+    match at least one of the regexes in `denylist`.
     """
     @abstractproperty
     def denylist(self) -> Iterable[Pattern]:
@@ -7,9 +7,14 @@ from typing import Any
 from typing import cast
 from typing import Dict
 from typing import Generator
+from typing import List
+from typing import Pattern
+from typing import Sequence
 from typing import Set
 
 from ..core.potential_secret import PotentialSecret
+from ..util.entropy import calculate_shannon_entropies
+from ..util.entropy import calculate_shannon_entropy
 from .base import BasePlugin
 from detect_secrets.util.code_snippet import CodeSnippet
 
@@ -30,7 +35,19 @@ class HighEntropyStringsPlugin(BasePlugin, metaclass=ABCMeta):
         # NOTE: We need this to be a capturing group, so back-reference can work.
         self.regex = re.compile(r'([\'"])([{}]+)(\1)'.format(re.escape(charset)))
 
+        self._quoted_string_regex = self.regex
+        self._non_quoted_string_regexes: Dict[bool, Pattern] = {}
+
     def analyze_string(self, string: str) -> Generator[str, None, None]:
+        if (
+            self.regex is self._quoted_string_regex
+            and '"' not in string
+            and "'" not in string
+        ):
+            # Most lines don't contain any strings at all, and this is much faster to check
+            # than running the regex.
+            return
+
         for result in self.regex.findall(string):
             if isinstance(result, tuple):
                 # This occurs on the default regex, but not on the eager regex.
@@ -60,13 +77,16 @@ class HighEntropyStringsPlugin(BasePlugin, metaclass=ABCMeta):
             # NOTE: We perform the limit filter at this layer (rather than analyze_string) so
             # that we can surface secrets that do not meet the limit criteria when
             # enable_eager_search=True.
+            secrets = list(output or set())
             return {
                 secret
-                for secret in (output or set())
-                if (
-                    self.calculate_shannon_entropy(cast(str, secret.secret_value)) >
-                    self.entropy_limit
+                for secret, value in zip(
+                    secrets,
+                    self.calculate_shannon_entropies([
+                        cast(str, secret.secret_value) for secret in secrets
+                    ]),
                 )
+                if value > self.entropy_limit
             }
 
         # This is mainly used for adhoc string scanning. As such, it's just bad UX to require
@@ -84,16 +104,18 @@ class HighEntropyStringsPlugin(BasePlugin, metaclass=ABCMeta):
 
         Borrowed from: http://blog.dkbza.org/2007/05/scanning-data-for-entropy-anomalies.html.
         """
-        if not data:  # pragma: no cover
-            return 0
+        return calculate_shannon_entropy(data, self.charset)
 
-        entropy = 0.0
-        for x in self.charset:
-            p_x = float(data.count(x)) / len(data)
-            if p_x > 0:
-                entropy += - p_x * math.log(p_x, 2)
+    def calculate_shannon_entropies(self, values: Sequence[str]) -> List[float]:
+        """This is the batched equivalent of `calculate_shannon_entropy`."""
+        if (
+            getattr(self.calculate_shannon_entropy, '__func__', None)
+            is not HighEntropyStringsPlugin.calculate_shannon_entropy
+        ):
+            # We need to respect how subclasses compute entropy.
+            return [self.calculate_shannon_entropy(value) for value in values]
 
-        return entropy
+        return calculate_shannon_entropies(values, self.charset)
 
     def format_scan_result(self, secret: PotentialSecret) -> str:
         if not secret.secret_value:
@@ -125,11 +147,14 @@ class HighEntropyStringsPlugin(BasePlugin, metaclass=ABCMeta):
         """
         old_regex = self.regex
 
-        regex_alternative = r'([{}]+)'.format(re.escape(self.charset))
-        if is_exact_match:
-            regex_alternative = r'^' + regex_alternative + r'$'
+        if is_exact_match not in self._non_quoted_string_regexes:
+            regex_alternative = r'([{}]+)'.format(re.escape(self.charset))
+            if is_exact_match:
+                regex_alternative = r'^' + regex_alternative + r'$'
+
+            self._non_quoted_string_regexes[is_exact_match] = re.compile(regex_alternative)
 
-        self.regex = re.compile(regex_alternative)
+        self.regex = self._non_quoted_string_regexes[is_exact_match]
 
         try:
             yield
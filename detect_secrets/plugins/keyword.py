@@ -259,6 +259,14 @@ REGEX_BY_FILETYPE = {
     FileType.TOML: CONFIG_DENYLIST_REGEX_TO_GROUP,
 }
 
+# These are used to check whether a line could match any of the (much more expensive) regexes
+# above, since every one of them requires one of these keywords.
+KEYWORD_REGEX = re.compile(r'|'.join(DENYLIST))
+KEYWORD_REGEX_IGNORECASE = re.compile(r'|'.join(DENYLIST), flags=re.IGNORECASE)
+
+# Every keyword contains one of these, and they're much faster to look for than the regex.
+KEYWORD_LITERALS = ('key', 'pass', 'pwd', 'secret', 'contrase')
+
 
 class KeywordDetector(BasePlugin):
     """
@@ -281,6 +289,10 @@ class KeywordDetector(BasePlugin):
         string: str,
         denylist_regex_to_group: Optional[Dict[Pattern, int]] = None,
     ) -> Generator[str, None, None]:
+        keyword_index = _find_keyword(string)
+        if keyword_index is None:
+            return
+
         if self.keyword_exclude and self.keyword_exclude.search(string):
             return
 
@@ -294,7 +306,12 @@ class KeywordDetector(BasePlugin):
         has_results = False
         for denylist_regex_to_group in attempts:
             for denylist_regex, group_number in denylist_regex_to_group.items():
-                match = denylist_regex.search(string)
+                # If the regex starts with a keyword, there's no point in trying to match it
+                # any earlier than the first keyword in the string.
+                match = denylist_regex.search(
+                    string,
+                    keyword_index if denylist_regex.pattern.startswith(DENYLIST_REGEX) else 0,
+                )
                 if match:
                     has_results = True
                     yield match.group(group_number)
@@ -329,3 +346,25 @@ class KeywordDetector(BasePlugin):
             ),
             **super().json(),
         }
+
+
+def _find_keyword(string: str) -> Optional[int]:
+    """
+    :returns: the index of the first denylisted keyword in the string (case-insensitive),
+        or None, if there aren't any.
+    """
+    if not string.isascii():
+        # Lowercasing non-ASCII strings may change their length, and case-insensitive
+        # matching doesn't quite work the same way as lowercasing does anyway.
+        match = KEYWORD_REGEX_IGNORECASE.search(string)
+        return match.start() if match else None
+
+    string = string.lower()
+    for literal in KEYWORD_LITERALS:
+        if literal in string:
+            break
+    else:
+        return None
+
+    match = KEYWORD_REGEX.search(string)
+    return match.start() if match else None
@@ -24,6 +24,14 @@ def main(argv: Optional[List[str]] = None) -> int:
     if args.verbose:    # pragma: no cover
         log.set_debug_level(args.verbose)
 
+    return run(args)
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    This is split from `main`, so that the daemon is able to reuse parsed arguments (and
+    the settings that they initialize) between invocations.
+    """
     # Find all secrets in files to be committed
     secrets = SecretsCollection()
     for filename in args.filenames:
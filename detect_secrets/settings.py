@@ -1,17 +1,31 @@
+import json
 from contextlib import contextmanager
 from copy import deepcopy
 from functools import lru_cache
+from functools import wraps
 from importlib import import_module
+from itertools import count
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import Generator
 from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
 from urllib.parse import urlparse
 
 from .exceptions import InvalidFile
 from .util.importlib import import_file_as_module
 
 
+T = TypeVar('T')
+
+# Every change to the settings starts a new generation. This allows anything that is computed
+# from them to be cached until they change, without having to know where those caches are.
+_generations = count(1)
+
+
 @lru_cache(maxsize=1)
 def get_settings() -> 'Settings':
     """
@@ -52,11 +66,15 @@ def configure_settings_from_baseline(baseline: Dict[str, Any], filename: str = '
                 limit=config['limit'],
             )
 
+    if 'max_line_length' in baseline:
+        settings.max_line_length = baseline['max_line_length']
+
     if filename:
         settings.filters['detect_secrets.filters.common.is_baseline_file'] = {
             'filename': filename,
         }
 
+    settings.bump_generation()
     return settings
 
 
@@ -76,23 +94,52 @@ def default_settings() -> Generator['Settings', None, None]:
 
 @contextmanager
 def transient_settings(config: Dict[str, Any]) -> Generator['Settings', None, None]:
-    """Allows the customizability of non-global settings per invocation."""
+    """
+    Allows the customizability of non-global settings per invocation.
+
+    Since plugins and filters are cached by their configuration (see `get_plugins` and
+    `get_filters`), switching back and forth between the same settings is cheap.
+    """
     original_settings = get_settings().json()
 
-    cache_bust()
+    get_settings.cache_clear()
     try:
         yield configure_settings_from_baseline(config)
     finally:
-        cache_bust()
+        get_settings.cache_clear()
         configure_settings_from_baseline(original_settings)
 
 
+def cache_by_generation(function: Callable[[], T]) -> Callable[[], T]:
+    """
+    Caches the result of a function that depends on the settings, until they change
+    (see `Settings.bump_generation`).
+    """
+    cache = lru_cache(maxsize=1)(lambda generation: function())
+
+    @wraps(function)
+    def wrapped() -> T:
+        return cache(get_settings().generation)
+
+    wrapped.cache_clear = cache.cache_clear     # type: ignore
+    return wrapped
+
+
 def cache_bust() -> None:
+    """
+    This clears everything that was computed from the settings (including the settings
+    themselves), e.g. to start afresh between invocations.
+    """
     get_plugins.cache_clear()
+    _get_plugins.cache_clear()
 
     get_filters.cache_clear()
+    _get_filters.cache_clear()
+    _get_filter.cache_clear()
     for path, config in get_settings().filters.items():
         # Need to also clear the individual caches (e.g. cached regex patterns).
+        # NOTE: Custom filter files don't need this, since they're loaded afresh after
+        # clearing `_get_filter`.
         parts = urlparse(path)
         if not parts.scheme:
             module_path, _ = path.rsplit('.', 1)
@@ -100,12 +147,6 @@ def cache_bust() -> None:
                 module = import_module(module_path)
             except ModuleNotFoundError:
                 continue
-        elif parts.scheme == 'file':
-            file_path = path[len('file://'):].split('::')[0]
-            try:
-                module = import_file_as_module(file_path)
-            except (FileNotFoundError, InvalidFile):
-                continue
         else:
             continue
 
@@ -154,9 +195,23 @@ class Settings:
             }
         }
 
+        # Longer lines (e.g. in minified files) are scanned in overlapping windows of this many
+        # characters, rather than all at once. This is disabled by default.
+        self.max_line_length: Optional[int] = None
+        self.bump_generation()
+
+    def bump_generation(self) -> None:
+        """
+        Anything that is computed from the settings is cached until this is called. This
+        happens whenever they are changed through these methods; however, if `plugins` or
+        `filters` are modified directly, this needs to be called afterwards.
+        """
+        self.generation = next(_generations)
+
     def set(self, other: 'Settings') -> None:
         self.plugins = other.plugins
         self.filters = other.filters
+        self.bump_generation()
 
     def configure_plugins(self, config: List[Dict[str, Any]]) -> 'Settings':
         """
@@ -171,7 +226,7 @@ class Settings:
             name = plugin.pop('name')
             self.plugins[name] = plugin
 
-        get_plugins.cache_clear()
+        self.bump_generation()
         return self
 
     def disable_plugins(self, *plugin_names: str) -> 'Settings':
@@ -181,7 +236,7 @@ class Settings:
             except KeyError:
                 pass
 
-        get_plugins.cache_clear()
+        self.bump_generation()
         return self
 
     def configure_filters(self, config: List[Dict[str, Any]]) -> 'Settings':
@@ -206,14 +261,14 @@ class Settings:
             path = filter_config['path']
             self.filters[path] = filter_config
 
-        get_filters.cache_clear()
+        self.bump_generation()
         return self
 
     def disable_filters(self, *filter_paths: str) -> 'Settings':
         for filter_path in filter_paths:
             self.filters.pop(filter_path, None)
 
-        get_filters.cache_clear()
+        self.bump_generation()
         return self
 
     def json(self) -> Dict[str, Any]:
@@ -239,7 +294,7 @@ class Settings:
                 **serialized_plugin,
             })
 
-        return {
+        output: Dict[str, Any] = {
             'plugins_used': sorted(
                 plugins_used,
                 key=lambda x: str(x['name'].lower()),
@@ -257,9 +312,25 @@ class Settings:
             ),
         }
 
+        # This is only included when it's configured, so that baselines don't change otherwise.
+        if self.max_line_length:
+            output['max_line_length'] = self.max_line_length
 
-@lru_cache(maxsize=1)
+        return output
+
+
+@cache_by_generation
 def get_plugins() -> List:
+    # Plugins are only initialized once for each configuration, so that switching back to
+    # previous settings (e.g. after `transient_settings`) reuses them.
+    return _get_plugins(json.dumps(list(get_settings().plugins.items()), sort_keys=True))
+
+
+@lru_cache(maxsize=8)
+def _get_plugins(config: str) -> List:
+    """
+    :param config: the plugins' settings, which they are initialized with.
+    """
     # We need to import this here, otherwise it will result in a circular dependency.
     from .core import plugins
 
@@ -269,41 +340,59 @@ def get_plugins() -> List:
     ]
 
 
-@lru_cache(maxsize=1)
+@cache_by_generation
 def get_filters() -> List:
-    from .core.log import log
-    from .util.inject import get_injectable_variables
+    # Filters look up their own settings, so this only depends on which ones are used.
+    return _get_filters(tuple(get_settings().filters))
+
 
+@lru_cache(maxsize=8)
+def _get_filters(paths: Tuple[str, ...]) -> List:
     output = []
-    for path, config in get_settings().filters.items():
-        parts = urlparse(path)
-        if not parts.scheme:
-            module_path, function_name = path.rsplit('.', 1)
-            try:
-                function = getattr(import_module(module_path), function_name)
-            except (ModuleNotFoundError, AttributeError):
-                log.warning(f'Invalid filter: {path}')
-                continue
+    for path in paths:
+        function = _get_filter(path)
+        if function:
+            output.append(function)
 
-        elif parts.scheme == 'file':
-            file_path, function_name = path[len('file://'):].split('::')
+    return output
 
-            try:
-                function = getattr(import_file_as_module(file_path), function_name)
-            except (FileNotFoundError, InvalidFile, AttributeError):
-                log.warning(f'Invalid filter: {path}')
-                continue
 
-        else:
+@lru_cache(maxsize=None)
+def _get_filter(path: str) -> Optional[Callable]:
+    """
+    Custom filter files are executed when they're loaded, so this is only done once for each
+    of them (rather than every time the settings change).
+    """
+    from .core.log import log
+    from .util.inject import get_injectable_variables
+
+    parts = urlparse(path)
+    if not parts.scheme:
+        module_path, function_name = path.rsplit('.', 1)
+        try:
+            function = getattr(import_module(module_path), function_name)
+        except (ModuleNotFoundError, AttributeError):
             log.warning(f'Invalid filter: {path}')
-            continue
+            return None
 
-        # We attach this metadata to the function itself, so that we don't need to
-        # compute it everytime. This will allow for dependency injection for filters.
-        function.injectable_variables = set(get_injectable_variables(function))
-        output.append(function)
+    elif parts.scheme == 'file':
+        file_path, function_name = path[len('file://'):].split('::')
 
-        # This is for better logging.
-        function.path = path
+        try:
+            function = getattr(import_file_as_module(file_path), function_name)
+        except (FileNotFoundError, InvalidFile, AttributeError):
+            log.warning(f'Invalid filter: {path}')
+            return None
 
-    return output
+    else:
+        log.warning(f'Invalid filter: {path}')
+        return None
+
+    # We attach this metadata to the function itself, so that we don't need to
+    # compute it everytime. This will allow for dependency injection for filters.
+    function.injectable_variables = set(get_injectable_variables(function))
+
+    # This is for better logging.
+    function.path = path
+
+    return function
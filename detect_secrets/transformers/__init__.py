@@ -8,6 +8,8 @@ from typing import Optional
 from typing import TypeVar
 
 from ..types import NamedIO
+from ..util.filetype import determine_file_type
+from ..util.filetype import FileType
 from ..util.importlib import import_types_from_package
 from .base import BaseTransformer
 from .exceptions import ParsingError
@@ -20,13 +22,13 @@ def get_transformed_file(
     file: NamedIO,
     use_eager_transformers: bool = False,
 ) -> Optional[List[str]]:
-    for transformer in get_transformers():
+    for transformer in _get_transformers_for_file_type(
+        determine_file_type(file.name),
+        is_eager=use_eager_transformers,
+    ):
         if not transformer.should_parse_file(file.name):
             continue
 
-        if use_eager_transformers != transformer.is_eager:
-            continue
-
         try:
             return transformer.parse_file(file)
         except ParsingError:
@@ -48,6 +50,19 @@ def get_transformers() -> Iterable[Transformer]:
     ]
 
 
+@lru_cache(maxsize=None)
+def _get_transformers_for_file_type(file_type: FileType, is_eager: bool) -> List[BaseTransformer]:
+    """There's only a handful of file types, so we index the transformers by them."""
+    return [
+        transformer
+        for transformer in get_transformers()
+        if (
+            transformer.is_eager == is_eager
+            and (transformer.file_types is None or file_type in transformer.file_types)
+        )
+    ]
+
+
 def _is_valid_transformer(attribute: Any) -> bool:
     return (
         inspect.isclass(attribute)
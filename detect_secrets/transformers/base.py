@@ -1,8 +1,12 @@
 from abc import ABCMeta
 from abc import abstractmethod
+from typing import FrozenSet
 from typing import List
+from typing import Optional
 
 from ..types import NamedIO
+from ..util.filetype import determine_file_type
+from ..util.filetype import FileType
 
 
 class BaseTransformer(metaclass=ABCMeta):
@@ -16,6 +20,11 @@ class BaseTransformer(metaclass=ABCMeta):
         1. The secret value
         2. The specific line that it's found on (for auditing purposes)
     """
+    # The types of files that this transformer can parse. If not specified, it will attempt to
+    # parse all files. This allows the scanner to look up the transformers to use for a given
+    # file, rather than asking every transformer in turn.
+    file_types: Optional[FrozenSet[FileType]] = None
+
     @property
     def is_eager(self) -> bool:
         """
@@ -27,9 +36,8 @@ class BaseTransformer(metaclass=ABCMeta):
         """
         return False
 
-    @abstractmethod
     def should_parse_file(self, filename: str) -> bool:
-        raise NotImplementedError
+        return self.file_types is None or determine_file_type(filename) in self.file_types
 
     @abstractmethod
     def parse_file(self, file: NamedIO) -> List[str]:
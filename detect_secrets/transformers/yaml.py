@@ -18,15 +18,13 @@ from yaml.tokens import FlowEntryToken
 from yaml.tokens import KeyToken
 
 from ..types import NamedIO
-from ..util.filetype import determine_file_type
 from ..util.filetype import FileType
 from .base import BaseTransformer
 from .exceptions import ParsingError
 
 
 class YAMLTransformer(BaseTransformer):
-    def should_parse_file(self, filename: str) -> bool:
-        return determine_file_type(filename) == FileType.YAML
+    file_types = frozenset({FileType.YAML})
 
     def parse_file(self, file: NamedIO) -> List[str]:
         """
@@ -115,6 +113,23 @@ def _yaml_comment_regex() -> Pattern:
     return re.compile(r'(\s+#[\S ]*)')
 
 
+@lru_cache(maxsize=1)
+def _libyaml_leniency_regex() -> Pattern:
+    """
+    libyaml is more lenient than the pure Python parser with tabs, explicit keys (e.g.
+    `? key`) in flow collections, and comments directly after block scalar indicators (e.g.
+    `key: |# comment`). These are rare enough that we don't bother using libyaml for
+    documents that *may* contain them.
+    """
+    return re.compile(r'\t|(?:^|[\s\[\{,])\?|[|>][-+0-9]*#', re.MULTILINE)
+
+
+@lru_cache(maxsize=1)
+def _yaml_line_break_regex() -> Pattern:
+    """These are the line breaks that YAML parsers keep track of (for marks)."""
+    return re.compile('\r\n|[\r\n\x85\u2028\u2029]')
+
+
 class YAMLValue(NamedTuple):
     key: str
     value: Union[str, bytes]
@@ -167,6 +182,13 @@ class YAMLFileParser:
         self.loader.parse_flow_mapping_key = self._parse_flow_mapping_key_shim  # type: ignore
 
     def json(self) -> Dict[str, Any]:
+        try:
+            return cast(Dict[str, Any], self._get_data_with_libyaml())
+        except (UnsupportedDocumentError, yaml.YAMLError):
+            # Otherwise, we fall back to the pure Python parser. This also ensures that
+            # invalid files fail in the same way that they always have.
+            pass
+
         return cast(Dict[str, Any], self.loader.get_single_data())
 
     def __iter__(self) -> Iterator[YAMLValue]:
@@ -215,6 +237,20 @@ class YAMLFileParser:
                 line=lines[item['__line__'] - 1],
             )
 
+    def _get_data_with_libyaml(self) -> Any:
+        """
+        :raises: UnsupportedDocumentError
+        :raises: yaml.YAMLError
+        """
+        if not yaml.__with_libyaml__:
+            raise UnsupportedDocumentError
+
+        if _libyaml_leniency_regex().search(self.content):
+            # libyaml accepts some (invalid) documents that the pure Python parser doesn't.
+            raise UnsupportedDocumentError
+
+        return LibYAMLFileLoader(self.content).get_single_data()
+
     def _compose_node_shim(
         self,
         parent: Optional[yaml.nodes.Node],
@@ -288,6 +324,119 @@ class YAMLFileParser:
         return result
 
 
+class UnsupportedDocumentError(Exception):
+    pass
+
+
+class LibYAMLFileLoader:
+    """
+    libyaml is much faster than the pure Python parser, but we can't hook into it to keep
+    track of line numbers like `YAMLFileParser` does. Instead, we work them out from the
+    composed nodes, and tag values as they're constructed.
+
+    While a value is composed, the parser has only just read the `:` that precedes it. As
+    such, `YAMLFileParser` tags values with the line of their key (rather than the line that
+    they start on, which may be different). We can do the same: but only for the keys of
+    block mappings, since flow mappings have their own quirks (see
+    `YAMLFileParser._parse_flow_mapping_key_shim`). For anything else, we raise
+    UnsupportedDocumentError, so that the caller can fall back to the pure Python parser.
+    """
+
+    def __init__(self, content: str) -> None:
+        self.content = content
+
+        self.loader = yaml.CSafeLoader(content)
+        self.loader.construct_mapping = self._construct_mapping_shim
+
+    def get_single_data(self) -> Any:
+        """
+        :raises: UnsupportedDocumentError
+        :raises: yaml.YAMLError
+        """
+        try:
+            node = self.loader.get_single_node()
+            if node is None:
+                return None
+
+            self._check_node(node, lines=_yaml_line_break_regex().split(self.content))
+            return self.loader.construct_document(node)
+        finally:
+            self.loader.dispose()
+
+    def _check_node(self, root: yaml.nodes.Node, lines: List[str]) -> None:
+        """
+        :raises: UnsupportedDocumentError
+        """
+        seen = set()
+        to_search = [root]
+        while to_search:
+            node = to_search.pop()
+            if id(node) in seen:
+                # Aliases share nodes, which are tagged with the line of the alias instead.
+                raise UnsupportedDocumentError
+
+            seen.add(id(node))
+
+            if isinstance(node, yaml.nodes.SequenceNode):
+                if node.tag != 'tag:yaml.org,2002:seq':
+                    # e.g. !!omap, which doesn't construct its values as mappings.
+                    raise UnsupportedDocumentError
+
+                if node.flow_style and any(
+                    isinstance(item, yaml.nodes.ScalarNode) and '?' in item.value
+                    for item in node.value
+                ):
+                    # libyaml allows `?` in plain scalars in flow collections, but the pure
+                    # Python parser doesn't.
+                    raise UnsupportedDocumentError
+
+                to_search.extend(node.value)
+
+            elif isinstance(node, yaml.nodes.MappingNode):
+                if node.flow_style or node.tag != 'tag:yaml.org,2002:map':
+                    raise UnsupportedDocumentError
+
+                for key, value in node.value:
+                    if not isinstance(key, yaml.nodes.ScalarNode):
+                        raise UnsupportedDocumentError
+
+                    # Explicit keys (e.g. `? key`) may have their `:` on another line.
+                    mark = key.end_mark
+                    if not lines[mark.line][mark.column:].lstrip(' ').startswith(':'):
+                        raise UnsupportedDocumentError
+
+                    to_search.append(key)
+                    to_search.append(value)
+
+    def _construct_mapping_shim(
+        self,
+        node: yaml.nodes.MappingNode,
+        deep: bool = False,
+    ) -> Dict[Any, Any]:
+        """This constructs the same values that `_tag_dict_values` would."""
+        mapping: Dict[Any, Any] = yaml.constructor.SafeConstructor.construct_mapping(
+            self.loader,
+            node,
+            deep=deep,
+        )
+
+        # NOTE: Constructed objects are cached, so this is cheap.
+        for key, value in node.value:
+            if value.tag.endswith(':str') or value.tag.endswith(':binary'):
+                mapping[self.loader.construct_object(key, deep=deep)] = {
+                    '__value__': self.loader.construct_object(value, deep=deep),
+                    '__line__': key.end_mark.line + 1,
+                    '__original_key__': key.value,
+                }
+            else:
+                # e.g. duplicate keys, where a string value is overridden by something else.
+                mapping[self.loader.construct_object(key, deep=deep)] = (
+                    self.loader.construct_object(value, deep=deep)
+                )
+
+        return mapping
+
+
 def _tag_dict_values(map_node: yaml.nodes.MappingNode) -> yaml.nodes.MappingNode:
     """
     :param map_node: It looks like map_node.value contains a list of
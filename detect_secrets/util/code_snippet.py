@@ -1,5 +1,8 @@
 from typing import Generator
+from typing import Iterable
 from typing import List
+from typing import Optional
+from typing import Tuple
 
 from .color import AnsiColor
 from .color import colorize
@@ -33,6 +36,72 @@ def get_code_snippet(
     )
 
 
+def get_code_snippets(
+    lines: Iterable[str],
+    lines_of_context: int = 5,
+    buffer_size: int = 1024,
+    line_offset: int = 0,
+) -> Generator[Tuple[int, str, 'CodeSnippet'], None, None]:
+    """
+    This is the streaming equivalent of calling `get_code_snippet` for every line in a file:
+    only the lines surrounding the current line are kept in memory, and snippets are only
+    copied out of them if they are actually used.
+
+    :param lines: an iterator of lines in the file
+    :param buffer_size: how many lines to process before discarding the ones that are
+        no longer needed.
+    :param line_offset: the number of lines that precede `lines` in the file.
+    :returns: (line_number, line, snippet) for each line
+    """
+    buffer: List[str] = []
+
+    # The number of lines (in the file) that precede the start of the buffer.
+    offset = line_offset
+
+    # The index (in the buffer) of the next line to process.
+    index = 0
+
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) - index <= lines_of_context:
+            continue
+
+        yield _get_lazy_snippet(buffer, index, offset, lines_of_context)
+        index += 1
+
+        if index > buffer_size:
+            # NOTE: We create a new buffer rather than modifying it in place, since snippets
+            # that were previously handed out still refer to the old one.
+            discarded = index - lines_of_context
+            buffer = buffer[discarded:]
+            offset += discarded
+            index -= discarded
+
+    while index < len(buffer):
+        yield _get_lazy_snippet(buffer, index, offset, lines_of_context)
+        index += 1
+
+
+def _get_lazy_snippet(
+    buffer: List[str],
+    index: int,
+    offset: int,
+    lines_of_context: int,
+) -> Tuple[int, str, 'CodeSnippet']:
+    start = max(0, index - lines_of_context)
+    return (
+        offset + index + 1,
+        buffer[index],
+        LazyCodeSnippet(
+            buffer=buffer,
+            start=start,
+            end=index + lines_of_context + 1,
+            start_line=offset + start,
+            target_index=index - start,
+        ),
+    )
+
+
 class CodeSnippet:
 
     def __init__(self, snippet: List[str], start_line: int, target_index: int) -> None:
@@ -99,3 +168,61 @@ class CodeSnippet:
 
     def __iter__(self) -> Generator[str, None, None]:
         yield from self.lines
+
+
+class LazyCodeSnippet(CodeSnippet):
+    """
+    Most lines are never displayed, and most filters only need to look at the target (and
+    previous) line. As such, this only copies its lines out of the buffer when needed.
+    """
+
+    def __init__(
+        self,
+        buffer: List[str],
+        start: int,
+        end: int,
+        start_line: int,
+        target_index: int,
+    ) -> None:
+        """
+        :param buffer: lines of code, of which the snippet is `buffer[start:end]`
+        """
+        self._buffer = buffer
+        self._start = start
+        self._end = min(end, len(buffer))
+        self._lines: Optional[List[str]] = None
+
+        self.start_line = start_line
+        self.target_index = target_index
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self._buffer[self._start:self._end]
+
+        return self._lines
+
+    @lines.setter
+    def lines(self, value: List[str]) -> None:
+        self._lines = value
+
+    @property
+    def target_line(self) -> str:
+        if self._lines is None:
+            return self._buffer[self._start + self.target_index]
+
+        return self._lines[self.target_index]
+
+    @target_line.setter
+    def target_line(self, value: str) -> None:
+        self.lines[self.target_index] = value
+
+    @property
+    def previous_line(self) -> str:
+        if self._lines is not None:
+            return super().previous_line
+
+        if self.target_index == 0:
+            return ''
+
+        return self._buffer[self._start + self.target_index - 1]
@@ -0,0 +1,141 @@
+"""
+Shannon entropy is computed for every candidate found by the high entropy string plugins
+(and again, when displaying results), so this needs to be fast.
+
+NOTE: Results need to be *exactly* the same as they've always been, since a secret's entropy
+is compared against a limit: and strings with evenly distributed characters can land right
+on it. As such, we always compute each term in the same way (and add them up in the same
+order) as the original implementation:
+
+    entropy = 0.0
+    for x in charset:
+        p_x = float(data.count(x)) / len(data)
+        if p_x > 0:
+            entropy += - p_x * math.log(p_x, 2)
+"""
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+
+# Below this, setting up NumPy arrays costs more than it saves.
+MIN_VECTORIZED_BATCH_SIZE = 16
+
+
+def calculate_shannon_entropy(data: str, charset: str) -> float:
+    """
+    :param charset: only these characters contribute to the entropy of the string.
+    """
+    if not data:
+        return 0
+
+    return _calculate_shannon_entropy(data, charset)
+
+
+def calculate_shannon_entropies(values: Sequence[str], charset: str) -> List[float]:
+    """
+    This is the batched equivalent of `calculate_shannon_entropy`. If NumPy is installed,
+    large batches are vectorized.
+    """
+    if len(values) >= MIN_VECTORIZED_BATCH_SIZE:
+        try:
+            return _calculate_shannon_entropies_with_numpy(values, charset)
+        except ImportError:     # pragma: no cover
+            pass
+
+    return [calculate_shannon_entropy(value, charset) for value in values]
+
+
+@lru_cache(maxsize=4096)
+def _calculate_shannon_entropy(data: str, charset: str) -> float:
+    # Counting every character at once is O(len(data)), rather than O(len(charset) * len(data)).
+    counts = Counter(data)
+    length = len(data)
+
+    entropy = 0.0
+    for x in charset:
+        count = counts.get(x)
+        if count:
+            entropy += _get_term(count, length)
+
+    return entropy
+
+
+def _calculate_shannon_entropies_with_numpy(
+    values: Sequence[str],
+    charset: str,
+) -> List[float]:
+    """
+    :raises: ImportError
+    """
+    import numpy
+
+    positions = _get_charset_positions(charset)
+    if not positions or any(len(indices) > 1 for indices in positions.values()):
+        # Characters that appear multiple times in the charset are counted multiple times.
+        # This is rare enough that we don't bother vectorizing it.
+        return [calculate_shannon_entropy(value, charset) for value in values]
+
+    lengths = numpy.fromiter(map(len, values), dtype=numpy.int64, count=len(values))
+    codepoints = numpy.frombuffer(''.join(values).encode('utf-32-le'), dtype='<u4')
+    rows = numpy.repeat(numpy.arange(len(values)), lengths)
+
+    # Maps each character to its position in the charset (if it's in there at all).
+    characters = numpy.array(sorted(ord(character) for character in positions), dtype='<u4')
+    columns_of_characters = numpy.array(
+        [positions[chr(character)][0] for character in characters],
+        dtype=numpy.int64,
+    )
+    indices = numpy.minimum(numpy.searchsorted(characters, codepoints), len(characters) - 1)
+    is_in_charset = characters[indices] == codepoints
+
+    counts = numpy.bincount(
+        rows[is_in_charset] * len(charset) + columns_of_characters[indices[is_in_charset]],
+        minlength=len(values) * len(charset),
+    ).reshape(len(values), len(charset))
+
+    # Each term only depends on (count, length), and there are few unique pairs of these.
+    is_present = counts > 0
+    if not is_present.any():
+        return [0.0 if value else 0 for value in values]
+
+    terms = numpy.zeros(counts.shape)
+    base = int(lengths.max()) + 1
+    keys = (
+        counts[is_present] * base
+        + numpy.broadcast_to(lengths[:, None], counts.shape)[is_present]
+    )
+    unique_keys, inverse = numpy.unique(keys, return_inverse=True)
+    terms[is_present] = numpy.array([
+        _get_term(*divmod(int(key), base))
+        for key in unique_keys
+    ])[inverse]
+
+    # Unlike `sum`, `cumsum` adds up each row strictly from left to right. Since skipped
+    # characters contribute exactly 0.0, this gives the same results as adding up each term
+    # in turn.
+    output: List[float] = numpy.cumsum(terms, axis=1)[:, -1].tolist()
+    for index, value in enumerate(values):
+        if not value:
+            output[index] = 0
+
+    return output
+
+
+@lru_cache(maxsize=16)
+def _get_charset_positions(charset: str) -> Dict[str, Tuple[int, ...]]:
+    positions: Dict[str, List[int]] = {}
+    for index, character in enumerate(charset):
+        positions.setdefault(character, []).append(index)
+
+    return {character: tuple(indices) for character, indices in positions.items()}
+
+
+@lru_cache(maxsize=4096)
+def _get_term(count: int, length: int) -> float:
+    p_x = float(count) / length
+    return - p_x * math.log(p_x, 2)
@@ -0,0 +1,158 @@
+"""
+Over the course of a scan, a file may be read several times: once for each transformer that
+attempts to parse it, once for its raw lines, and once more for eager transformers. Audits
+are no different. Rather than reading (and decoding) the file each time, we do so once, and
+share the results with everything that needs them.
+"""
+import io
+import locale
+import mmap
+import os
+import re
+from functools import lru_cache
+from typing import BinaryIO
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Pattern
+from typing import Union
+
+from ..types import NamedIO
+
+
+# Larger files are memory mapped, so that they're decoded straight from the page cache
+# (rather than being copied into a buffer first).
+MMAP_THRESHOLD = 1024 * 1024
+
+
+class FileContent:
+    def __init__(self, name: str, text: str) -> None:
+        """
+        :param text: with universal newlines already translated to '\\n' (just like `open`
+            would do).
+        """
+        self.name = name
+        self.text = text
+
+        self._lines: Optional[List[str]] = None
+
+    @classmethod
+    def read(cls, file: BinaryIO) -> 'FileContent':
+        """
+        :param file: opened in binary mode.
+        :raises: UnicodeDecodeError
+        """
+        if os.fstat(file.fileno()).st_size < MMAP_THRESHOLD:
+            return cls.decode(file.name, file.read())
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return cls.decode(file.name, buffer)
+
+    @classmethod
+    def decode(cls, name: str, data: Union[bytes, mmap.mmap]) -> 'FileContent':
+        """
+        This decodes the data in the same way that `open` does, by default.
+
+        :raises: UnicodeDecodeError
+        """
+        text = str(data, locale.getpreferredencoding(False))
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+
+        return cls(name, text)
+
+    @property
+    def lines(self) -> List[str]:
+        """Just like iterating through a file, each line keeps its line ending."""
+        if self._lines is None:
+            if not _extra_line_boundary_regex().search(self.text):
+                # This is the fastest way to do this, but it also splits lines on characters
+                # that files don't split on.
+                self._lines = self.text.splitlines(keepends=True)
+            else:
+                lines = self.text.split('\n')
+                last_line = lines.pop()
+
+                self._lines = [line + '\n' for line in lines]
+                if last_line:
+                    self._lines.append(last_line)
+
+        return self._lines
+
+    def open(self) -> NamedIO:
+        return FileContentIO(self)
+
+
+class FileContentIO(NamedIO):
+    """
+    This is a read-only file object for FileContent. Unlike `io.StringIO`, it doesn't make a
+    copy of the content: so any number of them can be opened for the same file. Lines are
+    sliced out of the content as they are read, so iterating through the file doesn't require
+    holding all of its lines in memory.
+    """
+
+    def __init__(self, content: FileContent) -> None:
+        super().__init__()
+
+        self.content = content
+        self.name = content.name
+
+        # NOTE: This is an offset in the (decoded) text, rather than in bytes.
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        if size is not None and size >= 0:
+            raise io.UnsupportedOperation('Only reading the rest of the file is supported.')
+
+        text = self.content.text
+        output = text if self.position == 0 else text[self.position:]
+
+        self.position = len(text)
+        return output
+
+    def readline(self, size: Optional[int] = -1) -> str:    # type: ignore[override]
+        if size is not None and size >= 0:
+            raise io.UnsupportedOperation('Only reading whole lines is supported.')
+
+        # Just like files, lines are only split on '\n' (see `FileContent.lines`).
+        text = self.content.text
+        end = text.find('\n', self.position) + 1 or len(text)
+
+        line = text[self.position:end]
+        self.position = end
+        return line
+
+    def readlines(self, hint: Optional[int] = -1) -> List[str]:    # type: ignore[override]
+        return list(self)
+
+    def __iter__(self) -> Iterator[str]:    # type: ignore[override]
+        return self
+
+    def __next__(self) -> str:    # type: ignore[override]
+        line = self.readline()
+        if not line:
+            raise StopIteration
+
+        return line
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation('Only seeking to the start of the file is supported.')
+
+        self.position = 0
+        return 0
+
+
+@lru_cache(maxsize=1)
+def _extra_line_boundary_regex() -> Pattern:
+    """
+    `str.splitlines` splits lines on these, as well as on '\\n' and '\\r' (which have already
+    been translated).
+    """
+    return re.compile(r'[\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
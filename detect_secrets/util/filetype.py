@@ -1,5 +1,36 @@
+import codecs
+import locale
 import os
 from enum import Enum
+from functools import lru_cache
+
+
+# Just like git, we only look at the start of a file to determine whether it's binary.
+BINARY_SNIFF_SIZE = 8 * 1024
+
+# Text rarely contains control characters (apart from whitespace).
+MAX_CONTROL_CHARACTER_RATIO = 0.3
+
+# These are the file signatures of common binary formats, that may still decode as text
+# (e.g. with single-byte encodings).
+BINARY_SIGNATURES = (
+    b'\x7fELF',                  # Executables (Linux)
+    b'\xca\xfe\xba\xbe',          # Java classes, or universal binaries (macOS)
+    b'\xcf\xfa\xed\xfe',          # Executables (macOS)
+    b'\x89PNG\r\n\x1a\n',
+    b'\xff\xd8\xff',              # JPEG
+    b'\x1f\x8b',                  # gzip
+    b'PK\x03\x04',                # zip (and jar, docx, etc.)
+    b'7z\xbc\xaf\x27\x1c',
+    b'Rar!\x1a\x07',
+    b'\x00asm',                  # WebAssembly
+)
+
+_CONTROL_CHARACTERS = bytes(
+    character
+    for character in range(32)
+    if chr(character) not in '\t\n\r\f\b\x1b'
+) + b'\x7f'
 
 
 class FileType(Enum):
@@ -52,3 +83,54 @@ def determine_file_type(filename: str) -> FileType:
         '.properties': FileType.PROPERTIES,
         '.toml': FileType.TOML
     }.get(file_extension, FileType.OTHER)
+
+
+def is_binary_file(filename: str) -> bool:
+    """
+    This allows us to skip binary files before we try to decode (or parse) them as text.
+    Since this reads from the file, results are cached for as long as the file is unmodified.
+
+    :raises: OSError
+    """
+    stat = os.stat(filename)
+    return _is_binary_file(
+        filename,
+        size=stat.st_size,
+        modified_time=stat.st_mtime_ns,
+        inode=stat.st_ino,
+    )
+
+
+def is_binary(data: bytes, encoding: str = '') -> bool:
+    """
+    :param data: the start of the file (see BINARY_SNIFF_SIZE).
+    :param encoding: that the file would be decoded with. Defaults to the locale's encoding,
+        just like `open`.
+    """
+    if not data:
+        return False
+
+    if b'\0' in data or data.startswith(BINARY_SIGNATURES):
+        return True
+
+    num_control_characters = len(data) - len(data.translate(None, _CONTROL_CHARACTERS))
+    if num_control_characters > len(data) * MAX_CONTROL_CHARACTER_RATIO:
+        return True
+
+    try:
+        # NOTE: We use an incremental decoder, since `data` may end midway through a
+        # multi-byte character.
+        codecs.getincrementaldecoder(
+            encoding or locale.getpreferredencoding(False),
+        )().decode(data, final=False)
+    except UnicodeDecodeError:
+        return True
+
+    return False
+
+
+@lru_cache(maxsize=4096)
+def _is_binary_file(filename: str, size: int, modified_time: int, inode: int) -> bool:
+    """The file's metadata is part of the key, so that changes to the file are picked up."""
+    with open(filename, 'rb') as f:
+        return is_binary(f.read(BINARY_SNIFF_SIZE))
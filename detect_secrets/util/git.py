@@ -1,6 +1,12 @@
 import os
 import subprocess
+from typing import cast
+from typing import Generator
+from typing import IO
+from typing import List
+from typing import Optional
 from typing import Set
+from typing import Tuple
 
 from ..core.log import log
 from .path import get_relative_path
@@ -48,6 +54,159 @@ def get_tracked_files(root: str) -> Set[str]:
     return output
 
 
+def get_tracked_files_with_object_ids(
+    root: str,
+    ref: str = '',
+) -> Generator[Tuple[str, str], None, None]:
+    """
+    Streams (path, blob object ID) pairs for every file tracked by git, with paths relative
+    to `root`. This is much cheaper than walking the filesystem, and since object IDs are
+    computed the same way as `detect_secrets.core.cache.compute_content_hash`, they double
+    as free content hashes.
+
+    :param root: the top level directory of the repository.
+    :param ref: if provided, lists the files at this revision, rather than the ones in the
+        index. Otherwise, object IDs can only be trusted if the file is unmodified in the
+        working tree: as such, we provide an empty string for files which may be modified
+        (or aren't regular files) to signal that their content should be read from disk.
+
+    :raises: CalledProcessError
+    """
+    if ref:
+        # Format: <mode> SP <type> SP <object> TAB <path>
+        for entry in _get_null_terminated_output(
+            ['git', '-C', root, 'ls-tree', '-r', '-z', '--full-tree', ref],
+        ):
+            metadata, path = entry.split('\t', 1)
+            _, object_type, object_id = metadata.split(' ')
+
+            # This skips submodules.
+            if object_type == 'blob':
+                yield path, object_id
+
+        return
+
+    modified_files = set(
+        _get_null_terminated_output(['git', '-C', root, 'diff-files', '--name-only', '-z']),
+    )
+
+    previous_path = ''
+    for entry in _get_null_terminated_output(['git', '-C', root, 'ls-files', '-s', '-z']):
+        # Format: <mode> SP <object> SP <stage> TAB <path>
+        metadata, path = entry.split('\t', 1)
+        mode, object_id, stage = metadata.split(' ')
+        if mode == '160000':
+            # Submodules are scanned as their own repository.
+            continue
+
+        # Unmerged files are listed once per stage.
+        if path == previous_path:
+            continue
+
+        previous_path = path
+        if (
+            path in modified_files
+            or stage != '0'
+            # Symbolic links store their target, rather than the contents of the file.
+            or mode == '120000'
+        ):
+            object_id = ''
+
+        yield path, object_id
+
+
+def get_blobs_from_history(
+    root: str,
+    rev_range: str = '',
+) -> Generator[Tuple[str, str, str], None, None]:
+    """
+    Streams (commit, path, blob object ID) tuples for every file that was added or modified
+    by a commit. This means that a blob is only listed for the commits that introduced it,
+    rather than every commit that contains it.
+
+    Merge commits only list the files that differ from all of their parents (i.e. changes
+    made while resolving conflicts), since everything else was introduced by another commit.
+
+    :param rev_range: e.g. `main`, or `v1.0..v2.0`. Defaults to everything reachable from
+        any ref.
+    :raises: CalledProcessError
+    """
+    command = [
+        'git', '-C', root, 'log',
+        '--format=%H', '--raw', '-z', '--no-abbrev', '--no-renames', '--cc',
+        *(rev_range.split() if rev_range else ['--all']),
+        '--',
+    ]
+
+    commit = ''
+    metadata = ''
+    for token in _get_null_terminated_output(command):
+        if metadata:
+            # Format: (:<mode>)+ SP <src_object>+ SP <dst_object> SP <status> NUL <path>
+            # There's one colon (and source) per parent, for combined diffs of merge commits.
+            num_parents = len(metadata) - len(metadata.lstrip(':'))
+            fields = metadata.lstrip(':').split(' ')
+            mode = fields[num_parents]
+            object_id = fields[2 * num_parents + 1]
+            metadata = ''
+
+            # Deleted files have an empty object ID, and submodules and symbolic links
+            # don't contain file contents.
+            if mode == '100644' or mode == '100755':
+                yield commit, token, object_id
+
+            continue
+
+        # Commits are separated from their changes by a newline.
+        token = token.lstrip('\n')
+        if token.startswith(':'):
+            metadata = token
+        elif token:
+            commit = token
+
+
+class BlobReader:
+    """
+    Reads the contents of blobs through a single, long-lived `git cat-file` process, since
+    spawning a process for each one quickly adds up.
+    """
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self._process: Optional[subprocess.Popen] = None
+
+    def read(self, object_id: str) -> bytes:
+        """
+        :raises: KeyError
+        """
+        if not self._process:
+            self._process = subprocess.Popen(
+                ['git', '-C', self.root, 'cat-file', '--batch'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+
+        stdin = cast(IO[bytes], self._process.stdin)
+        stdout = cast(IO[bytes], self._process.stdout)
+
+        stdin.write(f'{object_id}\n'.encode())
+        stdin.flush()
+
+        # Format: <object> SP <type> SP <size> LF <contents> LF
+        header = stdout.readline().decode().split()
+        if len(header) != 3 or header[1] != 'blob':
+            raise KeyError(object_id)
+
+        content = stdout.read(int(header[2]))
+        stdout.read(1)
+        return content
+
+    def close(self) -> None:
+        if self._process:
+            cast(IO[bytes], self._process.stdin).close()
+            self._process.wait()
+            self._process = None
+
+
 def get_changed_but_unstaged_files() -> Set[str]:
     try:
         files = subprocess.check_output('git diff --name-only'.split()).decode().splitlines()
@@ -56,3 +215,18 @@ def get_changed_but_unstaged_files() -> Set[str]:
         raise ValueError
 
     return set(files)
+
+
+def _get_null_terminated_output(command: List[str]) -> Generator[str, None, None]:
+    """
+    :raises: CalledProcessError
+    """
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as process:
+        remainder = b''
+        for chunk in iter(lambda: process.stdout.read(64 * 1024), b''):    # type: ignore
+            *items, remainder = (remainder + chunk).split(b'\0')
+            for item in items:
+                yield os.fsdecode(item)
+
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command)
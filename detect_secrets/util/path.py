@@ -1,5 +1,7 @@
 import os
+import stat
 from pathlib import Path
+from typing import Callable
 from typing import Optional
 
 
@@ -26,3 +28,35 @@ def convert_local_os_path(path: str) -> str:
     else:
         path = path.replace('/', '\\')
         return path
+
+
+def is_private_directory(path: str) -> bool:
+    """
+    :returns: whether only the current user is able to create (or replace) files in
+        this directory.
+    """
+    return _is_private(path, stat.S_ISDIR)
+
+
+def is_private_file(path: str) -> bool:
+    """
+    :returns: whether only the current user is able to modify this file.
+    """
+    return _is_private(path, stat.S_ISREG)
+
+
+def _is_private(path: str, is_expected_type: Callable[[int], bool]) -> bool:
+    if not hasattr(os, 'getuid'):     # pragma: no cover
+        # We have no way of telling, so we assume the worst.
+        return False
+
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+
+    return (
+        is_expected_type(info.st_mode)
+        and info.st_uid == os.getuid()
+        and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    )
@@ -0,0 +1,474 @@
+import re
+from functools import lru_cache
+from typing import Any
+from typing import FrozenSet
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Pattern
+from typing import Set
+
+try:
+    # Python 3.11+ deprecates the top-level `sre_parse` module.
+    from re import _parser as sre_parse     # type: ignore
+except ImportError:     # pragma: no cover
+    import sre_parse
+
+
+# This bounds the number of literal combinations we keep track of, so that patterns
+# like `[a-f]{3}` don't explode into every possible string.
+MAX_LITERAL_COMBINATIONS = 64
+MAX_CHARACTER_CLASS_SIZE = 8
+
+
+@lru_cache(maxsize=None)
+def get_required_literals(pattern: Pattern) -> FrozenSet[str]:
+    """
+    Finds a set of lowercased literals, such that at least one of them must appear in any
+    string that `pattern` is able to match. For example,
+
+        >>> get_required_literals(re.compile(r'(ghp|gho)_[A-Za-z0-9_]{36}'))
+        {'ghp_', 'gho_'}
+
+    This allows us to cheaply rule out strings that could never match, before running the
+    (more expensive) regex itself. Since the literals are lowercased, this check should be
+    performed against the lowercased version of an ASCII string.
+
+    Results are cached, since plugins are re-initialized whenever settings change, but their
+    patterns are not.
+
+    :returns: an empty set, if no such literals can be determined.
+    """
+    source = pattern.pattern
+    if isinstance(source, bytes):
+        source = source.decode('latin-1')
+
+    try:
+        requirement = _analyze_sequence(sre_parse.parse(source, pattern.flags)).required
+    except Exception:   # pragma: no cover
+        # We don't want an unexpected regex construct to crash the scan. Worst case, we
+        # just don't get to skip any work.
+        return frozenset()
+
+    if not requirement:
+        return frozenset()
+
+    output = {literal.lower() for literal in requirement}
+    if not all(literal.isascii() for literal in output):
+        # Case-insensitive matching of non-ASCII characters has special cases that lowercasing
+        # does not capture (e.g. the Kelvin sign matches "k"), so we don't support it.
+        return frozenset()
+
+    # If the literal `pass` must appear, there's no need to also search for `password`.
+    return frozenset(
+        literal
+        for literal in output
+        if not any(other != literal and other in literal for other in output)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_line_bytes_pattern(pattern: Pattern) -> Optional[Pattern]:
+    """
+    Compiles a relaxed version of `pattern`, that can search bytes (e.g. a memory mapped
+    file) directly, without splitting them into lines first. For example,
+
+        >>> get_line_bytes_pattern(re.compile(r'\bAKIA[0-9A-Z]{16}(?![A-Z])$'))
+        re.compile(b'\\bAKIA(?:[0-9A-Z]){16,16}')
+
+    Within the lines of the file, this finds a superset of what `pattern` would find in
+    those lines (if they were ASCII, with trailing whitespace stripped). As such, it's
+    suitable for ruling out lines that `pattern` could never match: but not for finding
+    the matches themselves. To achieve this:
+
+        - character classes are evaluated against ASCII characters (including Unicode
+          whitespace, like `\x1c`), but never match line breaks. This ensures that no
+          match can span multiple lines.
+        - anything that depends on where a line starts or ends (e.g. `$`, and negative
+          lookarounds) is dropped: which only allows more matches.
+
+    :returns: None, if this isn't possible (or useful, e.g. if every line would match).
+    """
+    source = pattern.pattern
+    if isinstance(source, bytes) or pattern.flags & re.LOCALE:
+        return None
+
+    flags = pattern.flags & re.IGNORECASE
+    try:
+        output = re.compile(
+            _to_line_bytes_pattern(sre_parse.parse(source, pattern.flags), flags).encode('ascii'),
+            flags,
+        )
+        if not sre_parse.parse(output.pattern.decode('ascii'), flags).getwidth()[0]:
+            # This would match every line.
+            return None
+    except Exception:   # pragma: no cover
+        # e.g. variable width lookbehinds, after relaxing them.
+        return None
+
+    return output
+
+
+def _to_line_bytes_pattern(subpattern: Any, flags: int) -> str:
+    """
+    :raises: ValueError: if the subpattern is not supported.
+    """
+    output = []
+    for opcode, value in subpattern:
+        if opcode is sre_parse.LITERAL:
+            if value > 0x7f:
+                # This can never match ASCII text.
+                output.append(_NEVER)
+            elif value in _LINE_BREAKS:
+                output.append(_NEVER)
+            else:
+                output.append(_escape(value))
+
+        elif opcode in (sre_parse.NOT_LITERAL, sre_parse.ANY, sre_parse.IN):
+            if opcode is sre_parse.NOT_LITERAL:
+                source = f'[^{_escape(value)}]' if value <= 0x7f else '.'
+            elif opcode is sre_parse.ANY:
+                source = '.'
+            else:
+                source = _to_character_class(value)
+
+            output.append(_get_ascii_character_class(source, flags & re.IGNORECASE))
+
+        elif opcode is sre_parse.AT:
+            if value in _WORD_BOUNDARIES:
+                output.append(_WORD_BOUNDARIES[value])
+
+        elif opcode is sre_parse.ASSERT_NOT:
+            pass
+
+        elif opcode is sre_parse.ASSERT:
+            direction, body = value
+            output.append(
+                '(?{}={})'.format(
+                    '<' if direction < 0 else '',
+                    _to_line_bytes_pattern(body, flags),
+                ),
+            )
+
+        elif opcode is sre_parse.SUBPATTERN:
+            group, add_flags, del_flags, body = value
+            body_flags = (flags | add_flags) & ~del_flags
+            source = _to_line_bytes_pattern(body, body_flags)
+            if (add_flags | del_flags) & re.IGNORECASE:
+                source = '(?{}:{})'.format('i' if body_flags & re.IGNORECASE else '-i', source)
+
+            output.append(f'({source})' if group is not None else f'(?:{source})')
+
+        elif opcode is getattr(sre_parse, 'ATOMIC_GROUP', None):
+            output.append(f'(?>{_to_line_bytes_pattern(value, flags)})')
+
+        elif opcode is sre_parse.BRANCH:
+            output.append(
+                '(?:{})'.format(
+                    '|'.join(_to_line_bytes_pattern(branch, flags) for branch in value[1]),
+                ),
+            )
+
+        elif opcode in _REPEAT_OPCODES:
+            minimum, maximum, body = value
+            output.append(
+                '(?:{}){{{},{}}}{}'.format(
+                    _to_line_bytes_pattern(body, flags),
+                    minimum,
+                    '' if maximum == sre_parse.MAXREPEAT else maximum,
+                    _REPEAT_SUFFIXES.get(opcode, ''),
+                ),
+            )
+
+        elif opcode is sre_parse.GROUPREF:
+            output.append(f'(?:\\{value})')
+
+        elif opcode is sre_parse.GROUPREF_EXISTS:
+            group, yes, no = value
+            output.append(
+                '(?({}){}|{})'.format(
+                    group,
+                    _to_line_bytes_pattern(yes, flags),
+                    _to_line_bytes_pattern(no, flags) if no is not None else '',
+                ),
+            )
+
+        else:
+            raise ValueError(f'Unsupported opcode: {opcode}')
+
+    return ''.join(output)
+
+
+def _to_character_class(items: Any) -> str:
+    output = []
+    for opcode, value in items:
+        if opcode is sre_parse.NEGATE:
+            output.append('^')
+        elif opcode is sre_parse.LITERAL:
+            output.append(_escape(value))
+        elif opcode is sre_parse.RANGE:
+            output.append(f'{_escape(value[0])}-{_escape(value[1])}')
+        elif opcode is sre_parse.CATEGORY:
+            output.append(_CATEGORIES[value])
+        else:
+            raise ValueError(f'Unsupported opcode: {opcode}')
+
+    return '[{}]'.format(''.join(output))
+
+
+@lru_cache(maxsize=None)
+def _get_ascii_character_class(source: str, flags: int) -> str:
+    """
+    :param source: a (str) regex that matches a single character.
+    :returns: a character class that matches the same ASCII characters, except line breaks.
+    """
+    regex = re.compile(source, flags)
+    characters = [
+        character
+        for character in range(0x80)
+        if character not in _LINE_BREAKS and regex.fullmatch(chr(character))
+    ]
+    if not characters:
+        return _NEVER
+
+    # Consecutive characters are grouped into ranges, for readability.
+    ranges: List[List[int]] = []
+    for character in characters:
+        if ranges and ranges[-1][1] == character - 1:
+            ranges[-1][1] = character
+        else:
+            ranges.append([character, character])
+
+    return '[{}]'.format(
+        ''.join(
+            _escape(low) if low == high else f'{_escape(low)}-{_escape(high)}'
+            for low, high in ranges
+        ),
+    )
+
+
+def _escape(character: int) -> str:
+    if 0x20 <= character < 0x7f:
+        return re.escape(chr(character))
+
+    return f'\\x{character:02x}' if character <= 0xff else f'\\u{character:04x}'
+
+
+class _Info(NamedTuple):
+    """
+    Summarizes what we know about the strings matched by a part of a regex.
+    """
+    # If not None, the part matches exactly one of these strings.
+    exact: Optional[Set[str]]
+
+    # Every match starts with one of these strings.
+    prefix: Optional[Set[str]]
+
+    # Every match ends with one of these strings.
+    suffix: Optional[Set[str]]
+
+    # Every match contains one of these strings.
+    required: Optional[Set[str]]
+
+
+_UNKNOWN = _Info(exact=None, prefix=None, suffix=None, required=None)
+
+
+def _analyze_sequence(subpattern: Any) -> _Info:
+    candidates: List[Set[str]] = []
+    prefix: Optional[Set[str]] = None
+    is_exact = True
+
+    # This contains the possible values of the contiguous run of literals that we're
+    # currently in.
+    run = {''}
+    for opcode, value in subpattern:
+        info = _analyze_element(opcode, value)
+        if info.exact is not None:
+            extended = _concatenate(run, info.exact)
+            if extended is not None:
+                run = extended
+                continue
+
+            # There are too many combinations to track, so treat this as a new run.
+            info = _Info(exact=None, prefix=info.exact, suffix=info.exact, required=info.exact)
+
+        head = run
+        if _is_usable(info.prefix):
+            head = _concatenate(run, info.prefix) or run    # type: ignore
+
+        if is_exact:
+            prefix = head
+            is_exact = False
+
+        candidates.append(head)
+        if info.required:
+            candidates.append(info.required)
+
+        run = info.suffix if _is_usable(info.suffix) else {''}    # type: ignore
+
+    if is_exact:
+        return _Info(exact=run, prefix=run, suffix=run, required=_get_usable(run))
+
+    candidates.append(run)
+    usable_candidates = [candidate for candidate in candidates if _is_usable(candidate)]
+    return _Info(
+        exact=None,
+        prefix=_get_usable(prefix),
+        suffix=_get_usable(run),
+        required=(
+            max(usable_candidates, key=lambda x: min(len(literal) for literal in x))
+            if usable_candidates
+            else None
+        ),
+    )
+
+
+def _analyze_element(opcode: Any, value: Any) -> _Info:
+    if opcode is sre_parse.LITERAL:
+        literal = {chr(value)}
+        return _Info(exact=literal, prefix=literal, suffix=literal, required=literal)
+
+    if opcode in _ZERO_WIDTH_OPCODES:
+        # These don't consume any characters, so they don't break a literal run.
+        return _Info(exact={''}, prefix=None, suffix=None, required=None)
+
+    if opcode is sre_parse.IN:
+        characters = _get_character_class(value)
+        if characters is None:
+            return _UNKNOWN
+
+        return _Info(exact=characters, prefix=characters, suffix=characters, required=characters)
+
+    if opcode is sre_parse.SUBPATTERN:
+        return _analyze_sequence(value[-1])
+
+    if opcode is getattr(sre_parse, 'ATOMIC_GROUP', None):
+        return _analyze_sequence(value)
+
+    if opcode is sre_parse.BRANCH:
+        return _analyze_branch([_analyze_sequence(branch) for branch in value[1]])
+
+    if opcode in _REPEAT_OPCODES:
+        minimum, maximum, body = value
+        info = _analyze_sequence(body)
+        if minimum == maximum == 1:
+            return info
+
+        if minimum == 0:
+            if maximum == 1 and info.exact is not None:
+                optional = {'', *info.exact}
+                return _Info(exact=optional, prefix=None, suffix=None, required=None)
+
+            return _UNKNOWN
+
+        # We know that the body appears at least once, but not how many times.
+        return _Info(
+            exact=None,
+            prefix=info.prefix,
+            suffix=info.suffix,
+            required=info.required,
+        )
+
+    return _UNKNOWN
+
+
+def _analyze_branch(branches: List[_Info]) -> _Info:
+    def union(values: List[Optional[Set[str]]]) -> Optional[Set[str]]:
+        if not all(value is not None for value in values):
+            return None
+
+        output: Set[str] = set().union(*values)     # type: ignore
+        if len(output) > MAX_LITERAL_COMBINATIONS:
+            return None
+
+        return output
+
+    exact = union([branch.exact for branch in branches])
+    if exact is not None:
+        return _Info(exact=exact, prefix=exact, suffix=exact, required=_get_usable(exact))
+
+    return _Info(
+        exact=None,
+        prefix=_get_usable(union([_get_usable(branch.prefix) for branch in branches])),
+        suffix=_get_usable(union([_get_usable(branch.suffix) for branch in branches])),
+        required=_get_usable(union([branch.required for branch in branches])),
+    )
+
+
+def _get_character_class(value: Any) -> Optional[Set[str]]:
+    output: Set[str] = set()
+    for opcode, item in value:
+        if opcode is sre_parse.LITERAL:
+            output.add(chr(item))
+        elif opcode is sre_parse.RANGE:
+            low, high = item
+            if high - low >= MAX_CHARACTER_CLASS_SIZE:
+                return None
+
+            output.update(chr(character) for character in range(low, high + 1))
+        else:
+            # e.g. negated sets, or categories like `\d`.
+            return None
+
+        if len(output) > MAX_CHARACTER_CLASS_SIZE:
+            return None
+
+    return output
+
+
+def _concatenate(left: Set[str], right: Set[str]) -> Optional[Set[str]]:
+    if len(left) * len(right) > MAX_LITERAL_COMBINATIONS:
+        return None
+
+    return {a + b for a in left for b in right}
+
+
+def _is_usable(literals: Optional[Set[str]]) -> bool:
+    # If the empty string is a possibility, then it doesn't tell us anything.
+    return bool(literals) and '' not in literals      # type: ignore
+
+
+def _get_usable(literals: Optional[Set[str]]) -> Optional[Set[str]]:
+    return literals if _is_usable(literals) else None
+
+
+_ZERO_WIDTH_OPCODES = {
+    sre_parse.AT,
+    sre_parse.ASSERT,
+    sre_parse.ASSERT_NOT,
+}
+
+_REPEAT_OPCODES = {
+    opcode
+    for opcode in (
+        sre_parse.MAX_REPEAT,
+        sre_parse.MIN_REPEAT,
+        getattr(sre_parse, 'POSSESSIVE_REPEAT', None),
+    )
+    if opcode is not None
+}
+
+# This never matches anything.
+_NEVER = '(?!)'
+
+_LINE_BREAKS = {ord('\n'), ord('\r')}
+
+_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: r'\d',
+    sre_parse.CATEGORY_NOT_DIGIT: r'\D',
+    sre_parse.CATEGORY_SPACE: r'\s',
+    sre_parse.CATEGORY_NOT_SPACE: r'\S',
+    sre_parse.CATEGORY_WORD: r'\w',
+    sre_parse.CATEGORY_NOT_WORD: r'\W',
+}
+
+_WORD_BOUNDARIES = {
+    sre_parse.AT_BOUNDARY: r'\b',
+    sre_parse.AT_NON_BOUNDARY: r'\B',
+}
+
+_REPEAT_SUFFIXES = {
+    sre_parse.MIN_REPEAT: '?',
+    getattr(sre_parse, 'POSSESSIVE_REPEAT', None): '+',
+}
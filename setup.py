@@ -49,8 +49,10 @@ setup(
     },
     entry_points={
         'console_scripts': [
-            'detect-secrets = detect_secrets.main:main',
-            'detect-secrets-hook = detect_secrets.pre_commit_hook:main',
+            # These forward to `detect-secrets-daemon`, if it's running.
+            'detect-secrets = detect_secrets.client:main',
+            'detect-secrets-hook = detect_secrets.client:hook_main',
+            'detect-secrets-daemon = detect_secrets.daemon:main',
         ],
     },
     classifiers=[
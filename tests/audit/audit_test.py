@@ -159,6 +159,46 @@ def test_fails_if_no_line_numbers_found(printer):
     assert 'No line numbers found in baseline' in printer.message
 
 
+def test_finds_secrets_in_long_lines(printer):
+    with mock_named_temporary_file(suffix='.js') as f, mock_named_temporary_file() as baseline_file:
+        f.write(
+            ';'.join([
+                *(['var a=b(c,d)'] * 50),
+                'password="correcthorse"',
+                *(['var a=b(c,d)'] * 50),
+                'password="batterystaple"',
+            ]).encode(),
+        )
+        f.seek(0)
+
+        with transient_settings({
+            'plugins_used': [
+                {'name': 'KeywordDetector'},
+            ],
+            'max_line_length': 100,
+        }):
+            secrets = SecretsCollection()
+            secrets.scan_file(f.name)
+
+            # Since this is only one line, these can only be found by scanning it in windows.
+            assert len(list(secrets)) == 2
+            baseline.save_to_file(secrets, baseline_file.name)
+
+        # The audit needs to scan the line in the same way, based on the baseline's settings.
+        with mock.patch('detect_secrets.audit.io.input') as mock_input, mock.patch(
+            'detect_secrets.audit.io.print_secret_not_found',
+        ) as mock_not_found:
+            mock_input.side_effect = ['y', 'n', 'q']
+            main(['audit', baseline_file.name])
+
+        assert not mock_not_found.called
+        secrets = baseline.load(baseline.load_from_file(baseline_file.name))
+
+    assert sorted(secret.is_secret for _, secret in secrets) == [False, True]
+    assert 'correcthorse' in printer.message
+    assert 'batterystaple' in printer.message
+
+
 def run_logic(
     secrets: SecretsCollection,
     input: Optional[str] = None,
@@ -184,6 +184,35 @@ def test_generate_report(
         assert found
 
 
+def test_generate_report_for_long_lines():
+    content = ';'.join([
+        *(['var a=b(c,d)'] * 50),
+        'password="correcthorse"',
+        *(['var a=b(c,d)'] * 50),
+        'password="batterystaple"',
+    ])
+
+    with create_file_with_content(content) as filename, \
+            mock_named_temporary_file() as baseline_file:
+        with transient_settings({
+            'plugins_used': [
+                {'name': 'KeywordDetector'},
+            ],
+            'max_line_length': 100,
+        }):
+            secrets = SecretsCollection()
+            secrets.scan_file(filename)
+            baseline.save_to_file(secrets, baseline_file.name)
+
+        output = generate_report(baseline_file.name)
+
+    assert sorted(item['secrets'] for item in output['results']) == [
+        'batterystaple',
+        'correcthorse',
+    ]
+    assert all(item['lines'] == {1: content} for item in output['results'])
+
+
 def count_results(data):
     real_secrets = 0
     false_secrets = 0
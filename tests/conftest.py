@@ -80,6 +80,15 @@ def mocked_requests():
         yield rsps
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_directory(tmp_path, monkeypatch):
+    # Otherwise, results of scans in one test case may be reused by another.
+    monkeypatch.setenv('DETECT_SECRETS_CACHE_DIR', str(tmp_path / 'cache'))
+
+    # This is where wordlists are cached.
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'user-cache'))
+
+
 @pytest.fixture(autouse=True)
 def prevent_clear_screen():
     with mock.patch('detect_secrets.audit.io.clear_screen'):
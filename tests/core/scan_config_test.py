@@ -0,0 +1,81 @@
+import json
+from unittest import mock
+
+import pytest
+
+from detect_secrets.core import scan_config
+from detect_secrets.core.cache import get_settings_fingerprint
+from detect_secrets.core.scan_config import configure_worker
+from detect_secrets.core.scan_config import get_scan_config
+from detect_secrets.settings import get_plugins
+from detect_secrets.settings import get_settings
+from detect_secrets.settings import transient_settings
+
+
+class TestGetScanConfig:
+    @staticmethod
+    def test_snapshot():
+        config = get_scan_config()
+
+        assert json.loads(config.settings) == get_settings().json()
+        assert config.fingerprint == get_settings_fingerprint()
+
+    @staticmethod
+    def test_snapshot_is_not_affected_by_later_changes():
+        config = get_scan_config()
+
+        get_settings().configure_plugins([{'name': 'AWSKeyDetector'}])
+        assert get_scan_config() != config
+
+
+class TestConfigureWorker:
+    @staticmethod
+    def test_does_nothing_when_settings_have_not_changed(mock_configure):
+        configure_worker(get_scan_config())
+
+        assert not mock_configure.called
+
+    @staticmethod
+    def test_configures_unseen_snapshot(mock_configure):
+        config = get_scan_config()
+        scan_config._scan_config = None
+
+        configure_worker(config)
+
+        mock_configure.assert_called_once_with(json.loads(config.settings))
+
+    @staticmethod
+    def test_configures_when_settings_have_changed():
+        config = get_scan_config()
+        get_settings().disable_plugins('BasicAuthDetector')
+
+        configure_worker(config)
+        assert 'BasicAuthDetector' in [plugin.__class__.__name__ for plugin in get_plugins()]
+
+        # Now that this process has been configured, it doesn't need to be done again.
+        with mock.patch.object(scan_config, 'configure_settings_from_baseline') as mock_configure:
+            configure_worker(config)
+
+        assert not mock_configure.called
+
+    @staticmethod
+    @pytest.fixture
+    def mock_configure():
+        with mock.patch.object(
+            scan_config,
+            'configure_settings_from_baseline',
+            wraps=scan_config.configure_settings_from_baseline,
+        ) as mock_configure:
+            yield mock_configure
+
+
+@pytest.fixture(autouse=True)
+def configure_plugins():
+    with transient_settings({
+        'plugins_used': [
+            {
+                'name': 'BasicAuthDetector',
+            },
+        ],
+    }), mock.patch.object(scan_config, '_scan_config', None):
+        yield
@@ -0,0 +1,99 @@
+from unittest import mock
+
+import pytest
+
+from detect_secrets.core.scheduler import ExecutionMode
+from detect_secrets.core.scheduler import ExecutionPlan
+from detect_secrets.core.scheduler import get_batches
+from detect_secrets.core.scheduler import get_execution_plan
+from detect_secrets.core.scheduler import MAX_THREADS
+from detect_secrets.core.scheduler import MIN_BATCH_SIZE
+from detect_secrets.core.scheduler import MIN_WORK_PER_PROCESS
+
+
+def test_largest_tasks_are_handed_out_first():
+    batches = get_batches(
+        [('small', 10), ('large', 100 * MIN_BATCH_SIZE), ('medium', 10 * MIN_BATCH_SIZE)],
+        num_workers=2,
+    )
+
+    assert batches[:2] == [['large'], ['medium']]
+
+
+def test_small_tasks_are_batched():
+    batches = get_batches([(index, 1024) for index in range(1000)], num_workers=2)
+
+    assert sorted(task for batch in batches for task in batch) == list(range(1000))
+    assert 1 < len(batches) < 100
+
+
+def test_batches_get_smaller_towards_the_end():
+    batches = get_batches([(index, 1024) for index in range(10000)], num_workers=2)
+
+    assert len(batches[0]) > len(batches[-2])
+
+
+def test_empty():
+    assert get_batches([], num_workers=2) == []
+
+
+class TestGetExecutionPlan:
+    @staticmethod
+    @pytest.mark.parametrize(
+        'sizes',
+        (
+            [1024] * 3,
+            [MIN_WORK_PER_PROCESS],
+            [100 * MIN_WORK_PER_PROCESS],
+        ),
+    )
+    def test_small_scans_are_serial(sizes):
+        assert get_execution_plan(sizes, max_workers=4) == ExecutionPlan(
+            mode=ExecutionMode.SERIAL,
+            num_workers=1,
+        )
+
+    @staticmethod
+    def test_processes_scale_with_the_amount_of_work():
+        assert get_execution_plan([MIN_WORK_PER_PROCESS] * 3, max_workers=8) == ExecutionPlan(
+            mode=ExecutionMode.PROCESSES,
+            num_workers=3,
+        )
+        assert get_execution_plan([MIN_WORK_PER_PROCESS] * 100, max_workers=8) == ExecutionPlan(
+            mode=ExecutionMode.PROCESSES,
+            num_workers=8,
+        )
+
+    @staticmethod
+    def test_threads_are_used_when_io_bound():
+        assert get_execution_plan([1024] * 100, max_workers=4, is_io_bound=True) == ExecutionPlan(
+            mode=ExecutionMode.THREADS,
+            num_workers=8,
+        )
+        assert get_execution_plan(
+            [1024] * 100,
+            max_workers=64,
+            is_io_bound=True,
+        ).num_workers == MAX_THREADS
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        'mode, num_workers',
+        (
+            (ExecutionMode.SERIAL, 1),
+            (ExecutionMode.THREADS, 3),
+            (ExecutionMode.PROCESSES, 3),
+        ),
+    )
+    def test_mode_can_be_forced(mode, num_workers):
+        assert get_execution_plan([1024] * 3, max_workers=4, mode=mode) == ExecutionPlan(
+            mode=mode,
+            num_workers=num_workers,
+        )
+
+    @staticmethod
+    def test_defaults_to_available_cpus():
+        with mock.patch('detect_secrets.core.scheduler.get_cpu_count', return_value=2):
+            plan = get_execution_plan([MIN_WORK_PER_PROCESS] * 100)
+
+        assert plan.num_workers == 2
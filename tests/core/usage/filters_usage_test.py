@@ -5,8 +5,10 @@ import pytest
 from detect_secrets.constants import VerifiedResult
 from detect_secrets.core import baseline
 from detect_secrets.core.secrets_collection import SecretsCollection
+from detect_secrets.core.usage import filters
 from detect_secrets.core.usage import ParserBuilder
 from detect_secrets.settings import default_settings
+from detect_secrets.settings import get_filters
 from detect_secrets.settings import get_settings
 from detect_secrets.settings import transient_settings
 from testing.mocks import mock_named_temporary_file
@@ -45,6 +47,17 @@ def test_only_verified_overrides_baseline_settings(parser):
         ]['min_level'] == VerifiedResult.VERIFIED_TRUE.value
 
 
+def test_filters_are_updated(parser):
+    args = parser.parse_args(['scan'])
+    assert get_filters()
+
+    args.exclude_lines = ['^ignore']
+    filters.parse_args(args)
+    assert 'detect_secrets.filters.regex.should_exclude_line' in [
+        filter_fn.path for filter_fn in get_filters()
+    ]
+
+
 class TestCustomFilters:
     @staticmethod
     @pytest.mark.parametrize(
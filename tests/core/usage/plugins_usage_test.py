@@ -7,6 +7,7 @@ from detect_secrets.core import baseline
 from detect_secrets.core import plugins
 from detect_secrets.core.secrets_collection import SecretsCollection
 from detect_secrets.core.usage import ParserBuilder
+from detect_secrets.settings import get_plugins
 from detect_secrets.settings import get_settings
 from testing.mocks import mock_named_temporary_file
 
@@ -27,6 +28,18 @@ class TestAddCustomLimits:
 
         assert get_settings().plugins['Base64HighEntropyString']['limit'] == 5.0
 
+    @staticmethod
+    def test_plugins_are_updated(parser):
+        parser.parse_args([])
+        assert get_plugins()
+
+        parser.parse_args(['--base64-limit', '5'])
+        assert [
+            plugin.entropy_limit
+            for plugin in get_plugins()
+            if plugin.__class__.__name__ == 'Base64HighEntropyString'
+        ] == [5.0]
+
     @staticmethod
     @pytest.mark.parametrize(
         'flag',
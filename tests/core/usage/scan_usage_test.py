@@ -4,6 +4,7 @@ import pytest
 
 from detect_secrets.core import plugins
 from detect_secrets.core.plugins.util import get_mapping_from_secret_type_to_class
+from detect_secrets.core.scheduler import ExecutionMode
 from detect_secrets.core.usage import ParserBuilder
 from detect_secrets.settings import get_settings
 from testing.mocks import mock_named_temporary_file
@@ -40,3 +41,82 @@ def test_default_plugins_initialized(parser):
     assert len(get_settings().plugins) == len(get_mapping_from_secret_type_to_class())
     assert plugins.initialize.from_plugin_classname('HexHighEntropyString').entropy_limit == 2
     assert plugins.initialize.from_plugin_classname('Base64HighEntropyString').entropy_limit == 4.5
+
+
+@pytest.mark.parametrize(
+    'argv',
+    (
+        ['scan', '--history', 'test_data'],
+        ['scan', '--history', '--only-allowlisted'],
+        ['scan', '--rev-range', 'main'],
+    ),
+)
+def test_invalid_history_options(parser, argv):
+    with pytest.raises(SystemExit):
+        parser.parse_args(argv)
+
+
+def test_history_does_not_update_baseline(parser):
+    with mock_named_temporary_file() as f:
+        f.write(json.dumps({'version': '0.0.1', 'plugins_used': [], 'results': []}).encode())
+        f.seek(0)
+
+        with pytest.raises(SystemExit):
+            parser.parse_args(['scan', '--history', '--baseline', f.name])
+
+
+def test_max_line_length(parser):
+    parser.parse_args(['scan', '--max-line-length', '500'])
+
+    assert get_settings().max_line_length == 500
+    assert get_settings().json()['max_line_length'] == 500
+
+
+def test_max_line_length_from_baseline(parser):
+    with mock_named_temporary_file() as f:
+        f.write(
+            json.dumps({
+                'version': '0.0.1',
+                'plugins_used': [
+                    {
+                        'name': 'AWSKeyDetector',
+                    },
+                ],
+                'max_line_length': 500,
+                'results': [],
+            }).encode(),
+        )
+        f.seek(0)
+
+        parser.parse_args(['scan', '--baseline', f.name])
+
+    assert get_settings().max_line_length == 500
+
+
+def test_default_max_line_length_is_not_saved(parser):
+    parser.parse_args(['scan'])
+
+    assert 'max_line_length' not in get_settings().json()
+
+
+@pytest.mark.parametrize('length', ('0', '-1'))
+def test_invalid_max_line_length(parser, length):
+    with pytest.raises(SystemExit):
+        parser.parse_args(['scan', '--max-line-length', length])
+
+
+@pytest.mark.parametrize(
+    'flag, mode',
+    (
+        ([], None),
+        (['--execution-mode', 'serial'], ExecutionMode.SERIAL),
+        (['--execution-mode', 'THREADS'], ExecutionMode.THREADS),
+    ),
+)
+def test_execution_mode(parser, flag, mode):
+    assert parser.parse_args([*flag, 'scan']).execution_mode == mode
+
+
+def test_invalid_execution_mode(parser):
+    with pytest.raises(SystemExit):
+        parser.parse_args(['--execution-mode', 'fibers', 'scan'])
@@ -0,0 +1,316 @@
+import json
+import os
+import socket
+import threading
+from unittest import mock
+
+import pytest
+
+from detect_secrets import client
+from detect_secrets import daemon as daemon_module
+from detect_secrets import pre_commit_hook
+from detect_secrets.__version__ import VERSION
+from detect_secrets.client import forward
+from detect_secrets.client import receive_message
+from detect_secrets.client import send_message
+from detect_secrets.core import baseline
+from detect_secrets.core.secrets_collection import SecretsCollection
+from detect_secrets.daemon import Daemon
+from detect_secrets.settings import default_settings
+from detect_secrets.util.path import is_private_directory
+from testing.mocks import disable_gibberish_filter
+from testing.mocks import mock_named_temporary_file
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    return Daemon(str(tmp_path / 'daemon.sock'))
+
+
+@pytest.fixture
+def baseline_file():
+    with default_settings():
+        secrets = SecretsCollection()
+        secrets.scan_file('test_data/each_secret.py')
+
+        with mock_named_temporary_file() as f:
+            baseline.save_to_file(secrets, f.name)
+            yield f
+
+
+class TestHook:
+    @staticmethod
+    def test_basic(daemon):
+        response = daemon.handle_request(
+            get_request('hook', ['test_data/files/file_with_secrets.py']),
+        )
+
+        assert response['status'] == 1
+        assert 'Potential secrets about to be committed' in response['stdout']
+
+        response = daemon.handle_request(
+            get_request('hook', ['test_data/files/file_with_no_secrets.py']),
+        )
+        assert response['status'] == 0
+        assert not response['stdout']
+
+    @staticmethod
+    def test_reuses_configuration(daemon, baseline_file):
+        with disable_gibberish_filter():
+            response = daemon.handle_request(
+                get_request('hook', ['--baseline', baseline_file.name, 'test_data/each_secret.py']),
+            )
+            assert response['status'] == 0
+
+            with mock.patch.object(
+                pre_commit_hook,
+                'parse_args',
+                wraps=pre_commit_hook.parse_args,
+            ) as mock_parse_args:
+                # The baseline is mutated by the hook, so this ensures that it's restored.
+                for _ in range(2):
+                    response = daemon.handle_request(
+                        get_request(
+                            'hook',
+                            ['--baseline', baseline_file.name, 'test_data/each_secret.py'],
+                        ),
+                    )
+                    assert response['status'] == 0
+
+                response = daemon.handle_request(
+                    get_request(
+                        'hook',
+                        ['--baseline', baseline_file.name, 'test_data/files/file_with_secrets.py'],
+                    ),
+                )
+                assert response['status'] == 1
+
+        assert not mock_parse_args.called
+
+    @staticmethod
+    def test_reloads_modified_baseline(daemon, baseline_file):
+        argv = ['--baseline', baseline_file.name, 'test_data/files/file_with_secrets.py']
+        with disable_gibberish_filter():
+            assert daemon.handle_request(get_request('hook', argv))['status'] == 1
+
+            with default_settings():
+                secrets = SecretsCollection()
+                secrets.scan_file('test_data/files/file_with_secrets.py')
+                baseline.save_to_file(secrets, baseline_file.name)
+
+            assert daemon.handle_request(get_request('hook', argv))['status'] == 0
+
+    @staticmethod
+    def test_different_options_are_parsed_again(daemon):
+        response = daemon.handle_request(
+            get_request('hook', ['test_data/files/file_with_secrets.py']),
+        )
+        assert response['status'] == 1
+
+        response = daemon.handle_request(
+            get_request(
+                'hook',
+                ['--json', 'test_data/files/file_with_secrets.py'],
+            ),
+        )
+        assert response['status'] == 1
+        assert json.loads(response['stdout'])['results']
+
+
+def test_scan(daemon):
+    response = daemon.handle_request(get_request('scan', ['scan', 'test_data/each_secret.py']))
+
+    assert response['status'] == 0
+    assert json.loads(response['stdout'])['results']['test_data/each_secret.py']
+
+
+def test_invalid_arguments(daemon):
+    response = daemon.handle_request(get_request('hook', ['--baseline', 'does-not-exist']))
+
+    assert response['status'] != 0
+    assert 'does-not-exist' in response['stderr']
+
+
+def test_mismatched_version(daemon):
+    request = get_request('hook', ['test_data/files/file_with_secrets.py'])
+    request['version'] = '0.0.1'
+
+    assert 'status' not in daemon.handle_request(request)
+
+
+def test_missing_working_directory(daemon, tmp_path):
+    request = get_request('hook', ['test_data/files/file_with_secrets.py'])
+    request['cwd'] = str(tmp_path / 'does-not-exist')
+
+    assert 'status' not in daemon.handle_request(request)
+    assert os.getcwd() != request['cwd']
+
+
+class TestClient:
+    @staticmethod
+    def test_forward(daemon, capsys):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(daemon.socket_path)
+            server.listen()
+
+            def handle_one_connection():
+                connection, _ = server.accept()
+                with connection:
+                    daemon.handle_connection(connection)
+
+            thread = threading.Thread(target=handle_one_connection)
+            thread.start()
+
+            status = forward(
+                'hook',
+                ['test_data/files/file_with_secrets.py'],
+                socket_path=daemon.socket_path,
+            )
+            thread.join()
+
+        assert status == 1
+        assert 'Potential secrets about to be committed' in capsys.readouterr().out
+
+    @staticmethod
+    def test_no_daemon(daemon):
+        assert forward('hook', ['test_data/each_secret.py'], socket_path=daemon.socket_path) is None
+
+    @staticmethod
+    def test_stale_socket(daemon):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(daemon.socket_path)
+
+        # The socket file still exists, but nothing is listening.
+        assert os.path.exists(daemon.socket_path)
+        assert forward('hook', ['test_data/each_secret.py'], socket_path=daemon.socket_path) is None
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        'directory_mode, uid_offset',
+        (
+            (0o777, 0),
+            (0o700, 1),
+        ),
+    )
+    def test_untrusted_socket(tmp_path, capsys, directory_mode, uid_offset):
+        directory = tmp_path / 'shared'
+        directory.mkdir()
+        socket_path = str(directory / 'daemon.sock')
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(socket_path)
+            server.listen()
+            directory.chmod(directory_mode)
+
+            with mock.patch.object(client.os, 'getuid', return_value=os.getuid() + uid_offset):
+                status = forward('hook', ['test_data/each_secret.py'], socket_path=socket_path)
+
+            assert status is None
+
+            # Nothing was sent to it.
+            server.setblocking(False)
+            with pytest.raises(BlockingIOError):
+                server.accept()
+
+        assert 'may be accessible by other users' in capsys.readouterr().err
+
+    @staticmethod
+    def test_only_forwards_relevant_environment_variables():
+        with mock.patch.dict(
+            os.environ,
+            {'GIT_INDEX_FILE': '.git/index.lock', 'GITHUB_TOKEN': 'ghp_secret'},
+        ):
+            env = client._get_environment()
+
+        assert env['GIT_INDEX_FILE'] == '.git/index.lock'
+        assert 'GITHUB_TOKEN' not in env
+        assert 'PATH' not in env
+
+    @staticmethod
+    def test_protocol():
+        client, server = socket.socketpair()
+        with client, server:
+            send_message(client, {'message': 'a' * 100000})
+            assert receive_message(server) == {'message': 'a' * 100000}
+
+
+class TestServeForever:
+    @staticmethod
+    def test_creates_private_directory(tmp_path):
+        daemon = Daemon(str(tmp_path / 'private' / 'daemon.sock'))
+        with mock.patch.object(daemon_module.socket, 'socket', side_effect=RuntimeError):
+            with pytest.raises(RuntimeError):
+                daemon.serve_forever()
+
+        assert is_private_directory(str(tmp_path / 'private'))
+        assert (tmp_path / 'private').stat().st_mode & 0o777 == 0o700
+
+    @staticmethod
+    def test_refuses_shared_directory(tmp_path):
+        tmp_path.chmod(0o777)
+        with pytest.raises(ValueError):
+            Daemon(str(tmp_path / 'daemon.sock')).serve_forever()
+
+    @staticmethod
+    def test_does_not_take_over_live_socket(daemon):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(daemon.socket_path)
+            server.listen()
+
+            with pytest.raises(ValueError):
+                daemon.serve_forever()
+
+        assert os.path.exists(daemon.socket_path)
+
+    @staticmethod
+    def test_does_not_remove_other_files(daemon):
+        with open(daemon.socket_path, 'w'):
+            pass
+
+        with pytest.raises(ValueError):
+            daemon.serve_forever()
+
+        assert os.path.exists(daemon.socket_path)
+
+    @staticmethod
+    def test_removes_stale_socket(daemon):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(daemon.socket_path)
+
+        daemon_module._remove_stale_socket(daemon.socket_path)
+        assert not os.path.exists(daemon.socket_path)
+
+
+def test_request_only_overrides_forwarded_environment_variables(daemon):
+    request = get_request('hook', ['test_data/files/file_with_secrets.py'])
+    request['env'] = {'PATH': '', 'CLICOLOR': '0'}
+
+    environments = []
+
+    def run(args):
+        environments.append(dict(os.environ))
+        return 0
+
+    with mock.patch.dict(os.environ, {'CLICOLOR_FORCE': '1'}), mock.patch.object(
+        pre_commit_hook,
+        'run',
+        side_effect=run,
+    ):
+        assert daemon.handle_request(request)['status'] == 0
+
+        # Environment variables that weren't forwarded are still the daemon's own.
+        assert environments[0]['PATH'] == os.environ['PATH']
+        assert environments[0]['CLICOLOR'] == '0'
+        assert 'CLICOLOR_FORCE' not in environments[0]
+
+        assert os.environ['CLICOLOR_FORCE'] == '1'
+
+
+def get_request(command, argv):
+    return {
+        'version': VERSION,
+        'command': command,
+        'argv': argv,
+        'cwd': os.getcwd(),
+        'env': dict(os.environ),
+    }
@@ -1,9 +1,14 @@
 import os
+import string
 
 import pytest
+from gibberish_detector import serializer
+from gibberish_detector.detector import Detector
+from gibberish_detector.model import Model
 
 from detect_secrets import filters
 from detect_secrets.plugins.private_key import PrivateKeyDetector
+from detect_secrets.settings import get_filters
 from detect_secrets.settings import transient_settings
 
 
@@ -49,6 +54,58 @@ class TestShouldExcludeSecret:
         )
 
 
+class TestCalculateScore:
+    @staticmethod
+    @pytest.fixture(autouse=True)
+    def initialize():
+        filters.gibberish.initialize()
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        'payload',
+        (
+            'this-is-a-bad-password',
+            'k8s-kube_cluster-ca/issue/k8s-prometheus-adapter',
+            'ncxygbmcwtenre1n06opra',
+            'a',
+            '',
+        ),
+    )
+    def test_same_as_detector(payload):
+        detector = Detector(model=filters.gibberish.get_model(), threshold=3.7)
+
+        assert (
+            filters.gibberish.calculate_score(payload)
+            == detector.calculate_probability_of_being_gibberish(payload)
+        )
+
+    @staticmethod
+    def test_scores_are_recalculated_when_model_changes(tmp_path):
+        score = filters.gibberish.calculate_score('this-is-a-bad-password')
+
+        model = Model(charset=string.ascii_lowercase)
+        model.train('some-other-text')
+        model_path = tmp_path / 'other.model'
+        model_path.write_text(serializer.serialize(model))
+
+        filters.gibberish.initialize(model_path=str(model_path))
+        detector = Detector(model=filters.gibberish.get_model(), threshold=3.7)
+
+        assert filters.gibberish.calculate_score('this-is-a-bad-password') != score
+        assert (
+            filters.gibberish.calculate_score('this-is-a-bad-password')
+            == detector.calculate_probability_of_being_gibberish('this-is-a-bad-password')
+        )
+
+    @staticmethod
+    def test_initializing_again_does_not_change_scores():
+        score = filters.gibberish.calculate_score('this-is-a-bad-password')
+
+        filters.gibberish.initialize()
+
+        assert filters.gibberish.calculate_score('this-is-a-bad-password') == score
+
+
 def test_load_from_baseline():
     with transient_settings({
         'filters_used': [{
@@ -59,3 +116,13 @@ def test_load_from_baseline():
         }],
     }):
         assert filters.gibberish.should_exclude_secret('clearly-not-a-secret')
+
+
+def test_filters_are_updated():
+    with transient_settings({}):
+        assert get_filters()
+
+        filters.gibberish.initialize()
+        assert 'detect_secrets.filters.gibberish.should_exclude_secret' in [
+            filter_fn.path for filter_fn in get_filters()
+        ]
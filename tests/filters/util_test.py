@@ -0,0 +1,19 @@
+import pytest
+
+from detect_secrets.filters.util import get_caller_path
+
+
+def test_get_caller_path():
+    assert get_caller_path() == f'{__name__}.test_get_caller_path'
+
+
+def test_get_caller_path_with_offset():
+    def get_path():
+        return get_caller_path(offset=1)
+
+    assert get_path() == f'{__name__}.test_get_caller_path_with_offset'
+
+
+def test_get_caller_path_out_of_bounds():
+    with pytest.raises(IndexError):
+        get_caller_path(offset=1000)
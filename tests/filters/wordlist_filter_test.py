@@ -1,13 +1,22 @@
+import os
+import pickle
 from pathlib import Path
 
 import pytest
 
 from detect_secrets import filters
 from detect_secrets.filters.util import compute_file_hash
+from detect_secrets.settings import get_filters
 from detect_secrets.settings import get_settings
 from detect_secrets.settings import transient_settings
 
 
+@pytest.fixture(autouse=True)
+def cache_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    yield tmp_path / 'detect-secrets-wordlists'
+
+
 class TestShouldExcludeSecret:
     @staticmethod
     @pytest.fixture(autouse=True)
@@ -40,6 +49,16 @@ class TestShouldExcludeSecret:
         # prefix match is not sufficient
         assert filters.wordlist.should_exclude_secret('AKIAnotr') is False
 
+    @staticmethod
+    def test_filters_are_updated():
+        with transient_settings({}):
+            assert get_filters()
+
+            filters.wordlist.initialize('test_data/word_list.txt')
+            assert 'detect_secrets.filters.wordlist.should_exclude_secret' in [
+                filter_fn.path for filter_fn in get_filters()
+            ]
+
 
 def test_load_from_baseline():
     with transient_settings({
@@ -51,3 +70,82 @@ def test_load_from_baseline():
         }],
     }):
         assert filters.wordlist.should_exclude_secret('testPass') is True
+
+
+class TestCache:
+    @staticmethod
+    def test_automaton_is_cached(cache_directory):
+        filters.wordlist.initialize('test_data/word_list.txt', min_length=8)
+
+        assert len(os.listdir(cache_directory)) == 1
+        assert cache_directory.stat().st_mode & 0o777 == 0o700
+
+    @staticmethod
+    def test_not_stored_with_scan_results(cache_directory, monkeypatch):
+        monkeypatch.setenv('DETECT_SECRETS_CACHE_DIR', str(cache_directory.parent / 'results'))
+        filters.wordlist.initialize('test_data/word_list.txt', min_length=8)
+
+        assert not os.path.exists(cache_directory.parent / 'results')
+
+    @staticmethod
+    def test_uses_cached_automaton():
+        automaton = filters.wordlist.initialize('test_data/word_list.txt', min_length=8)
+        automaton.add_word('cachedword', 'cachedword')
+        automaton.make_automaton()
+
+        with open(filters.wordlist._get_cache_path(
+            min_length=8,
+            file_hash=compute_file_hash('test_data/word_list.txt'),
+        ), 'wb') as f:
+            pickle.dump(automaton, f)
+
+        filters.wordlist.get_automaton.cache_clear()
+        filters.wordlist.initialize('test_data/word_list.txt', min_length=8)
+
+        assert filters.wordlist.should_exclude_secret('cachedword') is True
+
+    @staticmethod
+    @pytest.mark.parametrize('is_directory_shared', (True, False))
+    def test_ignores_cache_entries_others_can_modify(cache_directory, is_directory_shared):
+        automaton = filters.wordlist.initialize('test_data/word_list.txt', min_length=8)
+        automaton.add_word('cachedword', 'cachedword')
+        automaton.make_automaton()
+
+        path = filters.wordlist._get_cache_path(
+            min_length=8,
+            file_hash=compute_file_hash('test_data/word_list.txt'),
+        )
+        with open(path, 'wb') as f:
+            pickle.dump(automaton, f)
+
+        if is_directory_shared:
+            cache_directory.chmod(0o777)
+        else:
+            os.chmod(path, 0o666)
+
+        filters.wordlist.get_automaton.cache_clear()
+        filters.wordlist.initialize('test_data/word_list.txt', min_length=8)
+
+        assert filters.wordlist.should_exclude_secret('cachedword') is False
+
+    @staticmethod
+    def test_rebuilds_corrupted_cache_entries():
+        filters.wordlist.initialize('test_data/word_list.txt', min_length=8)
+        with open(filters.wordlist._get_cache_path(
+            min_length=8,
+            file_hash=compute_file_hash('test_data/word_list.txt'),
+        ), 'wb') as f:
+            f.write(b'corrupted')
+
+        filters.wordlist.get_automaton.cache_clear()
+        filters.wordlist.initialize('test_data/word_list.txt', min_length=8)
+
+        assert filters.wordlist.should_exclude_secret('testPass') is True
+
+    @staticmethod
+    def test_keyed_by_min_length():
+        filters.wordlist.initialize('test_data/word_list.txt', min_length=8)
+        assert filters.wordlist.should_exclude_secret('2short') is False
+
+        filters.wordlist.initialize('test_data/word_list.txt', min_length=4)
+        assert filters.wordlist.should_exclude_secret('2short') is True
@@ -81,6 +81,38 @@ class TestScan:
             assert results
 
 
+class TestHistoryScan:
+    @staticmethod
+    def test_basic():
+        with tempfile.TemporaryDirectory() as d:
+            subprocess.call(['git', '-C', d, 'init', '-q'])
+            with open(os.path.join(d, 'credentials.yaml'), 'w') as f:
+                f.write('secret: asxeqFLAGMEfxuwma!')
+
+            subprocess.check_output(['git', '-C', d, 'add', 'credentials.yaml'])
+            subprocess.check_output([
+                'git', '-C', d, '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+                'commit', '-q', '-m', 'initial commit',
+            ])
+            os.remove(os.path.join(d, 'credentials.yaml'))
+
+            with mock_printer(main_module) as printer:
+                assert main_module.main(['-C', d, 'scan', '--history']) == 0
+
+            results = json.loads(printer.message)['results']
+            assert results['credentials.yaml'][0]['commits']
+
+    @staticmethod
+    def test_invalid_rev_range(capsys):
+        with tempfile.TemporaryDirectory() as d:
+            subprocess.call(['git', '-C', d, 'init', '-q'])
+
+            with pytest.raises(SystemExit):
+                main_module.main(['-C', d, 'scan', '--history', '--rev-range', 'missing'])
+
+        assert capsys.readouterr().err == 'error: unable to read git history for `missing`.\n'
+
+
 class TestSlimScan:
     @staticmethod
     def test_basic():
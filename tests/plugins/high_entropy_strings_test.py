@@ -128,3 +128,42 @@ class TestHexEntropyCalculation:
             HexHighEntropyString().calculate_shannon_entropy(value)
             == original_hex_detector().calculate_shannon_entropy(value)
         )
+
+
+class TestAnalyzeString:
+    @staticmethod
+    @pytest.mark.parametrize('plugin', (Base64HighEntropyString(), HexHighEntropyString()))
+    @pytest.mark.parametrize(
+        'line',
+        (
+            'no quotes here',
+            '"abc"def"ghi"',
+            '"abc""def"',
+            '\'abc"def\'"ghi"',
+            '"ab-c" \'1234\' "12.34" ""',
+            '"unterminated \'abc\'',
+            'a = "b64+/=" and "\\\\back\\\\slash"',
+            '"ünicode" "123"',
+        ),
+    )
+    def test_same_results_as_regex(plugin, line):
+        expected = [result[1] for result in plugin.regex.findall(line)]
+        assert list(plugin.analyze_string(line)) == expected
+
+    @staticmethod
+    def test_non_quoted_string_regex():
+        plugin = HexHighEntropyString()
+        with plugin.non_quoted_string_regex():
+            assert list(plugin.analyze_string('abc123')) == ['abc123']
+            assert not list(plugin.analyze_string('abc123 def'))
+
+            regex = plugin.regex
+
+        # Compiled regexes are reused.
+        with plugin.non_quoted_string_regex():
+            assert plugin.regex is regex
+
+        with plugin.non_quoted_string_regex(is_exact_match=False):
+            assert list(plugin.analyze_string('abc123 def')) == ['abc123', 'def']
+
+        assert not list(plugin.analyze_string('abc123'))
@@ -4,7 +4,9 @@ from random import randint
 import pytest
 
 from detect_secrets.core.scan import scan_line
+from detect_secrets.plugins.keyword import _find_keyword
 from detect_secrets.plugins.keyword import KeywordDetector
+from detect_secrets.plugins.keyword import QUOTES_REQUIRED_DENYLIST_REGEX_TO_GROUP
 from detect_secrets.settings import transient_settings
 
 
@@ -208,3 +210,46 @@ def use_keyword_detector():
         }],
     }):
         yield
+
+
+@pytest.mark.parametrize(
+    'line, expected',
+    (
+        ('nothing to see here', None),
+
+        # Literals without a keyword
+        ('passing keys around', None),
+
+        ('x = 1; api_key = "foo"', 7),
+        ('PASSWORD = "foo"', 0),
+        ('if ("foo" == my_password)', 16),
+
+        # Non-ASCII strings
+        ('contraseña = "foo"', 0),
+        ('CONTRASEÑA = "foo"', 0),
+        ('ñ = 1; pwd = "foo"', 7),
+    ),
+)
+def test_find_keyword(line, expected):
+    assert _find_keyword(line) == expected
+
+
+@pytest.mark.parametrize(
+    'line',
+    (
+        # Content before the keyword doesn't affect the results.
+        'foo(bar); api_key = "abcdef"',
+        '"abcdef" == my_password',
+        'x = "abc"; y = "def"; private_key = "abcdef"',
+        'secretly: a, secret = "abcdef"',
+    ),
+)
+def test_same_results_as_searching_from_start(line):
+    expected = []
+    for regex, group in QUOTES_REQUIRED_DENYLIST_REGEX_TO_GROUP.items():
+        match = regex.search(line)
+        if match:
+            expected.append(match.group(group))
+
+    assert expected
+    assert list(KeywordDetector().analyze_string(line)) == expected
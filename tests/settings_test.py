@@ -0,0 +1,107 @@
+from unittest import mock
+
+from detect_secrets import settings
+from detect_secrets.settings import get_filters
+from detect_secrets.settings import get_plugins
+from detect_secrets.settings import get_settings
+from detect_secrets.settings import transient_settings
+
+
+CONFIG = {
+    'plugins_used': [
+        {'name': 'AWSKeyDetector'},
+        {'name': 'Base64HighEntropyString', 'limit': 4.5},
+    ],
+    'filters_used': [
+        {
+            'path': 'detect_secrets.filters.regex.should_exclude_line',
+            'pattern': ['^ignore'],
+        },
+        {
+            'path': 'file://testing/custom_filters.py::is_invalid_secret',
+        },
+    ],
+}
+
+
+class TestGeneration:
+    @staticmethod
+    def test_changes_with_settings():
+        generation = get_settings().generation
+
+        get_settings().configure_plugins([{'name': 'AWSKeyDetector'}])
+        assert get_settings().generation > generation
+
+        generation = get_settings().generation
+        get_settings().disable_filters('detect_secrets.filters.heuristic.is_sequential_string')
+        assert get_settings().generation > generation
+
+    @staticmethod
+    def test_plugins_and_filters_follow_settings():
+        get_settings().configure_plugins([{'name': 'AWSKeyDetector'}])
+        plugins = get_plugins()
+        filters = get_filters()
+        assert get_plugins() is plugins
+
+        get_settings().configure_plugins([{'name': 'BasicAuthDetector'}])
+        assert [plugin.__class__.__name__ for plugin in get_plugins()] == [
+            'AWSKeyDetector',
+            'BasicAuthDetector',
+        ]
+
+        get_settings().disable_filters('detect_secrets.filters.heuristic.is_sequential_string')
+        assert get_filters() is not filters
+        assert 'detect_secrets.filters.heuristic.is_sequential_string' not in [
+            function.path for function in get_filters()
+        ]
+
+
+class TestTransientSettings:
+    @staticmethod
+    def test_reuses_plugins_and_filters_of_previous_settings():
+        with transient_settings(CONFIG):
+            plugins = get_plugins()
+            filters = get_filters()
+
+        with transient_settings(CONFIG):
+            assert get_plugins() is plugins
+            assert get_filters() is filters
+
+    @staticmethod
+    def test_restores_original_settings():
+        get_settings().configure_plugins([{'name': 'AWSKeyDetector'}])
+        plugins = get_plugins()
+
+        with transient_settings(CONFIG):
+            assert len(get_plugins()) == 2
+
+        assert get_plugins() is plugins
+
+    @staticmethod
+    def test_filter_settings_are_not_stale():
+        from detect_secrets.filters.regex import should_exclude_line
+
+        with transient_settings(CONFIG):
+            assert should_exclude_line('ignore me')
+
+        with transient_settings({
+            'filters_used': [{
+                'path': 'detect_secrets.filters.regex.should_exclude_line',
+                'pattern': ['^skip'],
+            }],
+        }):
+            assert not should_exclude_line('ignore me')
+            assert should_exclude_line('skip me')
+
+    @staticmethod
+    def test_custom_filter_files_are_only_loaded_once():
+        with mock.patch.object(
+            settings,
+            'import_file_as_module',
+            wraps=settings.import_file_as_module,
+        ) as mock_import:
+            for _ in range(3):
+                with transient_settings(CONFIG):
+                    assert get_filters()
+
+        assert mock_import.call_count == 1
@@ -6,6 +6,7 @@ import pytest
 from detect_secrets.transformers.config import ConfigFileTransformer
 from detect_secrets.transformers.config import EagerConfigFileTransformer
 from detect_secrets.transformers.config import IniFileParser
+from detect_secrets.transformers.exceptions import ParsingError
 from testing.mocks import mock_file_object
 
 
@@ -203,6 +204,71 @@ def test_add_header():
     ]
 
 
+@pytest.mark.parametrize(
+    'transformer, content',
+    (
+        (ConfigFileTransformer, 'key = value\n[section]\nkey = value'),
+        (ConfigFileTransformer, 'import os\n[section]\nkey = value'),
+        (EagerConfigFileTransformer, '= value\nkey = value'),
+        (EagerConfigFileTransformer, 'import os\nkey = value'),
+    ),
+)
+def test_rejects_files_on_first_invalid_line(transformer, content):
+    file = mock_file_object(content)
+
+    with pytest.raises(ParsingError):
+        transformer().parse_file(file)
+
+    # The rest of the file isn't read.
+    assert file.tell() == content.index('\n') + 1
+
+
+@pytest.mark.parametrize(
+    'content',
+    (
+        '[section]\nkey = value\n[section]\nkey = value',
+        '[section]\nkey = value\nkey = value',
+        '[section]\nkey = value\ninvalid',
+    ),
+)
+def test_rejects_invalid_files(content):
+    with pytest.raises(configparser.Error):
+        list(IniFileParser(mock_file_object(content)))
+
+
+def test_default_section():
+    file = mock_file_object(
+        textwrap.dedent("""
+            [DEFAULT]
+            key = value
+
+            [section]
+            water = unflavored
+        """)[1:-1],
+    )
+
+    # Default values are only reported once: where they're actually defined.
+    assert list(IniFileParser(file)) == [
+        ('key', 'value', 2),
+        ('water', 'unflavored', 5),
+    ]
+
+
+def test_values_are_not_interpolated():
+    file = mock_file_object(
+        textwrap.dedent("""
+            [section]
+            key\t=\tpa%ss
+            tea = %(key)s
+        """)[1:-1],
+    )
+
+    assert list(IniFileParser(file)) == [
+        ('key', 'pa%ss', 2),
+        ('tea', '%(key)s', 3),
+    ]
+
+
 class TestMultipleValues:
     @staticmethod
     def test_all():
@@ -1,4 +1,12 @@
+import io
+from contextlib import ExitStack
+from unittest import mock
+
+import pytest
+
+from detect_secrets.transformers import get_transformed_file
 from detect_secrets.transformers import get_transformers
+from detect_secrets.transformers.exceptions import ParsingError
 
 
 def test_success():
@@ -11,3 +19,29 @@ def test_success():
         'EagerConfigFileTransformer',
         'YAMLTransformer',
     }
+
+
+@pytest.mark.parametrize(
+    'filename, use_eager_transformers, expected',
+    (
+        ('file.yaml', False, ['ConfigFileTransformer', 'YAMLTransformer']),
+        ('file.py', False, ['ConfigFileTransformer']),
+        ('file.md', True, ['EagerConfigFileTransformer']),
+        ('file.py', True, []),
+    ),
+)
+def test_get_transformed_file(filename, use_eager_transformers, expected):
+    file = io.StringIO('key: value')
+    file.name = filename
+
+    with ExitStack() as stack:
+        mocks = {
+            transformer.__class__.__name__: stack.enter_context(
+                mock.patch.object(transformer, 'parse_file', side_effect=ParsingError),
+            )
+            for transformer in get_transformers()
+        }
+
+        assert get_transformed_file(file, use_eager_transformers) is None
+
+    assert sorted(name for name, parse_file in mocks.items() if parse_file.called) == expected
@@ -3,11 +3,18 @@ from unittest import mock
 
 import pytest
 
+from detect_secrets.transformers.yaml import LibYAMLFileLoader
+from detect_secrets.transformers.yaml import UnsupportedDocumentError
 from detect_secrets.transformers.yaml import YAMLFileParser
 from detect_secrets.transformers.yaml import YAMLTransformer
 from testing.mocks import mock_file_object
 
 
+def read_file(filename):
+    with open(filename) as f:
+        return f.read()
+
+
 class TestYAMLTransformer:
     @staticmethod
     def test_basic():
@@ -546,3 +553,69 @@ class TestYAMLFileParser:
                 },
             },
         }
+
+
+class TestLibYAMLFileLoader:
+    @staticmethod
+    @pytest.mark.parametrize(
+        'content',
+        (
+            *(
+                read_file(filename)
+                for filename in (
+                    'test_data/config.yaml',
+                    'test_data/config2.yaml',
+                    'test_data/only_comments.yaml',
+                    'test_data/short_files/middle_line.yml',
+                )
+            ),
+            'key: value\nkey: 1\n',
+            'key: 1\nkey: value\n',
+            'key: !!binary aGVsbG8=\n',
+            'key:\n    value on next line\n',
+            'key: >\n    folded\n    value\n',
+            'list:\n    - keyA: valueA\n      keyB: valueB\n    - valueC\n',
+            '<<:\n    keyA: valueA\nkeyB: valueB\n',
+            '1: valueA\n1.0: valueB\ntrue: valueC\n',
+            'keyA: valueA\r\nkeyB: valueB\r\n',
+            'keyA: valueA keyB: valueB\n',
+            '',
+            'value',
+        ),
+    )
+    def test_matches_pure_python_parser(content):
+        with mock.patch.object(
+            YAMLFileParser,
+            '_get_data_with_libyaml',
+            side_effect=UnsupportedDocumentError,
+        ):
+            expected = list(YAMLFileParser(mock_file_object(content)))
+
+        assert list(YAMLFileParser(mock_file_object(content))) == expected
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        'content, is_supported',
+        (
+            ('keyA: valueA\nkeyB:\n    - valueB\n', True),
+
+            # Flow mappings
+            ('key: {keyA: valueA}\n', False),
+
+            # Aliases
+            ('keyA: &anchor\n    key: value\nkeyB: *anchor\n', False),
+
+            # Explicit keys
+            ('? key\n: value\n', False),
+
+            # Tags that construct mappings differently
+            ('key: !!set\n    keyA: valueA\n', False),
+        ),
+    )
+    def test_unsupported_documents(content, is_supported):
+        loader = LibYAMLFileLoader(content)
+        if is_supported:
+            assert loader.get_single_data()
+        else:
+            with pytest.raises(UnsupportedDocumentError):
+                loader.get_single_data()
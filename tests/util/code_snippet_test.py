@@ -1,6 +1,7 @@
 import pytest
 
 from detect_secrets.util.code_snippet import get_code_snippet
+from detect_secrets.util.code_snippet import get_code_snippets
 
 
 @pytest.mark.parametrize(
@@ -24,3 +25,27 @@ def test_target_line():
 
 def test_previous_line():
     assert get_code_snippet(list('abcde'), 3, lines_of_context=2).previous_line == 'b'
+
+
+@pytest.mark.parametrize('buffer_size', (1, 2, 1024))
+def test_get_code_snippets(buffer_size):
+    lines = list('abcdefghij')
+    snippets = list(get_code_snippets(iter(lines), lines_of_context=2, buffer_size=buffer_size))
+
+    assert [line_number for line_number, _, _ in snippets] == list(range(1, len(lines) + 1))
+    for line_number, line, snippet in snippets:
+        expected = get_code_snippet(lines, line_number, lines_of_context=2)
+
+        assert line == snippet.target_line == expected.target_line
+        assert snippet.previous_line == expected.previous_line
+
+        # Snippets remain valid after their lines are no longer needed by the scan.
+        assert list(snippet) == list(expected)
+        assert snippet.start_line == expected.start_line
+        assert snippet.target_index == expected.target_index
+
+
+def test_get_code_snippets_add_line_numbers():
+    _, _, snippet = list(get_code_snippets(['a', 'b', 'c'], lines_of_context=1))[2]
+
+    assert list(snippet.add_line_numbers()) == ['2:b', '3:c']
@@ -0,0 +1,70 @@
+import math
+import string
+
+import pytest
+
+from detect_secrets.util import entropy
+
+
+BASE64_CHARSET = string.ascii_letters + string.digits + '+/\\-_='
+
+
+def calculate_shannon_entropy(data, charset):
+    """This is how entropy has always been calculated."""
+    if not data:
+        return 0
+
+    output = 0.0
+    for x in charset:
+        p_x = float(data.count(x)) / len(data)
+        if p_x > 0:
+            output += - p_x * math.log(p_x, 2)
+
+    return output
+
+
+VALUES = [
+    '',
+    '0',
+    'aaaaaa',
+    'a1b2c3d4',
+    '0123456789abcdef',
+    'c3VwZXIgbG9uZyBzdHJpbmcgc2hvdWxkIGNhdXNlIGVub3VnaCBlbnRyb3B5',
+    'I6FwzQZFL9l-44nviI1F04OTmorMaVQf9GS4Oe07qxL_vNkW6CRas4Lo42vqJMT0M6riJfma_f-pTAuoX2U=',
+
+    # Characters outside of the charset
+    'contraseña = "hunter2"',
+    '!@#$%',
+]
+
+
+@pytest.mark.parametrize('charset', (BASE64_CHARSET, string.hexdigits, 'aab'))
+def test_calculate_shannon_entropy(charset):
+    for value in VALUES:
+        assert entropy.calculate_shannon_entropy(value, charset) == calculate_shannon_entropy(
+            value,
+            charset,
+        )
+
+
+@pytest.mark.parametrize('charset', (BASE64_CHARSET, string.hexdigits, 'aab', ''))
+@pytest.mark.parametrize('num_copies', (1, 10))
+def test_calculate_shannon_entropies(charset, num_copies):
+    # Large enough batches are vectorized, if possible.
+    values = VALUES * num_copies
+    assert entropy.calculate_shannon_entropies(values, charset) == [
+        calculate_shannon_entropy(value, charset)
+        for value in values
+    ]
+
+
+@pytest.mark.parametrize('charset', (BASE64_CHARSET, string.hexdigits))
+def test_vectorized(charset):
+    pytest.importorskip('numpy')
+
+    values = VALUES * 2
+    output = entropy._calculate_shannon_entropies_with_numpy(values, charset)
+    assert output == [calculate_shannon_entropy(value, charset) for value in values]
+    assert [type(value) for value in output] == [type(value) for value in (
+        calculate_shannon_entropy(value, charset) for value in values
+    )]
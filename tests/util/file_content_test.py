@@ -0,0 +1,115 @@
+import io
+from unittest import mock
+
+import pytest
+
+from detect_secrets.util import file_content
+from detect_secrets.util.file_content import FileContent
+
+
+@pytest.fixture
+def write_file(tmp_path):
+    def wrapped(data):
+        filename = str(tmp_path / 'file')
+        with open(filename, 'wb') as f:
+            f.write(data)
+
+        return filename
+
+    return wrapped
+
+
+class TestFileContent:
+    @staticmethod
+    @pytest.mark.parametrize(
+        'data',
+        (
+            b'',
+            b'\n',
+            b'a\nb\n',
+            b'a\nb',
+            b'a\r\nb\rc\n\n',
+            b'form\x0cfeed\nvertical\x0btab\n',
+            'line\N{LINE SEPARATOR}separator\n'.encode(),
+        ),
+    )
+    def test_lines_are_the_same_as_iterating_through_file(write_file, data):
+        filename = write_file(data)
+        with open(filename) as f:
+            expected = list(f)
+
+        with open(filename, 'rb') as f:
+            content = FileContent.read(f)
+
+        assert content.lines == expected
+        assert list(content.open()) == expected
+        assert content.open().read() == ''.join(expected)
+
+    @staticmethod
+    def test_large_files_are_memory_mapped(write_file):
+        filename = write_file(b'a\r\nb\n' * 10)
+        with mock.patch.object(file_content, 'MMAP_THRESHOLD', 1), mock.patch.object(
+            file_content.mmap,
+            'mmap',
+            wraps=file_content.mmap.mmap,
+        ) as mock_mmap, open(filename, 'rb') as f:
+            content = FileContent.read(f)
+
+        assert mock_mmap.called
+        assert content.lines == ['a\n', 'b\n'] * 10
+
+    @staticmethod
+    def test_invalid_encoding(write_file):
+        with open(write_file(b'\x86'), 'rb') as f, pytest.raises(UnicodeDecodeError):
+            FileContent.read(f)
+
+    @staticmethod
+    def test_read_does_not_split_lines():
+        content = FileContent.decode('file', b'a\nb\n')
+
+        assert content.open().read() is content.text
+        assert content._lines is None
+
+    @staticmethod
+    def test_iterating_does_not_split_lines():
+        content = FileContent.decode('file', b'a\nb\n')
+
+        assert list(content.open()) == ['a\n', 'b\n']
+        assert content._lines is None
+
+
+class TestFileContentIO:
+    @staticmethod
+    def test_files_share_content():
+        content = FileContent.decode('file', b'a\nb\nc\n')
+        first = content.open()
+        second = content.open()
+
+        assert first.name == 'file'
+        assert first.readline() == 'a\n'
+        assert list(second) == ['a\n', 'b\n', 'c\n']
+        assert first.readlines() == ['b\n', 'c\n']
+        assert first.readline() == ''
+
+    @staticmethod
+    def test_seek():
+        file = FileContent.decode('file', b'a\nb\n').open()
+        assert file.read() == 'a\nb\n'
+        assert file.read() == ''
+
+        file.seek(0)
+        assert next(file) == 'a\n'
+        assert file.read() == 'b\n'
+
+        with pytest.raises(io.UnsupportedOperation):
+            file.seek(1)
+
+    @staticmethod
+    def test_partial_reads_are_unsupported():
+        file = FileContent.decode('file', b'a\nb\n').open()
+
+        with pytest.raises(io.UnsupportedOperation):
+            file.read(1)
+
+        with pytest.raises(io.UnsupportedOperation):
+            file.readline(1)
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from detect_secrets.util import filetype
+
+
+class TestIsBinary:
+    @staticmethod
+    @pytest.mark.parametrize(
+        'data',
+        (
+            b'hello\0world',
+            b'\x89PNG\r\n\x1a\nIHDR',
+            b'\x7fELF' + b'a' * 100,
+            b'PK\x03\x04' + b'a' * 100,
+            b'\x01\x02\x03\x04abc',
+
+            # Invalid UTF-8
+            b'secret = "\x86"',
+        ),
+    )
+    def test_binary(data):
+        assert filetype.is_binary(data, encoding='utf-8')
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        'data',
+        (
+            b'',
+            b'secret = "hunter2"\n',
+            b'\ttabs\r\nand\x1b[0mcolors\x0c',
+
+            # Truncated midway through a multi-byte character.
+            'caf\N{LATIN SMALL LETTER E WITH ACUTE}'.encode()[:-1],
+
+            # Only a few control characters.
+            b'\x01' + b'a' * 10,
+        ),
+    )
+    def test_text(data):
+        assert not filetype.is_binary(data, encoding='utf-8')
+
+    @staticmethod
+    def test_depends_on_encoding():
+        assert filetype.is_binary(b'caf\xe9!', encoding='utf-8')
+        assert not filetype.is_binary(b'caf\xe9!', encoding='latin-1')
+
+
+class TestIsBinaryFile:
+    @staticmethod
+    def test_only_reads_start_of_file(tmp_path):
+        filename = str(tmp_path / 'file')
+        with open(filename, 'wb') as f:
+            f.write(b'a' * filetype.BINARY_SNIFF_SIZE + b'\0')
+
+        assert not filetype.is_binary_file(filename)
+
+    @staticmethod
+    def test_picks_up_modifications(tmp_path):
+        filename = str(tmp_path / 'file')
+        with open(filename, 'wb') as f:
+            f.write(b'text')
+
+        assert not filetype.is_binary_file(filename)
+
+        with open(filename, 'wb') as f:
+            f.write(b'\0binary')
+        os.utime(filename, ns=(0, 0))
+
+        assert filetype.is_binary_file(filename)
@@ -0,0 +1,116 @@
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from detect_secrets.core.cache import compute_content_hash
+from detect_secrets.util import git
+
+
+@pytest.fixture
+def repository(tmp_path):
+    def run(*args):
+        return subprocess.check_output(
+            [
+                'git', '-C', str(tmp_path),
+                '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+                *args,
+            ],
+        ).decode().strip()
+
+    run('init', '-q')
+    (tmp_path / 'directory').mkdir()
+    for filename in ['unmodified', 'modified', 'deleted', 'directory/nested']:
+        (tmp_path / filename).write_text(f'{filename}\n')
+
+    os.symlink('unmodified', str(tmp_path / 'symlink'))
+    run('add', '.')
+    run('commit', '-q', '-m', 'initial commit')
+
+    (tmp_path / 'modified').write_text('new content\n')
+    (tmp_path / 'deleted').unlink()
+    (tmp_path / 'untracked').write_text('untracked\n')
+
+    run.root = str(tmp_path)     # type: ignore
+    return run
+
+
+def test_working_tree(repository):
+    files = dict(git.get_tracked_files_with_object_ids(repository.root))
+
+    assert files.keys() == {'unmodified', 'modified', 'deleted', 'directory/nested', 'symlink'}
+
+    # Object IDs are only provided if they match the contents on disk.
+    assert files['unmodified'] == compute_content_hash(
+        os.path.join(repository.root, 'unmodified'),
+    )
+    assert files['directory/nested'] == compute_content_hash(
+        os.path.join(repository.root, 'directory/nested'),
+    )
+    assert not files['modified']
+    assert not files['deleted']
+    assert not files['symlink']
+
+
+def test_ref(repository):
+    files = dict(git.get_tracked_files_with_object_ids(repository.root, ref='HEAD'))
+
+    assert files.keys() == {'unmodified', 'modified', 'deleted', 'directory/nested', 'symlink'}
+    assert files['modified'] == repository('rev-parse', 'HEAD:modified')
+    assert files['deleted'] == repository('rev-parse', 'HEAD:deleted')
+
+
+def test_invalid_ref(repository):
+    with pytest.raises(subprocess.CalledProcessError):
+        list(git.get_tracked_files_with_object_ids(repository.root, ref='does-not-exist'))
+
+
+def test_get_blobs_from_history(repository):
+    files = {
+        (path, object_id)
+        for _, path, object_id in git.get_blobs_from_history(repository.root)
+    }
+
+    # Symbolic links are skipped, since they don't contain file contents.
+    assert files == {
+        (path, repository('rev-parse', f'HEAD:{path}'))
+        for path in ['unmodified', 'modified', 'deleted', 'directory/nested']
+    }
+
+
+def test_get_blobs_from_merge_commits(repository):
+    repository('checkout', '-q', '-b', 'branch')
+    (Path(repository.root) / 'modified').write_text('branch\n')
+    repository('commit', '-q', '-a', '-m', 'branch')
+
+    repository('checkout', '-q', '-')
+    (Path(repository.root) / 'modified').write_text('main\n')
+    repository('commit', '-q', '-a', '-m', 'main')
+
+    subprocess.call(
+        ['git', '-C', repository.root, 'merge', '-q', 'branch'],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    (Path(repository.root) / 'modified').write_text('resolved\n')
+    repository('commit', '-q', '-a', '-m', 'merge')
+
+    blobs = list(git.get_blobs_from_history(repository.root, 'HEAD~1..HEAD'))
+    merge_commit = repository('rev-parse', 'HEAD')
+
+    # Only the conflict resolution is attributed to the merge commit.
+    assert (merge_commit, 'modified', repository('rev-parse', 'HEAD:modified')) in blobs
+    assert [path for commit, path, _ in blobs if commit == merge_commit] == ['modified']
+
+
+def test_blob_reader(repository):
+    reader = git.BlobReader(repository.root)
+    try:
+        assert reader.read(repository('rev-parse', 'HEAD:modified')) == b'modified\n'
+        assert reader.read(repository('rev-parse', 'HEAD:deleted')) == b'deleted\n'
+
+        with pytest.raises(KeyError):
+            reader.read('0' * 40)
+    finally:
+        reader.close()